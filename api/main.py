@@ -1,100 +1,54 @@
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, field_validator
-from typing import Dict, List
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+import asyncio
+import threading
+import uuid
 import laa_core
+from api import metrics
+from api.metrics import MetricsRoute
+from api.registry import InstanceRegistry, SessionStore, StoreFullError
+from api.wire import NegotiatedRoute
+from laa_protocol.schemas import (
+    SkiRentalRequest,
+    RandomizedSkiRentalRequest,
+    SkiRentalBuyDayRequest,
+    CachingRequest,
+    OnewayTradingRequest,
+    SchedulingRequest,
+    SearchRequest,
+    CachingInstanceRequest,
+    CachingPredictionsUpdate,
+    CachingAccessRequest,
+    CachingTraceRequest,
+    OnlineSchedulerRequest,
+    JobSubmitRequest,
+    JobCompleteRequest,
+    SkiRentalBatchRequest,
+    RandomizedSkiRentalBatchRequest,
+    CachingBatchRequest,
+    OnewayTradingBatchRequest,
+    SchedulingBatchRequest,
+    SearchBatchRequest,
+)
 
 app = FastAPI(title="LAA Platform API", version="0.1.0")
+app.router.route_class = MetricsRoute
 
-# Request Models with Validation
-
-class SkiRentalRequest(BaseModel):
-    """Request model for the Ski Rental algorithm."""
-    buy_cost: float
-    current_day: int
-    prediction_days: float
-    trust: float
-
-    @field_validator('trust')
-    def trust_must_be_between_0_and_1(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('trust must be between 0.0 and 1.0')
-        return v
-
-    @field_validator('buy_cost', 'current_day', 'prediction_days')
-    def values_must_be_non_negative(cls, v):
-        if v < 0:
-            raise ValueError('must be non-negative')
-        return v
-
-class RandomizedSkiRentalRequest(BaseModel):
-    """Request model for the Randomized Ski Rental algorithm."""
-    buy_cost: float
-    current_day: int
-    prediction_days: float
-    trust: float
-
-    @field_validator('trust')
-    def trust_must_be_between_0_and_1(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('trust must be between 0.0 and 1.0')
-        return v
-
-    @field_validator('buy_cost', 'current_day', 'prediction_days')
-    def values_must_be_non_negative(cls, v):
-        if v < 0:
-            raise ValueError('must be non-negative')
-        return v
-
-class CachingRequest(BaseModel):
-    """Request model for the Caching algorithm."""
-    cache_size: int
-    predictions: Dict[int, int]
-    item: int
-    cache: List[int]
-
-    @field_validator('cache_size')
-    def cache_size_must_be_non_negative(cls, v):
-        if v < 0:
-            raise ValueError('must be non-negative')
-        return v
-
-class OnewayTradingRequest(BaseModel):
-    """Request model for the Oneway Trading algorithm."""
-    buy_price: float
-    current_price: float
-    prediction_price: float
-    trust: float
-
-    @field_validator('trust')
-    def trust_must_be_between_0_and_1(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError('trust must be between 0.0 and 1.0')
-        return v
-
-    @field_validator('buy_price', 'current_price', 'prediction_price')
-    def prices_must_be_non_negative(cls, v):
-        if v < 0:
-            raise ValueError('prices must be non-negative')
-        return v
-
-class SchedulingRequest(BaseModel):
-    """Request model for the Scheduling algorithm."""
-    num_machines: int
-    job_lengths: List[int]
-    prediction_job_lengths: List[int]
+class NegotiatedMetricsRoute(MetricsRoute, NegotiatedRoute):
+    """A `NegotiatedRoute` whose requests are timed like every other route."""
+
+# Routes moving large integer arrays, which also accept MessagePack and Arrow bodies.
+binary_router = APIRouter(route_class=NegotiatedMetricsRoute)
 
-    @field_validator('num_machines')
-    def num_machines_must_be_positive(cls, v):
-        if v <= 0:
-            raise ValueError('must be positive')
-        return v
+# Configured algorithm instances, reused across requests instead of being rebuilt.
+instances = InstanceRegistry(max_instances=1024, max_bytes=256 * 1024 * 1024)
 
-class SearchRequest(BaseModel):
-    """Request model for the Search algorithm."""
-    max_value: int
-    values: List[int]
-    prediction_value: int
+# Instances created by clients under an id. They are kept apart from the pooled
+# instances above so that ordinary traffic can never evict them.
+sessions = SessionStore(max_instances=1024, max_bytes=256 * 1024 * 1024)
 
 # Response Models
 
@@ -103,6 +57,11 @@ class DecisionResponse(BaseModel):
     algorithm: str
     trust_parameter: float
 
+class BuyDayResponse(BaseModel):
+    buy_day: Optional[int]
+    algorithm: str
+    trust_parameter: float
+
 class CachingResponse(BaseModel):
     decision: str
     new_cache: List[int]
@@ -116,19 +75,189 @@ class SearchResponse(BaseModel):
     best_index: int
     algorithm: str
 
+class DecisionBatchResponse(BaseModel):
+    decisions: List[DecisionResponse]
+
+class CachingBatchResponse(BaseModel):
+    decisions: List[CachingResponse]
+
+class SchedulingBatchResponse(BaseModel):
+    decisions: List[SchedulingResponse]
+
+class SearchBatchResponse(BaseModel):
+    decisions: List[SearchResponse]
+
+class CachingInstanceResponse(BaseModel):
+    instance_id: str
+    cache_size: int
+    contents: List[int]
+    hits: int
+    misses: int
+
+class CachingAccessResponse(BaseModel):
+    decision: str
+    algorithm: str
+
+class CachingTraceResponse(BaseModel):
+    hits: int
+    misses: int
+    algorithm: str
+
+class OnlineSchedulerResponse(BaseModel):
+    scheduler_id: str
+    num_machines: int
+    loads: List[int]
+    makespan: int
+    pending_jobs: int
+
+class JobAssignmentResponse(BaseModel):
+    job_id: int
+    machine: int
+    makespan: int
+    algorithm: str
+
 class HealthResponse(BaseModel):
     status: str
     version: str
 
+# Instance Helpers
+
+def _shared_instance(core_class, *params):
+    """
+    Returns a pooled `core_class(*params)`, creating it on first use.
+    """
+    return instances.get_or_create((core_class.__name__,) + params, lambda: core_class(*params))
+
+def _shared_caching(cache_size: int, predictions: Dict[int, int], predictions_key: Optional[str] = None):
+    """
+    Returns a pooled `laa_core.Caching`, so an unchanged predictions dict is not
+    converted into a Rust `HashMap` again on every request.
+
+    With a `predictions_key`, the instance is found by that name alone. Without
+    one, the pool key is built from the predictions themselves, which costs a pass
+    over them and keeps a copy alive while the instance is pooled.
+    """
+    if predictions_key is not None:
+        key = ("Caching", cache_size, "predictions_key", predictions_key)
+    else:
+        key = ("Caching", cache_size, frozenset(predictions.items()))
+    return instances.get_or_create(key, lambda: laa_core.Caching(cache_size, predictions))
+
+# Batch Helpers
+
+def _decide_batch(core_class, requests, param, fields, labels, algorithm):
+    """
+    Runs the vectorized `decide_batch` of `core_class` over a list of requests.
+
+    Requests are grouped by their constructor parameter (`param`) so that each
+    distinct configuration costs one instance and one call into `laa_core`.
+    `labels` is the `(true, false)` pair of decision strings.
+    """
+    groups: Dict[float, List[int]] = {}
+    for index, request in enumerate(requests):
+        groups.setdefault(getattr(request, param), []).append(index)
+
+    decisions = [None] * len(requests)
+    for value, indices in groups.items():
+        columns = [[getattr(requests[i], field) for i in indices] for field in fields]
+        flags = _shared_instance(core_class, value).decide_batch(*columns)
+        for index, flag in zip(indices, flags):
+            decisions[index] = {
+                "decision": labels[0] if flag else labels[1],
+                "algorithm": algorithm,
+                "trust_parameter": requests[index].trust,
+            }
+    return {"decisions": decisions}
+
+# Server-side Caching Instances
+
+class CachingInstance:
+    """
+    A server-side `laa_core.CachingEngine` together with the lock that serializes
+    access to it, since the engine is mutated by every request.
+    """
+
+    def __init__(self, cache_size: int, predictions: Dict[int, int]):
+        self.engine = laa_core.CachingEngine(cache_size, predictions)
+        self.lock = threading.Lock()
+
+    def memory_usage(self) -> int:
+        return self.engine.memory_usage()
+
+    def describe(self, instance_id: str) -> dict:
+        return {
+            "instance_id": instance_id,
+            "cache_size": self.engine.cache_size,
+            "contents": self.engine.contents(),
+            "hits": self.engine.hits,
+            "misses": self.engine.misses,
+        }
+
+def _get_caching_instance(instance_id: str) -> CachingInstance:
+    instance = sessions.get(("CachingInstance", instance_id))
+    if instance is None:
+        raise HTTPException(status_code=404, detail=f"caching instance {instance_id} not found")
+    return instance
+
+# Online Schedulers
+
+class AsyncOnlineScheduler:
+    """
+    Asynchronous wrapper around a long-lived `laa_core.OnlineScheduler`.
+
+    Job events are O(log m) in the core, so they run directly on the event loop;
+    an `asyncio.Lock` serializes them so that any number of concurrent requests
+    can share one scheduler.
+    """
+
+    def __init__(self, num_machines: int):
+        self.scheduler = laa_core.OnlineScheduler(num_machines)
+        self.lock = asyncio.Lock()
+
+    def memory_usage(self) -> int:
+        return self.scheduler.memory_usage()
+
+    async def submit(self, job_id: int, predicted_length: int):
+        async with self.lock:
+            machine = self.scheduler.submit(job_id, predicted_length)
+            return machine, self.scheduler.makespan()
+
+    async def complete(self, job_id: int, actual_length: int):
+        async with self.lock:
+            machine = self.scheduler.complete(job_id, actual_length)
+            return machine, self.scheduler.makespan()
+
+    async def describe(self, scheduler_id: str) -> dict:
+        async with self.lock:
+            return {
+                "scheduler_id": scheduler_id,
+                "num_machines": self.scheduler.num_machines,
+                "loads": self.scheduler.loads(),
+                "makespan": self.scheduler.makespan(),
+                "pending_jobs": self.scheduler.num_pending,
+            }
+
+def _get_online_scheduler(scheduler_id: str) -> AsyncOnlineScheduler:
+    scheduler = sessions.get(("AsyncOnlineScheduler", scheduler_id))
+    if scheduler is None:
+        raise HTTPException(status_code=404, detail=f"scheduler {scheduler_id} not found")
+    return scheduler
+
 # API Endpoints
+#
+# Constant-time decisions are `async def`, so they run directly on the event loop.
+# Routes whose work grows with the input stay plain `def`: FastAPI runs them on its
+# threadpool, and since `laa_core` releases the GIL for the heavy computation they
+# execute in parallel instead of blocking each other and the event loop.
 
 @app.post("/algorithms/ski-rental/decide", response_model=DecisionResponse)
-def ski_rental_decide(req: SkiRentalRequest):
+@metrics.counts_decisions()
+async def ski_rental_decide(req: SkiRentalRequest):
     """
     Determines whether to buy or rent skis based on the Ski Rental algorithm.
     """
     try:
-        sr = laa_core.SkiRental(req.buy_cost)
+        sr = _shared_instance(laa_core.SkiRental, req.buy_cost)
         decision = sr.decide(req.current_day, req.prediction_days, req.trust)
         return {
             "decision": "buy" if decision else "rent",
@@ -138,13 +267,43 @@ def ski_rental_decide(req: SkiRentalRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/algorithms/ski-rental/buy-day", response_model=BuyDayResponse)
+async def ski_rental_buy_day(req: SkiRentalBuyDayRequest):
+    """
+    Computes the day on which the Ski Rental algorithm buys, or null if it never does.
+    """
+    try:
+        sr = _shared_instance(laa_core.SkiRental, req.buy_cost)
+        return {
+            "buy_day": sr.buy_day(req.prediction_days, req.trust),
+            "algorithm": "ski_rental",
+            "trust_parameter": req.trust
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/ski-rental/decide/batch", response_model=DecisionBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def ski_rental_decide_batch(req: SkiRentalBatchRequest):
+    """
+    Makes a batch of Ski Rental decisions in a single request.
+    """
+    try:
+        return _decide_batch(
+            laa_core.SkiRental, req.requests, "buy_cost",
+            ("current_day", "prediction_days", "trust"), ("buy", "rent"), "ski_rental",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/algorithms/randomized-ski-rental/decide", response_model=DecisionResponse)
-def randomized_ski_rental_decide(req: RandomizedSkiRentalRequest):
+@metrics.counts_decisions()
+async def randomized_ski_rental_decide(req: RandomizedSkiRentalRequest):
     """
     Determines whether to buy or rent skis based on the Randomized Ski Rental algorithm.
     """
     try:
-        sr = laa_core.RandomizedSkiRental(req.buy_cost)
+        sr = _shared_instance(laa_core.RandomizedSkiRental, req.buy_cost)
         decision = sr.decide(req.current_day, req.prediction_days, req.trust)
         return {
             "decision": "buy" if decision else "rent",
@@ -154,14 +313,47 @@ def randomized_ski_rental_decide(req: RandomizedSkiRentalRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/algorithms/caching/decide", response_model=CachingResponse)
+@app.post("/algorithms/randomized-ski-rental/buy-day", response_model=BuyDayResponse)
+async def randomized_ski_rental_buy_day(req: SkiRentalBuyDayRequest):
+    """
+    Samples the day on which the Randomized Ski Rental algorithm buys, or null if it never does.
+    """
+    try:
+        sr = _shared_instance(laa_core.RandomizedSkiRental, req.buy_cost)
+        return {
+            "buy_day": sr.sample_buy_day(req.prediction_days, req.trust),
+            "algorithm": "randomized_ski_rental",
+            "trust_parameter": req.trust
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/randomized-ski-rental/decide/batch", response_model=DecisionBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def randomized_ski_rental_decide_batch(req: RandomizedSkiRentalBatchRequest):
+    """
+    Makes a batch of Randomized Ski Rental decisions in a single request.
+    """
+    try:
+        return _decide_batch(
+            laa_core.RandomizedSkiRental, req.requests, "buy_cost",
+            ("current_day", "prediction_days", "trust"), ("buy", "rent"), "randomized_ski_rental",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@binary_router.post("/algorithms/caching/decide", response_model=CachingResponse)
+@metrics.counts_decisions()
 def caching_decide(req: CachingRequest):
     """
     Makes a caching decision based on the Caching algorithm.
     """
     try:
-        caching = laa_core.Caching(req.cache_size, req.predictions)
-        decision, new_cache = caching.decide(req.item, req.cache)
+        caching = _shared_caching(req.cache_size, req.predictions, req.predictions_key)
+        if hasattr(req.cache, "__array__"):
+            decision, new_cache = caching.decide_array(req.item, req.cache)
+        else:
+            decision, new_cache = caching.decide(req.item, req.cache)
         return {
             "decision": "hit" if decision else "miss",
             "new_cache": new_cache,
@@ -170,13 +362,114 @@ def caching_decide(req: CachingRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/algorithms/caching/decide/batch", response_model=CachingBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def caching_decide_batch(req: CachingBatchRequest):
+    """
+    Makes a batch of independent caching decisions in a single request.
+    """
+    try:
+        decisions = []
+        for item in req.requests:
+            caching = _shared_caching(item.cache_size, item.predictions, item.predictions_key)
+            decision, new_cache = caching.decide(item.item, item.cache)
+            decisions.append({
+                "decision": "hit" if decision else "miss",
+                "new_cache": new_cache,
+                "algorithm": "caching",
+            })
+        return {"decisions": decisions}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/caching/instances", response_model=CachingInstanceResponse)
+def caching_create_instance(req: CachingInstanceRequest):
+    """
+    Creates a server-side Caching instance that keeps its cache and predictions
+    between requests.
+    """
+    try:
+        instance_id = uuid.uuid4().hex
+        instance = CachingInstance(req.cache_size, req.predictions)
+        sessions.add(("CachingInstance", instance_id), instance)
+        return instance.describe(instance_id)
+    except StoreFullError as e:
+        raise HTTPException(status_code=507, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/algorithms/caching/instances/{instance_id}", response_model=CachingInstanceResponse)
+def caching_get_instance(instance_id: str):
+    """
+    Returns the current state of a server-side Caching instance.
+    """
+    instance = _get_caching_instance(instance_id)
+    with instance.lock:
+        return instance.describe(instance_id)
+
+@app.delete("/algorithms/caching/instances/{instance_id}", status_code=204)
+def caching_delete_instance(instance_id: str):
+    """
+    Deletes a server-side Caching instance.
+    """
+    _get_caching_instance(instance_id)
+    sessions.pop(("CachingInstance", instance_id))
+
+@app.patch("/algorithms/caching/instances/{instance_id}/predictions", response_model=CachingInstanceResponse)
+def caching_update_predictions(instance_id: str, req: CachingPredictionsUpdate):
+    """
+    Upserts and deletes predictions of a server-side Caching instance in place.
+    """
+    instance = _get_caching_instance(instance_id)
+    try:
+        with instance.lock:
+            if req.upsert:
+                instance.engine.update_predictions(list(req.upsert.keys()), list(req.upsert.values()))
+            if req.delete:
+                instance.engine.remove_predictions(req.delete)
+            state = instance.describe(instance_id)
+        sessions.resize(("CachingInstance", instance_id))
+        return state
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/caching/instances/{instance_id}/access", response_model=CachingAccessResponse)
+@metrics.counts_decisions()
+def caching_access(instance_id: str, req: CachingAccessRequest):
+    """
+    Accesses an item in a server-side Caching instance.
+    """
+    instance = _get_caching_instance(instance_id)
+    try:
+        with instance.lock:
+            hit = instance.engine.access(req.item)
+        return {"decision": "hit" if hit else "miss", "algorithm": "caching"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/caching/instances/{instance_id}/trace", response_model=CachingTraceResponse)
+@metrics.counts_decisions(lambda req: len(req.items))
+def caching_access_trace(instance_id: str, req: CachingTraceRequest):
+    """
+    Replays a trace of accesses on a server-side Caching instance.
+    """
+    instance = _get_caching_instance(instance_id)
+    try:
+        with instance.lock:
+            hits, misses = instance.engine.access_many(req.items)
+        sessions.resize(("CachingInstance", instance_id))
+        return {"hits": hits, "misses": misses, "algorithm": "caching"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/algorithms/oneway-trading/decide", response_model=DecisionResponse)
-def oneway_trading_decide(req: OnewayTradingRequest):
+@metrics.counts_decisions()
+async def oneway_trading_decide(req: OnewayTradingRequest):
     """
     Makes a trading decision based on the Oneway Trading algorithm.
     """
     try:
-        ot = laa_core.OnewayTrading(req.buy_price)
+        ot = _shared_instance(laa_core.OnewayTrading, req.buy_price)
         decision = ot.decide(req.current_price, req.prediction_price, req.trust)
         return {
             "decision": "buy" if decision else "wait",
@@ -186,14 +479,32 @@ def oneway_trading_decide(req: OnewayTradingRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/algorithms/scheduling/decide", response_model=SchedulingResponse)
+@app.post("/algorithms/oneway-trading/decide/batch", response_model=DecisionBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def oneway_trading_decide_batch(req: OnewayTradingBatchRequest):
+    """
+    Makes a batch of Oneway Trading decisions in a single request.
+    """
+    try:
+        return _decide_batch(
+            laa_core.OnewayTrading, req.requests, "buy_price",
+            ("current_price", "prediction_price", "trust"), ("buy", "wait"), "oneway_trading",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@binary_router.post("/algorithms/scheduling/decide", response_model=SchedulingResponse)
+@metrics.counts_decisions()
 def scheduling_decide(req: SchedulingRequest):
     """
     Assigns jobs to machines based on the Scheduling algorithm.
     """
     try:
-        scheduling = laa_core.Scheduling(req.num_machines)
-        assignments = scheduling.decide(req.job_lengths, req.prediction_job_lengths)
+        scheduling = _shared_instance(laa_core.Scheduling, req.num_machines)
+        if hasattr(req.job_lengths, "__array__"):
+            assignments = scheduling.decide_array(req.job_lengths, req.prediction_job_lengths)
+        else:
+            assignments = scheduling.decide(req.job_lengths, req.prediction_job_lengths)
         return {
             "assignments": assignments,
             "algorithm": "scheduling",
@@ -201,14 +512,95 @@ def scheduling_decide(req: SchedulingRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/algorithms/search/decide", response_model=SearchResponse)
+@app.post("/algorithms/scheduling/decide/batch", response_model=SchedulingBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def scheduling_decide_batch(req: SchedulingBatchRequest):
+    """
+    Makes a batch of independent scheduling decisions in a single request.
+    """
+    try:
+        decisions = []
+        for item in req.requests:
+            scheduling = _shared_instance(laa_core.Scheduling, item.num_machines)
+            decisions.append({
+                "assignments": scheduling.decide(item.job_lengths, item.prediction_job_lengths),
+                "algorithm": "scheduling",
+            })
+        return {"decisions": decisions}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/algorithms/scheduling/online", response_model=OnlineSchedulerResponse)
+async def online_scheduler_create(req: OnlineSchedulerRequest):
+    """
+    Creates a long-lived online scheduler that assigns jobs as they arrive.
+    """
+    try:
+        scheduler_id = uuid.uuid4().hex
+        scheduler = AsyncOnlineScheduler(req.num_machines)
+        sessions.add(("AsyncOnlineScheduler", scheduler_id), scheduler)
+        return await scheduler.describe(scheduler_id)
+    except StoreFullError as e:
+        raise HTTPException(status_code=507, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/algorithms/scheduling/online/{scheduler_id}", response_model=OnlineSchedulerResponse)
+async def online_scheduler_get(scheduler_id: str):
+    """
+    Returns the current machine loads and makespan of an online scheduler.
+    """
+    return await _get_online_scheduler(scheduler_id).describe(scheduler_id)
+
+@app.delete("/algorithms/scheduling/online/{scheduler_id}", status_code=204)
+async def online_scheduler_delete(scheduler_id: str):
+    """
+    Deletes an online scheduler.
+    """
+    _get_online_scheduler(scheduler_id)
+    sessions.pop(("AsyncOnlineScheduler", scheduler_id))
+
+@app.post("/algorithms/scheduling/online/{scheduler_id}/submit", response_model=JobAssignmentResponse)
+@metrics.counts_decisions()
+async def online_scheduler_submit(scheduler_id: str, req: JobSubmitRequest):
+    """
+    Assigns an arriving job to the least loaded machine of an online scheduler.
+    """
+    scheduler = _get_online_scheduler(scheduler_id)
+    try:
+        machine, makespan = await scheduler.submit(req.job_id, req.predicted_length)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"job_id": req.job_id, "machine": machine, "makespan": makespan, "algorithm": "online_scheduling"}
+
+@app.post("/algorithms/scheduling/online/{scheduler_id}/complete", response_model=JobAssignmentResponse)
+async def online_scheduler_complete(scheduler_id: str, req: JobCompleteRequest):
+    """
+    Records the completion of a job on an online scheduler.
+    """
+    scheduler = _get_online_scheduler(scheduler_id)
+    try:
+        machine, makespan = await scheduler.complete(req.job_id, req.actual_length)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"job_id": req.job_id, "machine": machine, "makespan": makespan, "algorithm": "online_scheduling"}
+
+@binary_router.post("/algorithms/search/decide", response_model=SearchResponse)
+@metrics.counts_decisions()
 def search_decide(req: SearchRequest):
     """
     Finds the best index in a list of values based on the Search algorithm.
     """
     try:
-        search = laa_core.Search(req.max_value)
-        best_index = search.decide(req.values, req.prediction_value)
+        search = _shared_instance(laa_core.Search, req.max_value)
+        if hasattr(req.values, "__array__"):
+            best_index = search.decide_array(req.values, req.prediction_value, req.early_stop)
+        else:
+            best_index = search.decide(req.values, req.prediction_value, req.early_stop)
         return {
             "best_index": best_index,
             "algorithm": "search",
@@ -216,9 +608,37 @@ def search_decide(req: SearchRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/algorithms/search/decide/batch", response_model=SearchBatchResponse)
+@metrics.counts_decisions(lambda req: len(req.requests))
+def search_decide_batch(req: SearchBatchRequest):
+    """
+    Makes a batch of independent search decisions in a single request.
+    """
+    try:
+        decisions = []
+        for item in req.requests:
+            search = _shared_instance(laa_core.Search, item.max_value)
+            decisions.append({
+                "best_index": search.decide(item.values, item.prediction_value, item.early_stop),
+                "algorithm": "search",
+            })
+        return {"decisions": decisions}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/health", response_model=HealthResponse)
-def health_check():
+async def health_check():
     """
     Checks the health of the API.
     """
     return {"status": "healthy", "version": "0.1.0"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """
+    Exposes request latencies, decision and error counts, in-flight requests and
+    batch sizes in the Prometheus text format.
+    """
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+app.include_router(binary_router)
@@ -0,0 +1,265 @@
+"""
+Latency and throughput instrumentation for the API, exposed in the Prometheus text format.
+
+`MetricsRoute` times every request and splits it into three phases:
+
+* `validation`: from receiving the request until the endpoint runs (reading,
+  decoding and validating the body, plus the threadpool hand-off of sync routes),
+* `core`: the endpoint itself, i.e. the `laa_core` call and building the result,
+* `serialization`: from the endpoint's return until the response is ready
+  (response model validation and encoding).
+
+Endpoints marked with `counts_decisions` also count the decisions they make, for
+batch and trace requests one per element.
+
+Recording costs a few `perf_counter` calls and one short lock per request, so the
+instrumentation stays on in production.
+"""
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    labels = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in values]
+
+
+class Gauge(Counter):
+    """A value that goes up and down per label combination."""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    """Counts observations per label combination in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label combination: the count of every bucket (plus +Inf), the sum and the count.
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return entry[2] if entry is not None else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+request_duration = registry.register(Histogram(
+    "laa_request_duration_seconds", "Request latency by route and phase.", ("route", "phase"),
+))
+decisions = registry.register(Counter(
+    "laa_decisions_total", "Decisions made, counting every decision of a batch.", ("route",),
+))
+errors = registry.register(Counter(
+    "laa_errors_total", "Requests answered with an error status.", ("route", "status"),
+))
+in_flight = registry.register(Gauge(
+    "laa_requests_in_flight", "Requests currently being handled.", ("route",),
+))
+batch_size = registry.register(Histogram(
+    "laa_batch_size", "Number of decisions per batch request.", ("route",), BATCH_SIZE_BUCKETS,
+))
+
+# Start and end of the current request's endpoint call, set by the instrumented endpoint.
+_endpoint_times: ContextVar[Optional[list]] = ContextVar("laa_endpoint_times", default=None)
+
+
+def counts_decisions(count: Callable[[Any], int] = lambda req: 1) -> Callable:
+    """
+    Marks an endpoint as making decisions, so that its successful calls are counted
+    in `laa_decisions_total`.
+
+    Args:
+        count: Returns the number of decisions made for the endpoint's `req`; one by
+            default. For batch requests (those with a `requests` list), the batch
+            size is recorded as well.
+    """
+    def mark(endpoint: Callable) -> Callable:
+        endpoint._decision_count = count
+        return endpoint
+
+    return mark
+
+
+def _instrument(endpoint: Callable, route: str) -> Callable:
+    """Wraps an endpoint so that it records its own duration and the decisions it makes."""
+    count = getattr(endpoint, "_decision_count", None)
+
+    def record(kwargs):
+        # Counts the decisions of a successful call to an endpoint marked by `counts_decisions`.
+        req = kwargs.get("req")
+        if count is not None and req is not None:
+            batch = getattr(req, "requests", None)
+            if batch is not None:
+                batch_size.observe(len(batch), route)
+            decisions.inc(route, amount=count(req))
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def instrumented(*args, **kwargs):
+            times = _endpoint_times.get()
+            start = time.perf_counter()
+            try:
+                result = await endpoint(*args, **kwargs)
+            finally:
+                if times is not None:
+                    times[:] = [start, time.perf_counter()]
+            record(kwargs)
+            return result
+    else:
+        @functools.wraps(endpoint)
+        def instrumented(*args, **kwargs):
+            times = _endpoint_times.get()
+            start = time.perf_counter()
+            try:
+                result = endpoint(*args, **kwargs)
+            finally:
+                if times is not None:
+                    times[:] = [start, time.perf_counter()]
+            record(kwargs)
+            return result
+
+    instrumented._uninstrumented = endpoint
+    return instrumented
+
+
+class MetricsRoute(APIRoute):
+    """
+    An `APIRoute` that records latency, decision, error and in-flight metrics.
+
+    Combine it with other route classes by listing it first, e.g.
+    `class Route(MetricsRoute, NegotiatedRoute)`, so that it times the whole request.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        endpoint = getattr(endpoint, "_uninstrumented", endpoint)
+        super().__init__(path, _instrument(endpoint, path), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def instrumented_handler(request: Request) -> Response:
+            times = []
+            token = _endpoint_times.set(times)
+            in_flight.inc(route)
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                end = time.perf_counter()
+                in_flight.dec(route)
+                _endpoint_times.reset(token)
+                request_duration.observe(end - start, route, "total")
+                if times:
+                    request_duration.observe(times[0] - start, route, "validation")
+                    request_duration.observe(times[1] - times[0], route, "core")
+                    request_duration.observe(end - times[1], route, "serialization")
+                else:
+                    request_duration.observe(end - start, route, "validation")
+                if status >= 400:
+                    errors.inc(route, str(status))
+
+        return instrumented_handler
@@ -0,0 +1,210 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def estimate_size(instance: Any) -> int:
+    """
+    Estimates the memory held by an algorithm instance, in bytes.
+
+    Uses the instance's own `memory_usage()` when it provides one (all stateful
+    `laa_core` classes do) and falls back to `sys.getsizeof` otherwise.
+    """
+    memory_usage = getattr(instance, "memory_usage", None)
+    if callable(memory_usage):
+        return int(memory_usage())
+    return sys.getsizeof(instance)
+
+
+def _key_size(key: Hashable) -> int:
+    """Estimates the memory held by a key, including the parts of tuples and frozensets in it."""
+    size = sys.getsizeof(key)
+    if isinstance(key, (tuple, frozenset)):
+        size += sum(_key_size(part) for part in key)
+    return size
+
+
+class InstanceRegistry:
+    """
+    Keeps configured algorithm instances alive between requests.
+
+    Instances are stored under a hashable key, either a tuple of their constructor
+    parameters (so requests with the same configuration share a warm instance) or
+    an explicit instance id. When adding an instance would exceed `max_instances`
+    or `max_bytes`, the least recently used instances are evicted first.
+
+    All methods are thread-safe, since sync FastAPI handlers run on a threadpool.
+    """
+
+    def __init__(self, max_instances: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initializes the InstanceRegistry.
+
+        Args:
+            max_instances: The maximum number of instances kept alive.
+            max_bytes: The maximum estimated memory of all instances (and their keys),
+                in bytes. An instance larger than this on its own is still returned
+                but never stored.
+        """
+        self.max_instances = max_instances
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the instance stored under `key` (marking it as recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the instance stored under `key`, creating it with `factory()` on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        instance = factory()
+        self.put(key, instance)
+        return instance
+
+    def put(self, key: Hashable, instance: Any) -> None:
+        """Stores `instance` under `key`, evicting least recently used instances as needed."""
+        size = estimate_size(instance) + _key_size(key)
+        with self._lock:
+            self._store(key, instance, size)
+
+    def resize(self, key: Hashable) -> None:
+        """Re-estimates the size of a stored instance after it has grown or shrunk."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._store(key, entry[0], estimate_size(entry[0]) + _key_size(key))
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Removes and returns the instance stored under `key`, or None."""
+        with self._lock:
+            entry = self._remove(key)
+            return entry[0] if entry is not None else None
+
+    def _store(self, key: Hashable, instance: Any, size: int) -> None:
+        # Must be called with the lock held.
+        self._remove(key)
+        if size > self.max_bytes:
+            return
+        while self._entries and (
+            len(self._entries) >= self.max_instances or self._nbytes + size > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = (instance, size)
+        self._nbytes += size
+
+    def _remove(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+        return entry
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated memory of all stored instances, in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class StoreFullError(Exception):
+    """Raised when a `SessionStore` has no room left for another instance."""
+
+
+class SessionStore:
+    """
+    Keeps the instances clients created explicitly, under the id they were given.
+
+    Unlike `InstanceRegistry`, nothing is ever evicted: an instance lives until it is
+    deleted, so its id stays valid. The limits are enforced when an instance is
+    added instead, by raising `StoreFullError`. An instance that grows after it was
+    added (e.g. a caching engine receiving predictions) is still kept, and its
+    growth counts against the room left for new instances.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(self, max_instances: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initializes the SessionStore.
+
+        Args:
+            max_instances: The maximum number of instances stored at once.
+            max_bytes: The maximum estimated memory of all instances (and their keys),
+                in bytes, beyond which no new instance is added.
+        """
+        self.max_instances = max_instances
+        self.max_bytes = max_bytes
+        self._entries: Dict[Hashable, tuple] = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, instance: Any) -> None:
+        """Stores `instance` under the new key `key`, raising `StoreFullError` if there is no room."""
+        size = estimate_size(instance) + _key_size(key)
+        with self._lock:
+            if key in self._entries:
+                raise KeyError(f"{key!r} is already stored")
+            if len(self._entries) >= self.max_instances:
+                raise StoreFullError(f"the limit of {self.max_instances} instances is reached")
+            if self._nbytes + size > self.max_bytes:
+                raise StoreFullError(f"the memory limit of {self.max_bytes} bytes is reached")
+            self._entries[key] = (instance, size)
+            self._nbytes += size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the instance stored under `key`, or None."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def resize(self, key: Hashable) -> None:
+        """Re-estimates the size of a stored instance after it has grown or shrunk."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                size = estimate_size(entry[0]) + _key_size(key)
+                self._entries[key] = (entry[0], size)
+                self._nbytes += size - entry[1]
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Removes and returns the instance stored under `key`, or None."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._nbytes -= entry[1]
+            return entry[0]
+
+    @property
+    def nbytes(self) -> int:
+        """The estimated memory of all stored instances, in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
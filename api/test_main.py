@@ -1,7 +1,7 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from api.main import app
+from api.main import app, instances, sessions
 
 client = TestClient(app)
 
@@ -19,6 +19,14 @@ def test_ski_rental_decide_buy():
     assert data["decision"] == "buy"
     assert data["algorithm"] == "ski_rental"
 
+def test_ski_rental_reuses_pooled_instance():
+    payload = {"buy_cost": 12345, "current_day": 1, "prediction_days": 10, "trust": 0.5}
+    client.post("/algorithms/ski-rental/decide", json=payload)
+    hits = instances.hits
+    client.post("/algorithms/ski-rental/decide", json=payload)
+    assert instances.hits == hits + 1
+    assert ("SkiRental", 12345.0) in instances
+
 def test_ski_rental_decide_rent():
     response = client.post("/algorithms/ski-rental/decide", json={"buy_cost": 10, "current_day": 9, "prediction_days": 10, "trust": 1.0})
     assert response.status_code == 200
@@ -28,6 +36,23 @@ def test_ski_rental_invalid_trust():
     response = client.post("/algorithms/ski-rental/decide", json={"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.1})
     assert response.status_code == 422 # Unprocessable Entity
 
+def test_ski_rental_decide_batch():
+    response = client.post("/algorithms/ski-rental/decide/batch", json={"requests": [
+        {"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.0},
+        {"buy_cost": 10, "current_day": 9, "prediction_days": 10, "trust": 1.0},
+        {"buy_cost": 20, "current_day": 10, "prediction_days": 10, "trust": 1.0},
+    ]})
+    assert response.status_code == 200
+    decisions = response.json()["decisions"]
+    assert [d["decision"] for d in decisions] == ["buy", "rent", "buy"]
+    assert all(d["algorithm"] == "ski_rental" for d in decisions)
+
+def test_ski_rental_decide_batch_invalid_trust():
+    response = client.post("/algorithms/ski-rental/decide/batch", json={"requests": [
+        {"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.1},
+    ]})
+    assert response.status_code == 422
+
 # Tests for RandomizedSkiRental
 def test_randomized_ski_rental_decide():
     response = client.post("/algorithms/randomized-ski-rental/decide", json={"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.0})
@@ -39,6 +64,16 @@ def test_randomized_ski_rental_invalid_trust():
     response = client.post("/algorithms/randomized-ski-rental/decide", json={"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": -0.1})
     assert response.status_code == 422
 
+def test_randomized_ski_rental_decide_batch():
+    response = client.post("/algorithms/randomized-ski-rental/decide/batch", json={"requests": [
+        {"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.0},
+        {"buy_cost": 10, "current_day": 1, "prediction_days": 10, "trust": 0.5},
+    ]})
+    assert response.status_code == 200
+    decisions = response.json()["decisions"]
+    assert len(decisions) == 2
+    assert all(d["decision"] in ("buy", "rent") for d in decisions)
+
 # Tests for Caching
 def test_caching_decide_hit():
     response = client.post("/algorithms/caching/decide", json={"cache_size": 3, "predictions": {}, "item": 1, "cache": [1, 2, 3]})
@@ -54,10 +89,63 @@ def test_caching_decide_miss_and_evict():
     assert data["decision"] == "miss"
     assert data["new_cache"] == [2, 3] # Item 1 should be evicted
 
+def test_caching_decide_pools_by_predictions_key():
+    request = {"cache_size": 2, "predictions": {"1": 10, "2": 5}, "item": 3, "cache": [1, 2], "predictions_key": "model-v1"}
+    assert client.post("/algorithms/caching/decide", json=request).json()["new_cache"] == [2, 3]
+    assert ("Caching", 2, "predictions_key", "model-v1") in instances
+
+    hits = instances.hits
+    assert client.post("/algorithms/caching/decide", json=request).json()["new_cache"] == [2, 3]
+    assert instances.hits == hits + 1
+
 def test_caching_invalid_cache_size():
     response = client.post("/algorithms/caching/decide", json={"cache_size": -1, "predictions": {}, "item": 1, "cache": []})
     assert response.status_code == 422
 
+def test_caching_decide_batch():
+    response = client.post("/algorithms/caching/decide/batch", json={"requests": [
+        {"cache_size": 3, "predictions": {}, "item": 1, "cache": [1, 2, 3]},
+        {"cache_size": 2, "predictions": {"1": 10, "2": 5}, "item": 3, "cache": [1, 2]},
+    ]})
+    assert response.status_code == 200
+    decisions = response.json()["decisions"]
+    assert [d["decision"] for d in decisions] == ["hit", "miss"]
+    assert decisions[1]["new_cache"] == [2, 3]
+
+def test_caching_instance_lifecycle():
+    response = client.post("/algorithms/caching/instances", json={"cache_size": 2, "predictions": {"1": 10, "2": 5}})
+    assert response.status_code == 200
+    instance_id = response.json()["instance_id"]
+
+    assert client.post(f"/algorithms/caching/instances/{instance_id}/access", json={"item": 1}).json()["decision"] == "miss"
+    assert client.post(f"/algorithms/caching/instances/{instance_id}/access", json={"item": 1}).json()["decision"] == "hit"
+
+    response = client.post(f"/algorithms/caching/instances/{instance_id}/trace", json={"items": [2, 3, 2]})
+    assert response.json() == {"hits": 1, "misses": 2, "algorithm": "caching"}
+    # Item 1 (predicted at 10) was evicted in favour of 3; 2 (predicted at 5) stayed.
+    assert sorted(client.get(f"/algorithms/caching/instances/{instance_id}").json()["contents"]) == [2, 3]
+
+    assert client.delete(f"/algorithms/caching/instances/{instance_id}").status_code == 204
+    assert client.get(f"/algorithms/caching/instances/{instance_id}").status_code == 404
+
+def test_caching_instance_prediction_updates():
+    instance_id = client.post("/algorithms/caching/instances", json={"cache_size": 2}).json()["instance_id"]
+    client.post(f"/algorithms/caching/instances/{instance_id}/trace", json={"items": [1, 2]})
+
+    response = client.patch(f"/algorithms/caching/instances/{instance_id}/predictions", json={"upsert": {"1": 100, "2": 1}})
+    assert response.status_code == 200
+    client.post(f"/algorithms/caching/instances/{instance_id}/access", json={"item": 3})
+    assert sorted(client.get(f"/algorithms/caching/instances/{instance_id}").json()["contents"]) == [2, 3]
+
+    response = client.patch(f"/algorithms/caching/instances/{instance_id}/predictions", json={"delete": [2]})
+    assert response.status_code == 200
+    client.post(f"/algorithms/caching/instances/{instance_id}/access", json={"item": 4})
+    assert sorted(client.get(f"/algorithms/caching/instances/{instance_id}").json()["contents"]) == [3, 4]
+
+def test_caching_instance_not_found():
+    response = client.post("/algorithms/caching/instances/missing/access", json={"item": 1})
+    assert response.status_code == 404
+
 # Tests for OnewayTrading
 def test_oneway_trading_decide_buy():
     response = client.post("/algorithms/oneway-trading/decide", json={"buy_price": 100, "current_price": 110, "prediction_price": 110, "trust": 1.0})
@@ -73,6 +161,14 @@ def test_oneway_trading_invalid_price():
     response = client.post("/algorithms/oneway-trading/decide", json={"buy_price": -100, "current_price": 110, "prediction_price": 110, "trust": 1.0})
     assert response.status_code == 422
 
+def test_oneway_trading_decide_batch():
+    response = client.post("/algorithms/oneway-trading/decide/batch", json={"requests": [
+        {"buy_price": 100, "current_price": 110, "prediction_price": 110, "trust": 1.0},
+        {"buy_price": 100, "current_price": 109, "prediction_price": 110, "trust": 1.0},
+    ]})
+    assert response.status_code == 200
+    assert [d["decision"] for d in response.json()["decisions"]] == ["buy", "wait"]
+
 # Tests for Scheduling
 def test_scheduling_decide():
     response = client.post("/algorithms/scheduling/decide", json={"num_machines": 2, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]})
@@ -83,8 +179,194 @@ def test_scheduling_invalid_num_machines():
     response = client.post("/algorithms/scheduling/decide", json={"num_machines": 0, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]})
     assert response.status_code == 422
 
+def test_scheduling_decide_batch():
+    response = client.post("/algorithms/scheduling/decide/batch", json={"requests": [
+        {"num_machines": 2, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]},
+        {"num_machines": 1, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]},
+    ]})
+    assert response.status_code == 200
+    assert [d["assignments"] for d in response.json()["decisions"]] == [[0, 1], [0, 0]]
+
+def test_online_scheduler_lifecycle():
+    response = client.post("/algorithms/scheduling/online", json={"num_machines": 2})
+    assert response.status_code == 200
+    scheduler_id = response.json()["scheduler_id"]
+
+    submit = lambda job_id, length: client.post(
+        f"/algorithms/scheduling/online/{scheduler_id}/submit", json={"job_id": job_id, "predicted_length": length}
+    )
+    assert submit(1, 10).json()["machine"] == 0
+    assert submit(2, 5).json()["machine"] == 1
+    assert submit(2, 5).status_code == 409
+
+    response = client.post(f"/algorithms/scheduling/online/{scheduler_id}/complete", json={"job_id": 1, "actual_length": 2})
+    assert response.json()["machine"] == 0
+    state = client.get(f"/algorithms/scheduling/online/{scheduler_id}").json()
+    assert state["loads"] == [2, 5]
+    assert state["makespan"] == 5
+    assert state["pending_jobs"] == 1
+
+    response = client.post(f"/algorithms/scheduling/online/{scheduler_id}/complete", json={"job_id": 1, "actual_length": 2})
+    assert response.status_code == 404
+    assert client.delete(f"/algorithms/scheduling/online/{scheduler_id}").status_code == 204
+
+def test_online_scheduler_invalid_num_machines():
+    response = client.post("/algorithms/scheduling/online", json={"num_machines": 0})
+    assert response.status_code == 422
+
+def test_ski_rental_buy_day():
+    response = client.post("/algorithms/ski-rental/buy-day", json={"buy_cost": 100, "prediction_days": 25, "trust": 1.0})
+    assert response.status_code == 200
+    assert response.json()["buy_day"] == 25
+
+def test_randomized_ski_rental_buy_day():
+    response = client.post("/algorithms/randomized-ski-rental/buy-day", json={"buy_cost": 100, "prediction_days": 120, "trust": 0.5})
+    assert response.status_code == 200
+    assert response.json()["buy_day"] >= 1
+
 # Tests for Search
 def test_search_decide():
     response = client.post("/algorithms/search/decide", json={"max_value": 100, "values": [10, 99, 50], "prediction_value": 1})
     assert response.status_code == 200
     assert response.json()["best_index"] == 1
+
+def test_search_decide_early_stop():
+    response = client.post("/algorithms/search/decide", json={
+        "max_value": 100, "values": [100, 10, 100, 50], "prediction_value": 1, "early_stop": True,
+    })
+    assert response.status_code == 200
+    assert response.json()["best_index"] == 2
+
+def test_search_decide_batch():
+    response = client.post("/algorithms/search/decide/batch", json={"requests": [
+        {"max_value": 100, "values": [10, 99, 50], "prediction_value": 1},
+        {"max_value": 100, "values": [10, 20, 30], "prediction_value": 0},
+    ]})
+    assert response.status_code == 200
+    assert [d["best_index"] for d in response.json()["decisions"]] == [1, 2]
+
+# Tests for binary wire formats
+def test_msgpack_request_and_response():
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/algorithms/caching/decide",
+        content=msgpack.packb({"cache_size": 2, "predictions": {1: 10, 2: 5}, "item": 3, "cache": [1, 2]}),
+        headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == {"decision": "miss", "new_cache": [2, 3], "algorithm": "caching"}
+
+def test_arrow_request_and_response():
+    pytest.importorskip("pyarrow")
+    from api.wire import decode_arrow, encode_arrow
+    response = client.post(
+        "/algorithms/scheduling/decide",
+        content=encode_arrow({"num_machines": 2, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]}),
+        headers={"Content-Type": "application/vnd.apache.arrow.stream", "Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 200
+    result = decode_arrow(response.content)
+    assert result["assignments"].tolist() == [0, 1]
+    assert result["algorithm"] == "scheduling"
+
+    response = client.post(
+        "/algorithms/search/decide",
+        content=encode_arrow({"max_value": 100, "values": [10, 99, 50], "prediction_value": 1, "early_stop": False}),
+        headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"best_index": 1, "algorithm": "search"}
+
+def test_binary_request_scalars_are_validated():
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/algorithms/scheduling/decide",
+        content=msgpack.packb({"num_machines": 0, "job_lengths": [10], "prediction_job_lengths": [1]}),
+        headers={"Content-Type": "application/msgpack"},
+    )
+    assert response.status_code == 422
+
+def test_binary_request_bulk_elements_are_validated():
+    msgpack = pytest.importorskip("msgpack")
+    for job_lengths in ([-1], [2**32], ["10"], [[10]]):
+        response = client.post(
+            "/algorithms/scheduling/decide",
+            content=msgpack.packb({"num_machines": 2, "job_lengths": job_lengths, "prediction_job_lengths": [1]}),
+            headers={"Content-Type": "application/msgpack"},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "job_lengths"]
+
+    response = client.post(
+        "/algorithms/caching/decide",
+        content=msgpack.packb({"cache_size": 2, "predictions": {1: -5}, "item": 3, "cache": [1, 2]}),
+        headers={"Content-Type": "application/msgpack"},
+    )
+    assert response.status_code == 422
+
+def test_arrow_request_rejects_negative_values():
+    pytest.importorskip("pyarrow")
+    from api.wire import encode_arrow
+    response = client.post(
+        "/algorithms/search/decide",
+        content=encode_arrow({"max_value": 100, "values": [10, -1, 50], "prediction_value": 1, "early_stop": False}),
+        headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 422
+
+def test_binary_responses_use_the_response_model():
+    msgpack = pytest.importorskip("msgpack")
+    from fastapi import APIRouter, FastAPI
+    from pydantic import BaseModel
+    from api.wire import NegotiatedRoute
+
+    class Request(BaseModel):
+        value: int
+
+    class Result(BaseModel):
+        value: int
+        doubled: int = 0
+
+    router = APIRouter(route_class=NegotiatedRoute)
+
+    @router.post("/double", response_model=Result)
+    def double(req: Request):
+        return {"value": req.value, "doubled": 2 * req.value, "internal": "not part of the model"}
+
+    test_app = FastAPI()
+    test_app.include_router(router)
+    response = TestClient(test_app).post(
+        "/double", content=msgpack.packb({"value": 2}),
+        headers={"Content-Type": "application/msgpack", "Accept": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert msgpack.unpackb(response.content) == {"value": 2, "doubled": 4}
+
+def test_json_request_with_msgpack_response():
+    msgpack = pytest.importorskip("msgpack")
+    response = client.post(
+        "/algorithms/search/decide",
+        json={"max_value": 100, "values": [10, 99, 50], "prediction_value": 1},
+        headers={"Accept": "application/msgpack"},
+    )
+    assert response.status_code == 200
+    assert msgpack.unpackb(response.content)["best_index"] == 1
+
+def test_unsupported_media_type():
+    response = client.post("/algorithms/search/decide", content=b"<xml/>", headers={"Content-Type": "application/xml"})
+    assert response.status_code == 415
+
+def test_created_instances_survive_pooled_traffic(monkeypatch):
+    instance_id = client.post("/algorithms/caching/instances", json={"cache_size": 2}).json()["instance_id"]
+    monkeypatch.setattr(instances, "max_instances", 2)
+    for item in range(5):
+        client.post("/algorithms/caching/decide", json={"cache_size": 2, "predictions": {str(item): 1}, "item": item, "cache": []})
+
+    assert client.get(f"/algorithms/caching/instances/{instance_id}").status_code == 200
+    client.delete(f"/algorithms/caching/instances/{instance_id}")
+
+def test_full_session_store_rejects_new_instances(monkeypatch):
+    monkeypatch.setattr(sessions, "max_instances", len(sessions))
+    assert client.post("/algorithms/caching/instances", json={"cache_size": 2}).status_code == 507
+    assert client.post("/algorithms/scheduling/online", json={"num_machines": 2}).status_code == 507
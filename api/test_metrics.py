@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+
+from api import metrics
+from api.main import app
+from api.metrics import Counter, Histogram, MetricsRegistry
+
+client = TestClient(app)
+
+SKI_RENTAL = {"buy_cost": 10, "current_day": 10, "prediction_days": 10, "trust": 1.0}
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/a")
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_count{route="/a"} 3' in lines
+    assert "# TYPE latency histogram" in lines
+
+def test_counter_labels():
+    counter = Counter("errors", "Errors.", ("route", "status"))
+    counter.inc("/a", "500")
+    counter.inc("/a", "500", amount=2)
+    assert counter.value("/a", "500") == 3
+    assert counter.samples() == ['errors{route="/a",status="500"} 3']
+
+def test_requests_are_timed_by_phase():
+    route = "/algorithms/ski-rental/decide"
+    before = {phase: metrics.request_duration.count(route, phase) for phase in ("total", "validation", "core", "serialization")}
+    decisions = metrics.decisions.value(route)
+
+    assert client.post(route, json=SKI_RENTAL).status_code == 200
+
+    for phase, count in before.items():
+        assert metrics.request_duration.count(route, phase) == count + 1
+    assert metrics.decisions.value(route) == decisions + 1
+    assert metrics.in_flight.value(route) == 0
+
+def test_batch_sizes_and_errors_are_counted():
+    route = "/algorithms/ski-rental/decide/batch"
+    decisions = metrics.decisions.value(route)
+    batches = metrics.batch_size.count(route)
+    errors = metrics.errors.value("/algorithms/ski-rental/decide", "422")
+
+    assert client.post(route, json={"requests": [SKI_RENTAL] * 3}).status_code == 200
+    assert client.post("/algorithms/ski-rental/decide", json={**SKI_RENTAL, "trust": 2.0}).status_code == 422
+
+    assert metrics.decisions.value(route) == decisions + 3
+    assert metrics.batch_size.count(route) == batches + 1
+    assert metrics.errors.value("/algorithms/ski-rental/decide", "422") == errors + 1
+
+def test_metrics_endpoint():
+    client.post("/algorithms/search/decide", json={"max_value": 100, "values": [10, 99, 50], "prediction_value": 1})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'laa_decisions_total{route="/algorithms/search/decide"}' in response.text
+    assert 'laa_request_duration_seconds_count{route="/algorithms/search/decide",phase="core"}' in response.text
+
+def test_only_decisions_are_counted():
+    instance_id = client.post("/algorithms/caching/instances", json={"cache_size": 2}).json()["instance_id"]
+    route = "/algorithms/caching/instances/{instance_id}"
+    assert metrics.decisions.value("/algorithms/caching/instances") == 0
+    before = {path: metrics.decisions.value(route + path) for path in ("/predictions", "/access", "/trace")}
+
+    assert client.patch(f"/algorithms/caching/instances/{instance_id}/predictions", json={"upsert": {"1": 5}}).status_code == 200
+    assert client.post(f"/algorithms/caching/instances/{instance_id}/access", json={"item": 1}).status_code == 200
+    assert client.post(f"/algorithms/caching/instances/{instance_id}/trace", json={"items": [1, 2, 3, 4]}).status_code == 200
+    assert client.post("/algorithms/ski-rental/buy-day", json={"buy_cost": 10, "prediction_days": 10, "trust": 1.0}).status_code == 200
+
+    assert metrics.decisions.value(route + "/predictions") == before["/predictions"]
+    assert metrics.decisions.value(route + "/access") == before["/access"] + 1
+    assert metrics.decisions.value(route + "/trace") == before["/trace"] + 4
+    assert metrics.decisions.value("/algorithms/ski-rental/buy-day") == 0
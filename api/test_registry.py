@@ -0,0 +1,107 @@
+import pytest
+
+from api.registry import InstanceRegistry, SessionStore, StoreFullError, estimate_size
+
+
+class Sized:
+    """A stand-in instance reporting a fixed memory usage."""
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def memory_usage(self):
+        return self.nbytes
+
+
+def test_get_or_create_reuses_instances():
+    registry = InstanceRegistry()
+    created = []
+    factory = lambda: created.append(1) or Sized(10)
+
+    first = registry.get_or_create(("SkiRental", 100.0), factory)
+    second = registry.get_or_create(("SkiRental", 100.0), factory)
+
+    assert first is second
+    assert len(created) == 1
+    assert (registry.hits, registry.misses) == (1, 1)
+
+def test_lru_eviction_by_count():
+    registry = InstanceRegistry(max_instances=2)
+    registry.put("a", Sized(1))
+    registry.put("b", Sized(1))
+    registry.get("a")  # "b" is now the least recently used
+    registry.put("c", Sized(1))
+
+    assert "a" in registry and "c" in registry
+    assert "b" not in registry
+    assert registry.evictions == 1
+
+def test_eviction_by_memory_cap():
+    registry = InstanceRegistry(max_bytes=1000)
+    registry.put("a", Sized(400))
+    registry.put("b", Sized(400))
+    registry.put("c", Sized(400))
+
+    assert "a" not in registry
+    assert len(registry) == 2
+    assert registry.nbytes <= 1000
+
+def test_oversized_instance_is_not_stored():
+    registry = InstanceRegistry(max_bytes=100)
+    instance = registry.get_or_create("big", lambda: Sized(10_000))
+
+    assert instance.nbytes == 10_000
+    assert "big" not in registry
+
+def test_resize_and_pop():
+    registry = InstanceRegistry(max_bytes=1000)
+    instance = Sized(100)
+    registry.put("a", instance)
+    before = registry.nbytes
+    instance.nbytes = 300
+    registry.resize("a")
+
+    assert registry.nbytes == before + 200
+    assert registry.pop("a") is instance
+    assert registry.nbytes == 0
+    assert registry.pop("a") is None
+
+def test_key_size_counts_frozen_items():
+    small = InstanceRegistry()
+    small.put(("Caching", 2, frozenset({(1, 10)})), Sized(0))
+    large = InstanceRegistry()
+    large.put(("Caching", 2, frozenset((i, 10) for i in range(10_000))), Sized(0))
+
+    # Each frozen item is a tuple of two ints, well over 100 bytes.
+    assert large.nbytes - small.nbytes > 10_000 * 100
+
+def test_estimate_size_falls_back_to_getsizeof():
+    assert estimate_size(object()) > 0
+    assert estimate_size(Sized(123)) == 123
+
+def test_session_store_rejects_instead_of_evicting():
+    store = SessionStore(max_instances=2, max_bytes=1000)
+    store.add("a", Sized(100))
+    store.add("b", Sized(100))
+
+    with pytest.raises(StoreFullError):
+        store.add("c", Sized(1))
+    assert "a" in store and "b" in store and "c" not in store
+
+    store.pop("b")
+    with pytest.raises(StoreFullError):
+        store.add("c", Sized(5000))
+    assert "c" not in store
+
+def test_session_store_keeps_instances_that_grow():
+    store = SessionStore(max_bytes=1000)
+    instance = Sized(100)
+    store.add("a", instance)
+    instance.nbytes = 5000
+    store.resize("a")
+
+    assert store.get("a") is instance
+    assert store.nbytes > 5000
+    with pytest.raises(StoreFullError):
+        store.add("b", Sized(1))
+    assert store.pop("a") is instance
+    assert store.nbytes == 0
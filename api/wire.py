@@ -0,0 +1,220 @@
+"""
+Binary wire formats for the endpoints that move large integer arrays.
+
+Besides JSON, `NegotiatedRoute` accepts and returns MessagePack
+(`application/msgpack`) and Arrow IPC streams (`application/vnd.apache.arrow.stream`),
+chosen by the `Content-Type` and `Accept` headers. An Arrow body is a single-row
+record batch with one column per field: scalars as plain columns, integer lists as
+`list<int>` columns and dicts as `map<int, int>` columns.
+
+The integer lists of binary bodies reach the endpoint as `uint32` NumPy arrays, which
+the endpoints pass to the `decide_array` methods of `laa_core` without building
+Python lists. Arrow list columns are read from the Arrow buffers in place; only
+their cast from `int64` to `uint32` (after a range check) copies them.
+
+Both formats are optional dependencies: without `msgpack` or `pyarrow` installed,
+requests in that format are rejected with 415 and JSON is returned instead.
+"""
+import inspect
+import json
+import typing
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from laa_protocol.arrow import encode_arrow, load_pyarrow
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+UINT32_MAX = np.iinfo(np.uint32).max
+
+# Alternative names clients commonly send for the same formats.
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/vnd.apache.arrow.file": ARROW,
+}
+
+
+def _media_type(header: str) -> str:
+    media_type = header.split(";", 1)[0].strip().lower()
+    return MEDIA_TYPE_ALIASES.get(media_type, media_type)
+
+
+def is_available(media_type: str) -> bool:
+    """Returns whether the dependency needed for `media_type` is installed."""
+    if media_type == MSGPACK:
+        return msgpack is not None
+    if media_type == ARROW:
+        return load_pyarrow() is not None
+    return media_type == JSON
+
+
+def decode_arrow(body: bytes) -> Dict[str, Any]:
+    """Decodes a single-row Arrow record batch, returning integer lists as NumPy arrays."""
+    pa = load_pyarrow()
+    table = pa.ipc.open_stream(body).read_all()
+    if table.num_rows != 1:
+        raise ValueError(f"expected a single-row record batch, got {table.num_rows} rows")
+    payload = {}
+    for name, column in zip(table.column_names, table.columns):
+        column = column.combine_chunks()
+        if pa.types.is_map(column.type):
+            payload[name] = dict(column[0].as_py())
+        elif pa.types.is_list(column.type) or pa.types.is_large_list(column.type):
+            values = column.flatten()
+            payload[name] = values.to_numpy(zero_copy_only=values.null_count == 0)
+        else:
+            payload[name] = column[0].as_py()
+    return payload
+
+
+def decode(media_type: str, body: bytes) -> Dict[str, Any]:
+    """Decodes a request body in one of the supported formats."""
+    if media_type == MSGPACK:
+        return msgpack.unpackb(body, strict_map_key=False)
+    if media_type == ARROW:
+        return decode_arrow(body)
+    return json.loads(body)
+
+
+def encode(media_type: str, payload: Dict[str, Any]) -> bytes:
+    """Encodes a response body in one of the supported formats."""
+    if media_type == MSGPACK:
+        return msgpack.packb(payload)
+    return encode_arrow(payload)
+
+
+def response_media_type(accept: Optional[str]) -> str:
+    """Returns the first available format listed in an `Accept` header, JSON by default."""
+    for item in (accept or "").split(","):
+        media_type = _media_type(item)
+        if media_type in (JSON, "*/*"):
+            return JSON
+        if media_type in (MSGPACK, ARROW) and is_available(media_type):
+            return media_type
+    return JSON
+
+
+def _uint32_array(values) -> np.ndarray:
+    """
+    Converts a list or array of integers to a `uint32` array.
+
+    Arrays that already have dtype `uint32` are returned as they are; the range of
+    any other integer dtype is checked before the cast, so that out-of-range values
+    are rejected instead of wrapping around.
+    """
+    array = np.asarray(values)
+    if array.size == 0:
+        return array.astype(np.uint32)
+    if array.ndim != 1 or array.dtype.kind not in "iu":
+        raise ValueError("expected a list of integers")
+    if array.dtype != np.uint32 and (array.min() < 0 or array.max() > UINT32_MAX):
+        raise ValueError(f"values must be between 0 and {UINT32_MAX}")
+    return array.astype(np.uint32, copy=False)
+
+
+def _check_bulk(value):
+    """Checks a bulk value, returning lists and arrays as `uint32` arrays and dicts unchanged."""
+    if isinstance(value, dict):
+        _uint32_array(list(value.keys()))
+        _uint32_array(list(value.values()))
+        return value
+    return _uint32_array(value)
+
+
+def _validate(model: type, payload: Dict[str, Any], check_bulk: bool):
+    """
+    Validates `payload` against `model`.
+
+    Without `check_bulk`, bulk values (lists, dicts and arrays) are not validated by
+    pydantic, which would walk large arrays element by element. They are checked
+    with NumPy instead: every element must be an integer that fits in a `uint32`,
+    and lists and arrays are handed to the endpoint as `uint32` arrays.
+    """
+    bulk = {}
+    if not check_bulk:
+        bulk = {name: value for name, value in payload.items() if isinstance(value, (list, dict)) or hasattr(value, "__array__")}
+    errors = []
+    for name, value in bulk.items():
+        try:
+            bulk[name] = _check_bulk(value)
+        except (TypeError, ValueError, OverflowError) as e:
+            errors.append({"type": "value_error", "loc": ("body", name), "msg": str(e), "input": None})
+    if errors:
+        raise RequestValidationError(errors)
+    placeholders = {name: {} if isinstance(value, dict) else [] for name, value in bulk.items()}
+    try:
+        validated = model.model_validate({**payload, **placeholders})
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False)) from e
+    return validated.model_copy(update=bulk)
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    An `APIRoute` that also speaks MessagePack and Arrow IPC.
+
+    JSON requests asking for a JSON response take the regular FastAPI path. Any
+    other combination is decoded here, validated against the endpoint's `req` model
+    (binary bodies have their bulk fields checked with NumPy instead), and the
+    endpoint's result is validated against its `response_model`, like FastAPI does
+    for JSON, before being encoded as the client asked.
+    """
+
+    def get_route_handler(self) -> Callable:
+        json_handler = super().get_route_handler()
+        model = typing.get_type_hints(self.endpoint)["req"]
+        endpoint = self.endpoint
+        is_coroutine = inspect.iscoroutinefunction(endpoint)
+
+        async def handler(request: Request) -> Response:
+            request_type = _media_type(request.headers.get("content-type", JSON))
+            accept = response_media_type(request.headers.get("accept"))
+            if request_type == JSON and accept == JSON:
+                return await json_handler(request)
+            if request_type not in (JSON, MSGPACK, ARROW) or not is_available(request_type):
+                return Response(status_code=415, content=f"Unsupported media type {request_type}")
+
+            try:
+                payload = decode(request_type, await request.body())
+            except Exception as e:
+                raise RequestValidationError([{"type": "value_error", "loc": ("body",), "msg": str(e), "input": None}]) from e
+            if not isinstance(payload, dict):
+                raise RequestValidationError([{"type": "dict_type", "loc": ("body",), "msg": "expected an object", "input": None}])
+            req = _validate(model, payload, check_bulk=request_type == JSON)
+
+            if is_coroutine:
+                result = await endpoint(req=req)
+            else:
+                result = await run_in_threadpool(endpoint, req=req)
+            # Validated and shaped by the response model exactly like a JSON response.
+            result = await serialize_response(
+                field=self.response_field,
+                response_content=result,
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+                exclude_defaults=self.response_model_exclude_defaults,
+                exclude_none=self.response_model_exclude_none,
+                is_coroutine=is_coroutine,
+            )
+            if accept == JSON:
+                return Response(content=json.dumps(result), media_type=JSON)
+            return Response(content=encode(accept, result), media_type=accept)
+
+        return handler
@@ -1,10 +1,10 @@
 
-import gradio as gr
 import laa_core
-import pandas as pd
 
 def ski_rental_fn(buy_cost, current_day, prediction_days, trust, randomized=False):
     """Function to call the ski rental algorithm and format the output."""
+    import pandas as pd
+
     try:
         # Explicitly cast inputs to the correct types
         buy_cost = float(buy_cost)
@@ -21,38 +21,55 @@ def ski_rental_fn(buy_cost, current_day, prediction_days, trust, randomized=Fals
 
         decision = algo.decide(current_day, prediction_days, trust)
         decision_str = "Buy" if decision else "Rent"
+        if randomized:
+            buy_day = algo.sample_buy_day(prediction_days, trust)
+        else:
+            buy_day = algo.buy_day(prediction_days, trust)
 
         return pd.DataFrame({
             "Algorithm": [algo_name],
             "Decision": [decision_str],
+            "Buy Day": ["Never" if buy_day is None else buy_day],
             "Trust in Prediction": [trust]
         })
     except Exception as e:
         return pd.DataFrame({"Error": [str(e)]})
 
-with gr.Blocks(title="LAA Algorithms Demo") as demo:
-    gr.Markdown("# Learning-Augmented Algorithms Demo")
-
-    with gr.Tabs():
-        with gr.TabItem("Ski Rental"):
-            with gr.Row():
-                with gr.Column():
-                    gr.Markdown("## Inputs")
-                    buy_cost_input = gr.Slider(1, 1000, value=100, label="Buy Cost")
-                    current_day_input = gr.Slider(1, 150, value=10, label="Current Day")
-                    prediction_days_input = gr.Slider(1, 150, value=120, label="Predicted Ski Days")
-                    trust_input = gr.Slider(0.0, 1.0, value=0.8, label="Trust in Prediction")
-                    randomized_input = gr.Checkbox(label="Use Randomized Algorithm")
-                with gr.Column():
-                    gr.Markdown("## Decision")
-                    output_df = gr.DataFrame(headers=["Algorithm", "Decision", "Trust in Prediction"])
-
-            run_button = gr.Button("Run Algorithm")
-            run_button.click(
-                fn=ski_rental_fn,
-                inputs=[buy_cost_input, current_day_input, prediction_days_input, trust_input, randomized_input],
-                outputs=output_df
-            )
+def build_demo():
+    """Builds the Gradio interface. Gradio is only imported here, as it is slow to import."""
+    import gradio as gr
+
+    with gr.Blocks(title="LAA Algorithms Demo") as demo:
+        gr.Markdown("# Learning-Augmented Algorithms Demo")
+
+        with gr.Tabs():
+            with gr.TabItem("Ski Rental"):
+                with gr.Row():
+                    with gr.Column():
+                        gr.Markdown("## Inputs")
+                        buy_cost_input = gr.Slider(1, 1000, value=100, label="Buy Cost")
+                        current_day_input = gr.Slider(1, 150, value=10, label="Current Day")
+                        prediction_days_input = gr.Slider(1, 150, value=120, label="Predicted Ski Days")
+                        trust_input = gr.Slider(0.0, 1.0, value=0.8, label="Trust in Prediction")
+                        randomized_input = gr.Checkbox(label="Use Randomized Algorithm")
+                    with gr.Column():
+                        gr.Markdown("## Decision")
+                        output_df = gr.DataFrame(headers=["Algorithm", "Decision", "Trust in Prediction"])
+
+                run_button = gr.Button("Run Algorithm")
+                run_button.click(
+                    fn=ski_rental_fn,
+                    inputs=[buy_cost_input, current_day_input, prediction_days_input, trust_input, randomized_input],
+                    outputs=output_df
+                )
+    return demo
+
+def __getattr__(name):
+    # `demo` is built on first access, so importing the algorithm functions stays cheap.
+    if name == "demo":
+        globals()["demo"] = demo = build_demo()
+        return demo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
-    demo.launch(server_name="0.0.0.0", server_port=7860)
+    build_demo().launch(server_name="0.0.0.0", server_port=7860)
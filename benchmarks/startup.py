@@ -0,0 +1,106 @@
+"""
+Measures the cold-start cost of the stack: how long importing each entry point
+takes in a fresh interpreter.
+
+Every module is imported `--repeat` times, each time in a new Python process, and
+the import time and the wall time of the whole process (interpreter startup
+included) are reported. The records use the layout of `suite.py`, with the layer
+"import", so the same `--compare` check applies:
+
+    python benchmarks/startup.py --output before.json
+    ... change something ...
+    python benchmarks/startup.py --output after.json --compare before.json
+
+With `--top N`, the N slowest modules pulled in by each import are listed as well
+(from `python -X importtime`), which points at what to make lazy.
+
+Usage:
+    python benchmarks/startup.py [--modules laa_core laa_tools api.main] [--repeat 10] [--top 10]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from suite import ROOT, compare, environment, metadata
+
+MODULES = ["laa_core", "laa_tools", "laa_tools.uq_prediction_adapter", "laa_sdk", "api.main"]
+TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def measure(module: str, repeat: int, env: dict) -> dict:
+    """Imports `module` in `repeat` fresh interpreters and summarizes the timings."""
+    imports, processes = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(module=module)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        processes.append(time.perf_counter() - start)
+        imports.append(float(output.strip().splitlines()[-1]))
+    imports.sort()
+    return {
+        "layer": "import",
+        "algorithm": module,
+        "size": None,
+        "calls": repeat,
+        "min_us": imports[0] * 1e6,
+        "mean_us": statistics.fmean(imports) * 1e6,
+        "p50_us": statistics.median(imports) * 1e6,
+        "process_p50_us": statistics.median(processes) * 1e6,
+    }
+
+
+def slowest_imports(module: str, count: int, env: dict) -> list:
+    """Returns the `count` modules with the largest cumulative import time, in microseconds."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stderr
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=MODULES, help="modules to import")
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=0, help="list the N slowest imports of each module")
+    parser.add_argument("--output", help="write the results to this JSON file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare p50 import times against an earlier JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="p50 ratio counted as a regression")
+    args = parser.parse_args()
+
+    env = environment()
+    results = []
+    for module in args.modules:
+        result = measure(module, args.repeat, env)
+        results.append(result)
+        print(f"{module:<32} import p50 {result['p50_us'] / 1000:>8.1f}ms  "
+              f"process p50 {result['process_p50_us'] / 1000:>8.1f}ms", file=sys.stderr)
+        for cumulative_us, self_us, name in slowest_imports(module, args.top, env) if args.top else ():
+            print(f"    {name:<40} {cumulative_us / 1000:>8.1f}ms cumulative {self_us / 1000:>8.1f}ms self",
+                  file=sys.stderr)
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Sweeps input sizes per algorithm through every layer of the stack and reports
+throughput and latency percentiles as JSON.
+
+Layers:
+    rust       the criterion benches of `laa_core` (runs `cargo bench`, then reads
+               criterion's per-sample timings; percentiles are over samples)
+    pyo3       direct calls into the `laa_core` Python extension
+    sdk-local  `LAAClient("local://")`, the SDK's in-process backend
+    http       `LAAClient` against the API served by a local uvicorn
+
+Every (layer, algorithm, size) case is warmed up, then called until `--min-time`
+seconds or `--max-calls` calls have passed. Inputs are generated from `--seed`, so
+runs are comparable across versions:
+
+    python benchmarks/suite.py --output before.json
+    ... change something ...
+    python benchmarks/suite.py --output after.json --compare before.json
+
+With `--compare`, the p50 latency of every case present in both runs is compared
+and the script exits with status 1 if any case got slower than `--tolerance` times.
+
+Usage:
+    python benchmarks/suite.py [--layers pyo3 sdk-local http] [--quick] [--output results.json]
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "sdk"))
+sys.path.insert(0, os.path.join(ROOT, "protocol"))
+
+import laa_core
+from laa_sdk import LAAClient
+
+SIZES = {
+    "ski_rental": [1],
+    "oneway_trading": [1],
+    "caching": [16, 256, 4096],
+    "scheduling": [100, 10_000, 100_000],
+    "search": [1_000, 100_000, 1_000_000],
+}
+QUICK_SIZES = {
+    "ski_rental": [1],
+    "oneway_trading": [1],
+    "caching": [16, 256],
+    "scheduling": [100, 1_000],
+    "search": [1_000, 10_000],
+}
+
+
+def make_inputs(algorithm: str, size: int, rng: random.Random) -> dict:
+    """Generates the SDK arguments of one decision of `algorithm` at `size`."""
+    if algorithm == "ski_rental":
+        return {"buy_cost": 100.0, "current_day": 50, "prediction_days": 120.0, "trust": 0.5}
+    if algorithm == "oneway_trading":
+        return {"buy_price": 100.0, "current_price": 110.0, "prediction_price": 120.0, "trust": 0.5}
+    if algorithm == "caching":
+        # A miss on a full cache, which scans the whole cache for the item to evict.
+        items = list(range(4 * size))
+        return {
+            "cache_size": size,
+            "predictions": {item: rng.randint(0, 10 * size) for item in items},
+            "item": size,
+            "cache": items[:size],
+        }
+    if algorithm == "scheduling":
+        return {
+            "num_machines": max(1, size // 100),
+            "job_lengths": [rng.randint(1, 1000) for _ in range(size)],
+            "prediction_job_lengths": [rng.randint(1, 1000) for _ in range(size)],
+        }
+    if algorithm == "search":
+        return {
+            "max_value": 1_000_000,
+            "values": [rng.randint(0, 999_999) for _ in range(size)],
+            "prediction_value": size // 2,
+        }
+    raise ValueError(f"unknown algorithm {algorithm}")
+
+
+def core_call(algorithm: str, inputs: dict):
+    """Returns a zero-argument call of the `laa_core` binding for one decision."""
+    if algorithm == "ski_rental":
+        sr = laa_core.SkiRental(inputs["buy_cost"])
+        return lambda: sr.decide(inputs["current_day"], inputs["prediction_days"], inputs["trust"])
+    if algorithm == "oneway_trading":
+        ot = laa_core.OnewayTrading(inputs["buy_price"])
+        return lambda: ot.decide(inputs["current_price"], inputs["prediction_price"], inputs["trust"])
+    if algorithm == "caching":
+        caching = laa_core.Caching(inputs["cache_size"], inputs["predictions"])
+        return lambda: caching.decide(inputs["item"], inputs["cache"])
+    if algorithm == "scheduling":
+        scheduling = laa_core.Scheduling(inputs["num_machines"])
+        return lambda: scheduling.decide(inputs["job_lengths"], inputs["prediction_job_lengths"])
+    search = laa_core.Search(inputs["max_value"])
+    return lambda: search.decide(inputs["values"], inputs["prediction_value"])
+
+
+def sdk_call(algorithm: str, inputs: dict, client: LAAClient):
+    """Returns a zero-argument SDK call for one decision."""
+    method = getattr(client, f"{algorithm}_decide")
+    return lambda: method(**inputs)
+
+
+def measure(call, min_time: float, max_calls: int, warmup: int) -> dict:
+    """Times individual calls of `call` and summarizes their latencies."""
+    for _ in range(warmup):
+        call()
+    latencies = []
+    clock = time.perf_counter
+    start = clock()
+    while len(latencies) < max_calls and (len(latencies) < 10 or clock() - start < min_time):
+        before = clock()
+        call()
+        latencies.append(clock() - before)
+    return summarize(latencies)
+
+
+def summarize(latencies) -> dict:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "calls": count,
+        "throughput": count / sum(latencies) if sum(latencies) > 0 else float("inf"),
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p50_us": latencies[int(0.50 * (count - 1))] * 1e6,
+        "p99_us": latencies[int(0.99 * (count - 1))] * 1e6,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def environment() -> dict:
+    """Returns the environment of child processes, with the repo, the SDK and the protocol importable."""
+    env = dict(os.environ)
+    paths = [ROOT, os.path.join(ROOT, "sdk"), os.path.join(ROOT, "protocol")]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Starts the API under uvicorn and waits until it answers /health."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=environment(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before the API became available")
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("the API did not become available within 30 s")
+
+
+def run_rust(quick: bool) -> list:
+    """Runs the criterion benches and converts their samples to result records."""
+    manifest = os.path.join(ROOT, "laa_core", "Cargo.toml")
+    command = ["cargo", "bench", "--manifest-path", manifest, "--", "--noplot"]
+    if quick:
+        command += ["--warm-up-time", "0.5", "--measurement-time", "1"]
+    subprocess.run(command, check=True)
+
+    results = []
+    pattern = os.path.join(ROOT, "laa_core", "target", "criterion", "**", "new", "benchmark.json")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path) as f:
+            benchmark = json.load(f)
+        with open(os.path.join(os.path.dirname(path), "sample.json")) as f:
+            sample = json.load(f)
+        per_iteration = [t / n * 1e-9 for t, n in zip(sample["times"], sample["iters"])]
+        results.append({
+            "layer": "rust",
+            "algorithm": benchmark["group_id"],
+            "size": benchmark.get("value_str") or benchmark.get("function_id"),
+            **summarize(per_iteration),
+            "calls": int(sum(sample["iters"])),
+        })
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline_path: str, tolerance: float) -> bool:
+    """Prints the p50 change of every case in both runs; returns whether any regressed."""
+    with open(baseline_path) as f:
+        baseline = {
+            (r["layer"], r["algorithm"], str(r["size"])): r for r in json.load(f)["results"]
+        }
+    regressed = False
+    print(f"\n{'layer':<10} {'algorithm':<28} {'size':>10} {'p50 before':>12} {'p50 after':>12} {'ratio':>7}")
+    for result in results:
+        before = baseline.get((result["layer"], result["algorithm"], str(result["size"])))
+        if before is None:
+            continue
+        ratio = result["p50_us"] / before["p50_us"] if before["p50_us"] else float("inf")
+        flag = " <-- slower" if ratio > tolerance else ""
+        regressed |= ratio > tolerance
+        print(
+            f"{result['layer']:<10} {result['algorithm']:<28} {str(result['size']):>10} "
+            f"{before['p50_us']:>10.2f}us {result['p50_us']:>10.2f}us {ratio:>7.2f}{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", nargs="+", default=["pyo3", "sdk-local", "http"],
+                        choices=["rust", "pyo3", "sdk-local", "http"], help="layers to measure")
+    parser.add_argument("--algorithms", nargs="+", default=list(SIZES), choices=list(SIZES), help="algorithms to measure")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and shorter runs")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to measure each case")
+    parser.add_argument("--max-calls", type=int, default=100_000, help="maximum calls per case")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated inputs")
+    parser.add_argument("--output", help="write the results to this JSON file instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare p50 latencies against an earlier JSON file")
+    parser.add_argument("--tolerance", type=float, default=1.2, help="p50 ratio counted as a regression")
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    min_time = min(args.min_time, 0.2) if args.quick else args.min_time
+    results = []
+
+    if "rust" in args.layers:
+        results.extend(run_rust(args.quick))
+
+    clients = {}
+    server = None
+    if "sdk-local" in args.layers:
+        clients["sdk-local"] = LAAClient("local://", "benchmark")
+    if "http" in args.layers:
+        port = free_port()
+        server = start_server(port)
+        clients["http"] = LAAClient(f"http://127.0.0.1:{port}", "benchmark")
+
+    try:
+        for algorithm in args.algorithms:
+            for size in sizes[algorithm]:
+                inputs = make_inputs(algorithm, size, random.Random(args.seed))
+                calls = {}
+                if "pyo3" in args.layers:
+                    calls["pyo3"] = core_call(algorithm, inputs)
+                for layer, client in clients.items():
+                    calls[layer] = sdk_call(algorithm, inputs, client)
+                for layer, call in calls.items():
+                    result = {"layer": layer, "algorithm": algorithm, "size": size,
+                              **measure(call, min_time, args.max_calls, warmup=min(100, args.max_calls))}
+                    results.append(result)
+                    print(f"{layer:<10} {algorithm:<15} {size:>9}: {result['throughput']:>12.1f} calls/s  "
+                          f"p50 {result['p50_us']:>10.2f}us  p99 {result['p99_us']:>10.2f}us", file=sys.stderr)
+    finally:
+        for client in clients.values():
+            client.close()
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
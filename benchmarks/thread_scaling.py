@@ -0,0 +1,62 @@
+"""
+Measures how `laa_core` throughput scales with the number of Python threads.
+
+Each worker repeatedly calls `Scheduling.decide` and `Search.decide` on large inputs
+through a single shared instance. Because these methods release the GIL while the
+Rust code runs, throughput should rise with the number of workers (up to the
+number of cores) instead of staying flat.
+
+Usage:
+    python benchmarks/thread_scaling.py [--calls 64] [--jobs 200000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import laa_core
+
+
+def measure(call, calls: int, workers: int) -> float:
+    """Returns the throughput of `calls` invocations of `call` on `workers` threads, in calls/s."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        for future in [pool.submit(call) for _ in range(calls)]:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=64, help="calls per measurement")
+    parser.add_argument("--jobs", type=int, default=200_000, help="input length of each call")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="thread counts to measure")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    job_lengths = [rng.randint(1, 1000) for _ in range(args.jobs)]
+    predictions = [max(1, length + rng.randint(-50, 50)) for length in job_lengths]
+    values = [rng.randint(0, 1_000_000) for _ in range(args.jobs)]
+
+    scheduling = laa_core.Scheduling(64)
+    search = laa_core.Search(1_000_000)
+    workloads = {
+        "Scheduling.decide": lambda: scheduling.decide(job_lengths, predictions),
+        "Search.decide": lambda: search.decide(values, args.jobs // 2),
+    }
+
+    print(f"{os.cpu_count()} CPUs, {args.calls} calls of {args.jobs} elements per measurement")
+    for name, call in workloads.items():
+        measure(call, min(args.calls, 4), 1)  # warm-up
+        baseline = None
+        print(f"\n{name}")
+        for workers in args.workers:
+            throughput = measure(call, args.calls, workers)
+            baseline = baseline or throughput
+            print(f"  {workers:>3} threads: {throughput:10.1f} calls/s  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
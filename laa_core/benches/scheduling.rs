@@ -1,5 +1,4 @@
-
-use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use criterion::{black_box, criterion_group, criterion_main, BatchSize, BenchmarkId, Criterion, Throughput};
 use laa_core::Scheduling;
 
 fn scheduling_benchmark(c: &mut Criterion) {
@@ -13,5 +12,50 @@ fn scheduling_benchmark(c: &mut Criterion) {
     });
 }
 
-criterion_group!(benches, scheduling_benchmark);
+fn scheduling_sweep_benchmark(c: &mut Criterion) {
+    let mut group = c.benchmark_group("scheduling_decide_sweep");
+    for (num_jobs, num_machines) in [(100u32, 4usize), (10_000, 64), (100_000, 1024)] {
+        let scheduling = Scheduling::new(num_machines);
+        let job_lengths: Vec<u32> = (0..num_jobs).map(|i| 1 + i.wrapping_mul(2_654_435_761) % 1000).collect();
+        let predictions: Vec<u32> = (0..num_jobs).map(|i| 1 + i.wrapping_mul(40_503) % 1000).collect();
+        group.throughput(Throughput::Elements(num_jobs as u64));
+        group.bench_with_input(
+            BenchmarkId::new(format!("{}_machines", num_machines), num_jobs),
+            &(job_lengths, predictions),
+            |b, (job_lengths, predictions)| {
+                b.iter_batched(
+                    || (job_lengths.clone(), predictions.clone()),
+                    |(job_lengths, predictions)| scheduling.decide(job_lengths, predictions),
+                    BatchSize::LargeInput,
+                )
+            },
+        );
+    }
+    group.finish();
+}
+
+fn scheduling_large_benchmark(c: &mut Criterion) {
+    let num_jobs = 1_000_000;
+    let num_machines = 10_000;
+    let scheduling = Scheduling::new(num_machines);
+    // A fixed linear congruential sequence keeps the instance identical across runs.
+    let mut state: u32 = 12345;
+    let mut next = move || {
+        state = state.wrapping_mul(1_103_515_245).wrapping_add(12345);
+        state >> 8
+    };
+    let job_lengths: Vec<u32> = (0..num_jobs).map(|_| 1 + next() % 1000).collect();
+    let predictions: Vec<u32> = (0..num_jobs).map(|_| 1 + next() % 1000).collect();
+
+    let mut group = c.benchmark_group("scheduling_large");
+    group.sample_size(10);
+    group.bench_function("decide_1e6_jobs_1e4_machines", |b| {
+        b.iter(|| {
+            scheduling.decide(black_box(job_lengths.clone()), black_box(predictions.clone()));
+        })
+    });
+    group.finish();
+}
+
+criterion_group!(benches, scheduling_benchmark, scheduling_sweep_benchmark, scheduling_large_benchmark);
 criterion_main!(benches);
@@ -1,5 +1,4 @@
-
-use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
 use laa_core::Search;
 
 fn search_benchmark(c: &mut Criterion) {
@@ -13,5 +12,46 @@ fn search_benchmark(c: &mut Criterion) {
     });
 }
 
-criterion_group!(benches, search_benchmark);
+fn search_sweep_benchmark(c: &mut Criterion) {
+    let max_value = 1_000_000;
+    let search = Search::new(max_value);
+    let mut group = c.benchmark_group("search_find_max_sweep");
+    for num_values in [1_000u32, 100_000, 1_000_000] {
+        let values: Vec<u32> = (0..num_values).map(|i| i.wrapping_mul(2_654_435_761) % max_value).collect();
+        group.throughput(Throughput::Elements(num_values as u64));
+        group.bench_with_input(BenchmarkId::from_parameter(num_values), &values, |b, values| {
+            b.iter(|| search.find_max(black_box(values), black_box(num_values / 2), false))
+        });
+    }
+    group.finish();
+}
+
+fn search_large_benchmark(c: &mut Criterion) {
+    let num_values = 20_000_000;
+    let max_value = 1_000_000;
+    // Deterministic pseudo-random values from a simple LCG, with the maximum placed
+    // halfway through the array.
+    let mut state: u64 = 42;
+    let mut values: Vec<u32> = (0..num_values)
+        .map(|_| {
+            state = state.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+            ((state >> 33) % max_value as u64) as u32
+        })
+        .collect();
+    let best = num_values / 2;
+    values[best] = max_value;
+    let search = Search::new(max_value);
+
+    let mut group = c.benchmark_group("search_large");
+    group.sample_size(10);
+    group.bench_function("full_scan_2e7_values", |b| {
+        b.iter(|| search.find_max(black_box(&values), black_box(0), false))
+    });
+    group.bench_function("early_stop_2e7_values", |b| {
+        b.iter(|| search.find_max(black_box(&values), black_box(best as u32 - 100), true))
+    });
+    group.finish();
+}
+
+criterion_group!(benches, search_benchmark, search_sweep_benchmark, search_large_benchmark);
 criterion_main!(benches);
@@ -1,6 +1,5 @@
-
 use criterion::{black_box, criterion_group, criterion_main, Criterion};
-use laa_core::SkiRental;
+use laa_core::{RandomizedSkiRental, SkiRental};
 
 fn ski_rental_benchmark(c: &mut Criterion) {
     let ski_rental = SkiRental::new(100.0);
@@ -11,5 +10,25 @@ fn ski_rental_benchmark(c: &mut Criterion) {
     });
 }
 
-criterion_group!(benches, ski_rental_benchmark);
+fn randomized_ski_rental_benchmark(c: &mut Criterion) {
+    let rental = RandomizedSkiRental::new(100.0, Some(42));
+    c.bench_function("randomized_ski_rental_decide", |b| {
+        b.iter(|| {
+            rental.decide(black_box(50), black_box(120.0), black_box(0.5));
+        })
+    });
+
+    let days: Vec<u32> = (0..10_000).map(|day| day % 150).collect();
+    let predictions = vec![120.0; days.len()];
+    let trusts = vec![0.5; days.len()];
+    c.bench_function("randomized_ski_rental_decide_batch_10k", |b| {
+        b.iter(|| {
+            rental
+                .decide_batch(black_box(days.clone()), black_box(predictions.clone()), black_box(trusts.clone()))
+                .unwrap();
+        })
+    });
+}
+
+criterion_group!(benches, ski_rental_benchmark, randomized_ski_rental_benchmark);
 criterion_main!(benches);
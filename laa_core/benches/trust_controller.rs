@@ -0,0 +1,40 @@
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use laa_core::TrustController;
+
+/// The number of outcomes recorded or trusts looked up per iteration.
+const BATCH: usize = 100_000;
+
+fn trust_controller_benchmark(c: &mut Criterion) {
+    // A batch of outcomes spread over a growing number of keys, into a controller that
+    // already tracks all of them, so the measurement covers lookups, not insertions.
+    let mut group = c.benchmark_group("trust_controller_observe");
+    group.throughput(Throughput::Elements(BATCH as u64));
+    for num_keys in [1_000u64, 100_000, 1_000_000] {
+        let keys: Vec<u64> = (0..BATCH as u64).map(|i| i.wrapping_mul(2_654_435_761) % num_keys).collect();
+        let predictions: Vec<f64> = (0..BATCH).map(|i| 90.0 + (i % 21) as f64).collect();
+        let outcomes: Vec<f64> = (0..BATCH).map(|i| 100.0 + (i % 5) as f64).collect();
+        let mut controller = TrustController::new("hedge", 1.0, 1.0, 0.5, 0.99, 0.5, num_keys as usize).unwrap();
+        let all: Vec<u64> = (0..num_keys).collect();
+        controller.observe_slice(&all, &vec![100.0; all.len()], &vec![100.0; all.len()]);
+        group.bench_with_input(BenchmarkId::from_parameter(num_keys), &keys, |b, keys| {
+            b.iter(|| controller.observe_slice(black_box(keys), &predictions, &outcomes))
+        });
+    }
+    group.finish();
+
+    let mut group = c.benchmark_group("trust_controller_trusts");
+    group.throughput(Throughput::Elements(BATCH as u64));
+    for num_keys in [1_000u64, 100_000, 1_000_000] {
+        let keys: Vec<u64> = (0..BATCH as u64).map(|i| i.wrapping_mul(2_654_435_761) % num_keys).collect();
+        let mut controller = TrustController::new("hedge", 1.0, 1.0, 0.5, 0.99, 0.5, num_keys as usize).unwrap();
+        let all: Vec<u64> = (0..num_keys).collect();
+        controller.observe_slice(&all, &vec![110.0; all.len()], &vec![100.0; all.len()]);
+        group.bench_with_input(BenchmarkId::from_parameter(num_keys), &keys, |b, keys| {
+            b.iter(|| controller.trusts(black_box(keys)))
+        });
+    }
+    group.finish();
+}
+
+criterion_group!(benches, trust_controller_benchmark);
+criterion_main!(benches);
@@ -1,7 +1,90 @@
 
+use numpy::{AllowTypeChange, Element, IntoPyArray, PyArray1, PyArrayLike1, PyReadonlyArray1};
+use pyo3::exceptions::{PyKeyError, PyValueError};
 use pyo3::prelude::*;
-use rand::Rng;
-use std::collections::HashMap;
+use rand::{Rng, SeedableRng};
+use rand_pcg::Pcg64Mcg;
+use rayon::prelude::*;
+use std::borrow::Cow;
+use std::cmp::Reverse;
+use std::collections::{BTreeSet, BinaryHeap, HashMap};
+use std::sync::{Mutex, MutexGuard, PoisonError};
+
+pub mod simulate;
+
+/// Inputs with at least this many elements are sorted in parallel.
+const PARALLEL_SORT_THRESHOLD: usize = 1 << 16;
+
+/// Full searches over at least this many values reduce their blocks in parallel.
+const PARALLEL_SEARCH_THRESHOLD: usize = 1 << 20;
+
+/// The number of values `Search` reduces at a time before comparing against its bound.
+const SEARCH_BLOCK: usize = 4096;
+
+/// The number of independent running maxima kept by `block_max` (eight `u32` lanes fill
+/// a 256-bit vector register).
+const SEARCH_LANES: usize = 8;
+
+/// A one-dimensional NumPy input of `f64` values.
+///
+/// Arrays that already have dtype `float64` are borrowed without copying; any other
+/// array-like (lists, other dtypes, objects supporting the buffer protocol) is
+/// converted with `numpy.asarray` first.
+type F64Array<'py> = PyArrayLike1<'py, f64, AllowTypeChange>;
+
+/// A one-dimensional NumPy input of `u32` values, borrowed in place when the dtype
+/// already matches (see `F64Array`).
+type U32Array<'py> = PyArrayLike1<'py, u32, AllowTypeChange>;
+
+/// A one-dimensional NumPy input of `u64` values, borrowed in place when the dtype
+/// already matches (see `F64Array`).
+type U64Array<'py> = PyArrayLike1<'py, u64, AllowTypeChange>;
+
+/// Returns the contents of a NumPy array as a slice.
+///
+/// C-contiguous arrays are borrowed in place; strided views are gathered into an
+/// owned buffer so that the kernels below can always work on plain slices.
+fn as_contiguous<'a, T: Element + Copy>(array: &'a PyReadonlyArray1<'_, T>) -> Cow<'a, [T]> {
+    match array.as_slice() {
+        Ok(slice) => Cow::Borrowed(slice),
+        Err(_) => Cow::Owned(array.as_array().iter().copied().collect()),
+    }
+}
+
+/// Estimates the heap memory held by a `HashMap`, in bytes.
+///
+/// Accounts for one `(K, V)` slot and one control byte per bucket, which is how the
+/// standard library's SwissTable lays out its storage.
+fn hash_map_bytes<K, V>(map: &HashMap<K, V>) -> usize {
+    map.capacity() * (std::mem::size_of::<(K, V)>() + 1)
+}
+
+/// Estimates the heap memory held by a `BTreeSet`, in bytes.
+///
+/// B-tree nodes are on average about two-thirds full, so each element is charged
+/// 1.5 times its size.
+fn btree_set_bytes<T>(set: &BTreeSet<T>) -> usize {
+    set.len() * std::mem::size_of::<T>() * 3 / 2
+}
+
+/// Ensures that all columns of a batched call have the same length.
+///
+/// # Arguments
+///
+/// * `lengths` - The length of every input column of the batch.
+///
+/// # Returns
+///
+/// * `PyResult<()>` - `Ok` if all lengths match, otherwise a `ValueError`.
+fn check_batch_lengths(lengths: &[usize]) -> PyResult<()> {
+    match lengths.split_first() {
+        Some((first, rest)) if rest.iter().any(|len| len != first) => Err(PyValueError::new_err(format!(
+            "batch inputs must have the same length, got {:?}",
+            lengths
+        ))),
+        _ => Ok(()),
+    }
+}
 
 /// Implements the classic Ski Rental problem, a foundational online algorithm.
 ///
@@ -13,7 +96,7 @@ use std::collections::HashMap;
 ///
 /// The algorithm achieves a competitive ratio of 2 in the worst case and approaches 1
 /// (optimal) with perfect predictions.
-#[pyclass]
+#[pyclass(frozen)]
 pub struct SkiRental {
     buy_cost: f64,
 }
@@ -47,8 +130,141 @@ impl SkiRental {
     ///
     /// * `bool` - Returns `true` if the decision is to buy, and `false` to continue renting.
     pub fn decide(&self, day: u32, prediction: f64, trust: f64) -> bool {
-        let threshold = (1.0 - trust) * self.buy_cost + trust * prediction.min(self.buy_cost);
-        day as f64 >= threshold
+        day as f64 >= self.threshold(prediction, trust)
+    }
+
+    /// Makes the rent-or-buy decision for NumPy arrays of independent queries.
+    ///
+    /// The inputs are read in place (see `F64Array`) and the decision loop runs with
+    /// the GIL released.
+    ///
+    /// # Arguments
+    ///
+    /// * `days` - The current day of each query (1-indexed).
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<numpy.ndarray>` - A boolean array with one decision per query (`true`
+    ///                               to buy), or a `ValueError` if the inputs have
+    ///                               different lengths.
+    pub fn decide_array<'py>(
+        &self,
+        py: Python<'py>,
+        days: F64Array<'py>,
+        predictions: F64Array<'py>,
+        trusts: F64Array<'py>,
+    ) -> PyResult<Bound<'py, PyArray1<bool>>> {
+        let (days, predictions, trusts) = (as_contiguous(&days), as_contiguous(&predictions), as_contiguous(&trusts));
+        check_batch_lengths(&[days.len(), predictions.len(), trusts.len()])?;
+        let decisions = py.allow_threads(|| {
+            days.iter()
+                .zip(predictions.iter())
+                .zip(trusts.iter())
+                .map(|((&day, &prediction), &trust)| day >= self.threshold(prediction, trust))
+                .collect::<Vec<bool>>()
+        });
+        Ok(decisions.into_pyarray(py))
+    }
+
+    /// Makes the rent-or-buy decision for a batch of independent queries.
+    ///
+    /// Equivalent to calling `decide` once per element, but crosses the Python
+    /// boundary only once for the whole batch.
+    ///
+    /// # Arguments
+    ///
+    /// * `days` - The current day of each query (1-indexed).
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<Vec<bool>>` - One decision per query (`true` to buy), or a `ValueError`
+    ///                           if the inputs have different lengths.
+    pub fn decide_batch(&self, days: Vec<u32>, predictions: Vec<f64>, trusts: Vec<f64>) -> PyResult<Vec<bool>> {
+        check_batch_lengths(&[days.len(), predictions.len(), trusts.len()])?;
+        Ok(days
+            .iter()
+            .zip(&predictions)
+            .zip(&trusts)
+            .map(|((&day, &prediction), &trust)| self.decide(day, prediction, trust))
+            .collect())
+    }
+
+    /// Computes the day on which the algorithm buys, without polling `decide` daily.
+    ///
+    /// The threshold does not depend on the day, so the buy day is the first day
+    /// reaching it.
+    ///
+    /// # Arguments
+    ///
+    /// * `prediction` - The predicted total number of ski days.
+    /// * `trust` - A confidence score in the prediction, typically in [0.0, 1.0].
+    ///
+    /// # Returns
+    ///
+    /// * `Option<u32>` - The first day (1-indexed) on which `decide` returns `true`, or
+    ///                   `None` if it never does.
+    pub fn buy_day(&self, prediction: f64, trust: f64) -> Option<u32> {
+        self.first_buy_day(prediction, trust)
+    }
+
+    /// Computes the buy day for NumPy arrays of independent `(prediction, trust)` pairs.
+    ///
+    /// # Arguments
+    ///
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<numpy.ndarray>` - A `uint32` array with the buy day of each query (0
+    ///                               if the algorithm never buys), or a `ValueError` if
+    ///                               the inputs have different lengths.
+    pub fn buy_day_array<'py>(
+        &self,
+        py: Python<'py>,
+        predictions: F64Array<'py>,
+        trusts: F64Array<'py>,
+    ) -> PyResult<Bound<'py, PyArray1<u32>>> {
+        let (predictions, trusts) = (as_contiguous(&predictions), as_contiguous(&trusts));
+        check_batch_lengths(&[predictions.len(), trusts.len()])?;
+        let buy_days = py.allow_threads(|| {
+            predictions
+                .iter()
+                .zip(trusts.iter())
+                .map(|(&prediction, &trust)| self.first_buy_day(prediction, trust).unwrap_or(0))
+                .collect::<Vec<u32>>()
+        });
+        Ok(buy_days.into_pyarray(py))
+    }
+}
+
+impl SkiRental {
+    /// Computes the day from which buying is the preferred decision.
+    ///
+    /// The threshold blends the classical break-even point (`buy_cost`) with the
+    /// prediction, which is clamped to `buy_cost` since any longer season leads
+    /// to the same strategy.
+    fn threshold(&self, prediction: f64, trust: f64) -> f64 {
+        (1.0 - trust) * self.buy_cost + trust * prediction.min(self.buy_cost)
+    }
+
+    /// Computes the first day on which `decide` returns `true`.
+    ///
+    /// # Returns
+    ///
+    /// * `Option<u32>` - The buy day (at least 1), or `None` if the threshold is not a
+    ///                   reachable day (NaN or beyond `u32::MAX`).
+    fn first_buy_day(&self, prediction: f64, trust: f64) -> Option<u32> {
+        let threshold = self.threshold(prediction, trust).ceil();
+        if threshold <= u32::MAX as f64 {
+            Some(threshold.max(1.0) as u32)
+        } else {
+            None
+        }
     }
 }
 
@@ -58,9 +274,14 @@ impl SkiRental {
 /// better competitive ratio in the worst-case scenario compared to its deterministic
 /// counterpart. It is approximately 1.58-competitive. The algorithm uses the prediction
 /// to influence a probabilistic decision.
-#[pyclass]
+///
+/// Each instance draws from its own PCG generator (`Pcg64Mcg`), a small non-cryptographic
+/// PRNG. Given a seed, an instance replays exactly the same sequence of decisions;
+/// batched methods draw all their decisions from the stream under a single lock.
+#[pyclass(frozen)]
 pub struct RandomizedSkiRental {
     buy_cost: f64,
+    rng: Mutex<Pcg64Mcg>,
 }
 
 #[pymethods]
@@ -70,9 +291,16 @@ impl RandomizedSkiRental {
     /// # Arguments
     ///
     /// * `buy_cost` - The total cost of buying skis.
+    /// * `seed` - Seeds the instance's generator, making its decisions reproducible. If
+    ///            None, a random seed is drawn.
     #[new]
-    pub fn new(buy_cost: f64) -> Self {
-        RandomizedSkiRental { buy_cost }
+    #[pyo3(signature = (buy_cost, seed=None))]
+    pub fn new(buy_cost: f64, seed: Option<u64>) -> Self {
+        let seed = seed.unwrap_or_else(rand::random);
+        RandomizedSkiRental {
+            buy_cost,
+            rng: Mutex::new(Pcg64Mcg::seed_from_u64(seed)),
+        }
     }
 
     /// Makes a probabilistic daily decision to either rent or buy skis.
@@ -87,8 +315,132 @@ impl RandomizedSkiRental {
     ///
     /// * `bool` - Returns `true` if the decision is to buy, and `false` to rent.
     pub fn decide(&self, day: u32, prediction: f64, trust: f64) -> bool {
-        let rent_cost = day as f64;
+        self.rng().gen_bool(self.buy_probability(day as f64, prediction, trust))
+    }
+
+    /// Makes probabilistic rent-or-buy decisions for NumPy arrays of independent queries.
+    ///
+    /// The inputs are read in place (see `F64Array`) and the sampling loop runs with
+    /// the GIL released.
+    ///
+    /// # Arguments
+    ///
+    /// * `days` - The current day of each query (1-indexed).
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<numpy.ndarray>` - A boolean array with one decision per query (`true`
+    ///                               to buy), or a `ValueError` if the inputs have
+    ///                               different lengths.
+    pub fn decide_array<'py>(
+        &self,
+        py: Python<'py>,
+        days: F64Array<'py>,
+        predictions: F64Array<'py>,
+        trusts: F64Array<'py>,
+    ) -> PyResult<Bound<'py, PyArray1<bool>>> {
+        let (days, predictions, trusts) = (as_contiguous(&days), as_contiguous(&predictions), as_contiguous(&trusts));
+        check_batch_lengths(&[days.len(), predictions.len(), trusts.len()])?;
+        let decisions = py.allow_threads(|| {
+            let mut rng = self.rng();
+            days.iter()
+                .zip(predictions.iter())
+                .zip(trusts.iter())
+                .map(|((&day, &prediction), &trust)| rng.gen_bool(self.buy_probability(day, prediction, trust)))
+                .collect::<Vec<bool>>()
+        });
+        Ok(decisions.into_pyarray(py))
+    }
+
+    /// Makes probabilistic rent-or-buy decisions for a batch of independent queries.
+    ///
+    /// # Arguments
+    ///
+    /// * `days` - The current day of each query (1-indexed).
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<Vec<bool>>` - One decision per query (`true` to buy), or a `ValueError`
+    ///                           if the inputs have different lengths.
+    pub fn decide_batch(&self, days: Vec<u32>, predictions: Vec<f64>, trusts: Vec<f64>) -> PyResult<Vec<bool>> {
+        check_batch_lengths(&[days.len(), predictions.len(), trusts.len()])?;
+        let mut rng = self.rng();
+        Ok(days
+            .iter()
+            .zip(&predictions)
+            .zip(&trusts)
+            .map(|((&day, &prediction), &trust)| rng.gen_bool(self.buy_probability(day as f64, prediction, trust)))
+            .collect())
+    }
+
+    /// Samples the day on which the algorithm buys, in a single call.
+    ///
+    /// Polling `decide` every day buys on day `d` with probability `min(1, d * c)`,
+    /// given that it has not bought before. The probability of still renting after day
+    /// `d` is therefore `prod(1 - j * c for j in 1..=d)`, which has a closed form in terms
+    /// of the gamma function. The buy day is drawn by inverting it with a binary search,
+    /// in O(log(1 / c)) instead of O(season length) steps, and follows exactly the same
+    /// distribution as daily polling.
+    ///
+    /// # Arguments
+    ///
+    /// * `prediction` - The predicted total number of ski days.
+    /// * `trust` - A confidence score in the prediction, typically in [0.0, 1.0].
+    ///
+    /// # Returns
+    ///
+    /// * `Option<u32>` - The sampled buy day (1-indexed), or `None` if the algorithm
+    ///                   never buys.
+    pub fn sample_buy_day(&self, prediction: f64, trust: f64) -> Option<u32> {
+        self.draw_buy_day(&mut *self.rng(), prediction, trust)
+    }
+
+    /// Samples the buy day for NumPy arrays of independent `(prediction, trust)` pairs.
+    ///
+    /// # Arguments
+    ///
+    /// * `predictions` - The predicted total number of ski days of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<numpy.ndarray>` - A `uint32` array with the sampled buy day of each
+    ///                               query (0 if the algorithm never buys), or a
+    ///                               `ValueError` if the inputs have different lengths.
+    pub fn sample_buy_day_array<'py>(
+        &self,
+        py: Python<'py>,
+        predictions: F64Array<'py>,
+        trusts: F64Array<'py>,
+    ) -> PyResult<Bound<'py, PyArray1<u32>>> {
+        let (predictions, trusts) = (as_contiguous(&predictions), as_contiguous(&trusts));
+        check_batch_lengths(&[predictions.len(), trusts.len()])?;
+        let buy_days = py.allow_threads(|| {
+            let mut rng = self.rng();
+            predictions
+                .iter()
+                .zip(trusts.iter())
+                .map(|(&prediction, &trust)| self.draw_buy_day(&mut *rng, prediction, trust).unwrap_or(0))
+                .collect::<Vec<u32>>()
+        });
+        Ok(buy_days.into_pyarray(py))
+    }
+}
+
+impl RandomizedSkiRental {
+    /// Locks the instance's generator.
+    ///
+    /// Drawing a number cannot panic, so a poisoned lock still holds a valid generator.
+    fn rng(&self) -> MutexGuard<'_, Pcg64Mcg> {
+        self.rng.lock().unwrap_or_else(PoisonError::into_inner)
+    }
 
+    /// Computes the probability of buying on a given day.
+    fn buy_probability(&self, day: f64, prediction: f64, trust: f64) -> f64 {
         // Clamp the prediction, as any prediction > buy_cost implies the same strategy.
         let effective_prediction = prediction.min(self.buy_cost);
 
@@ -98,11 +450,79 @@ impl RandomizedSkiRental {
         // The probability scales with the rent_cost and the threshold, normalized by buy_cost^2 * e.
         // This ensures that low predictions (and thus low thresholds) lead to a low
         // probability of buying, making the algorithm robust to underestimation.
-        let prob = (rent_cost * threshold / (self.buy_cost * self.buy_cost * std::f64::consts::E)).max(0.0).min(1.0);
+        (day * threshold / (self.buy_cost * self.buy_cost * std::f64::consts::E)).max(0.0).min(1.0)
+    }
 
-        let mut rng = rand::thread_rng();
-        rng.gen_bool(prob)
+    /// Samples a buy day from the distribution of daily polling (see `sample_buy_day`).
+    fn draw_buy_day<R: Rng + ?Sized>(&self, rng: &mut R, prediction: f64, trust: f64) -> Option<u32> {
+        // `buy_probability(day)` is `min(1, day * rate)`.
+        let rate = self.buy_probability(1.0, prediction, trust);
+        if !(rate > 0.0) {
+            return None;
+        }
+        // From this day on the algorithm buys with certainty.
+        let certain_day = (1.0 / rate).ceil().max(1.0);
+        let u: f64 = rng.gen();
+        // The buy day is the first day after which the probability of still renting
+        // drops below `u`.
+        let (mut low, mut high) = (1.0, certain_day);
+        while low < high {
+            let mid = ((low + high) / 2.0).floor();
+            if log_survival(rate, mid) < u.ln() {
+                high = mid;
+            } else {
+                low = mid + 1.0;
+            }
+        }
+        if low <= u32::MAX as f64 {
+            Some(low as u32)
+        } else {
+            None
+        }
+    }
+}
+
+/// Returns the log-probability of still renting after `day` days of daily polling.
+///
+/// This is `sum(ln(1 - j * rate) for j in 1..=day)`. With `x = 1 / rate`, the product
+/// `prod(1 - j * rate)` equals `rate^day * Γ(x) / Γ(x - day)`, which is evaluated
+/// through `ln_gamma` in constant time.
+fn log_survival(rate: f64, day: f64) -> f64 {
+    let x = 1.0 / rate;
+    if day >= x {
+        return f64::NEG_INFINITY;
+    }
+    day * rate.ln() + ln_gamma(x) - ln_gamma(x - day)
+}
+
+/// Computes the natural logarithm of the gamma function for positive arguments.
+///
+/// Uses the Lanczos approximation (g = 7, nine coefficients), which is accurate to
+/// about 15 significant digits, with the reflection formula below 0.5.
+fn ln_gamma(x: f64) -> f64 {
+    const G: f64 = 7.0;
+    const COEFFICIENTS: [f64; 9] = [
+        0.999_999_999_999_809_9,
+        676.520_368_121_885_1,
+        -1_259.139_216_722_402_8,
+        771.323_428_777_653_1,
+        -176.615_029_162_140_6,
+        12.507_343_278_686_905,
+        -0.138_571_095_265_720_12,
+        9.984_369_578_019_572e-6,
+        1.505_632_735_149_311_6e-7,
+    ];
+    if x < 0.5 {
+        let pi = std::f64::consts::PI;
+        return (pi / (pi * x).sin()).ln() - ln_gamma(1.0 - x);
     }
+    let x = x - 1.0;
+    let t = x + G + 0.5;
+    let series = COEFFICIENTS[1..]
+        .iter()
+        .enumerate()
+        .fold(COEFFICIENTS[0], |sum, (i, c)| sum + c / (x + (i + 1) as f64));
+    0.5 * (2.0 * std::f64::consts::PI).ln() + (x + 0.5) * t.ln() - t + series.ln()
 }
 
 /// Implements a learning-augmented caching algorithm.
@@ -112,7 +532,7 @@ impl RandomizedSkiRental {
 /// about the next time an item will be accessed to make smarter eviction choices than
 
 /// traditional algorithms like LRU (Least Recently Used).
-#[pyclass]
+#[pyclass(frozen)]
 pub struct Caching {
     cache_size: usize,
     predictions: HashMap<u32, u32>,
@@ -141,6 +561,8 @@ impl Caching {
     /// If the cache is full on a miss, another item is evicted based on the predictions
     /// (item with the latest predicted next access time is evicted).
     ///
+    /// The eviction scan runs with the GIL released.
+    ///
     /// # Arguments
     ///
     /// * `item` - The unique identifier of the item being accessed.
@@ -151,6 +573,37 @@ impl Caching {
     /// A tuple `(bool, Vec<u32>)`:
     /// * `_ .0` (bool): `true` for a cache hit, `false` for a miss.
     /// * `_ .1` (Vec<u32>): The new state of the cache after the access.
+    #[pyo3(name = "decide")]
+    pub fn py_decide(&self, py: Python<'_>, item: u32, cache: Vec<u32>) -> (bool, Vec<u32>) {
+        py.allow_threads(|| self.decide(item, cache))
+    }
+
+    /// Processes an item access on a cache held in a NumPy array.
+    ///
+    /// Same as `decide`, but a `uint32` array is read in place instead of being
+    /// extracted from a list element by element.
+    ///
+    /// # Arguments
+    ///
+    /// * `item` - The unique identifier of the item being accessed.
+    /// * `cache` - The current items in the cache.
+    ///
+    /// # Returns
+    ///
+    /// A tuple `(bool, Vec<u32>)`, as returned by `decide`.
+    pub fn decide_array<'py>(&self, py: Python<'py>, item: u32, cache: U32Array<'py>) -> (bool, Vec<u32>) {
+        let cache = as_contiguous(&cache).into_owned();
+        py.allow_threads(|| self.decide(item, cache))
+    }
+
+    /// Returns an estimate of the memory held by this instance, in bytes.
+    pub fn memory_usage(&self) -> usize {
+        std::mem::size_of::<Self>() + hash_map_bytes(&self.predictions)
+    }
+}
+
+impl Caching {
+    /// Processes an item access and updates the cache state (see `py_decide`).
     pub fn decide(&self, item: u32, cache: Vec<u32>) -> (bool, Vec<u32>) {
         let mut new_cache = cache.clone();
         if new_cache.contains(&item) {
@@ -177,182 +630,1007 @@ impl Caching {
     }
 }
 
-/// Implements a learning-augmented Oneway Trading algorithm.
+/// Implements a stateful learning-augmented cache.
 ///
-/// This algorithm addresses the problem of converting an initial amount of one asset
-/// into another by choosing the best time to execute the trade. The goal is to maximize
-/// the amount of the target asset obtained. This version uses a price prediction to
-/// decide when to trade.
+/// Unlike `Caching`, which receives and returns the full cache contents on every
+/// call, `CachingEngine` keeps the cached items internally. Membership is answered
+/// by a hash index, and the cached items are kept in an ordered set keyed by their
+/// predicted next access time, so the eviction victim (the item with the latest
+/// predicted next access) is found without scanning the cache. Each access costs
+/// O(log k) for a cache of size k.
 #[pyclass]
-pub struct OnewayTrading {
-    buy_price: f64,
+pub struct CachingEngine {
+    cache_size: usize,
+    predictions: HashMap<u32, u32>,
+    /// Cached items ordered by eviction priority: `(predicted next access, insertion order, item)`.
+    /// The last element is the next victim; ties are broken in favour of evicting the
+    /// oldest item, as in `Caching::decide`.
+    order: BTreeSet<(u32, Reverse<u64>, u32)>,
+    /// Maps each cached item to its `(predicted next access, insertion order)` key in `order`.
+    index: HashMap<u32, (u32, u64)>,
+    next_sequence: u64,
+    hits: u64,
+    misses: u64,
 }
 
 #[pymethods]
-impl OnewayTrading {
-    /// Creates a new `OnewayTrading` instance.
+impl CachingEngine {
+    /// Creates a new, empty `CachingEngine`.
     ///
     /// # Arguments
     ///
-    /// * `buy_price` - The initial price of the asset, used as a reference for the
-    ///                 deterministic part of the algorithm.
+    /// * `cache_size` - The maximum number of items the cache can hold.
+    /// * `predictions` - An optional map from item IDs to the predicted time of their
+    ///                   next access. Items without a prediction are evicted first.
     #[new]
-    pub fn new(buy_price: f64) -> Self {
-        OnewayTrading { buy_price }
+    #[pyo3(signature = (cache_size, predictions=None))]
+    pub fn new(cache_size: usize, predictions: Option<HashMap<u32, u32>>) -> Self {
+        CachingEngine {
+            cache_size,
+            predictions: predictions.unwrap_or_default(),
+            order: BTreeSet::new(),
+            index: HashMap::with_capacity(cache_size),
+            next_sequence: 0,
+            hits: 0,
+            misses: 0,
+        }
     }
 
-    /// Decides whether to execute the trade or to wait.
+    /// Processes a single item access.
     ///
-    /// The decision is based on a threshold that blends the initial price with the
-    /// predicted future price, weighted by the trust parameter.
+    /// On a miss the item is inserted, evicting the cached item with the latest
+    /// predicted next access if the cache is full. Note that, unlike `Caching::decide`,
+    /// inserting into a cache that is not yet full counts as a miss.
     ///
     /// # Arguments
     ///
-    /// * `current_price` - The current market price of the asset.
-    /// * `prediction` - The predicted future price of the asset.
-    /// * `trust` - A confidence score in the prediction, typically in [0.0, 1.0].
+    /// * `item` - The unique identifier of the item being accessed.
     ///
     /// # Returns
     ///
-    /// * `bool` - Returns `true` to execute the trade, `false` to wait.
-    pub fn decide(&self, current_price: f64, prediction: f64, trust: f64) -> bool {
-        let threshold = (1.0 - trust) * self.buy_price + trust * prediction;
-        current_price >= threshold
+    /// * `bool` - `true` for a cache hit, `false` for a miss.
+    pub fn access(&mut self, item: u32) -> bool {
+        let hit = self.access_item(item);
+        if hit {
+            self.hits += 1;
+        } else {
+            self.misses += 1;
+        }
+        hit
     }
-}
 
-/// Implements a learning-augmented scheduling algorithm (makespan minimization).
-///
-/// This algorithm assigns a set of jobs to a fixed number of machines with the goal
-/// of minimizing the makespan, which is the total time until the last job completes.
-/// It uses predictions of job lengths to sort them, aiming to schedule shorter jobs
-/// first (a variant of the Shortest Processing Time heuristic).
-#[pyclass]
-pub struct Scheduling {
-    num_machines: usize,
-}
+    /// Replays a whole trace of item accesses.
+    ///
+    /// The trace is read in place when it is a `uint32` NumPy array, and the replay
+    /// runs with the GIL released.
+    ///
+    /// # Arguments
+    ///
+    /// * `trace` - The item IDs in the order in which they are accessed.
+    ///
+    /// # Returns
+    ///
+    /// * `(u64, u64)` - The number of hits and misses over this trace.
+    pub fn access_many<'py>(&mut self, py: Python<'py>, trace: U32Array<'py>) -> (u64, u64) {
+        let trace = as_contiguous(&trace);
+        py.allow_threads(|| self.replay(&trace))
+    }
 
-#[pymethods]
-impl Scheduling {
-    /// Creates a new `Scheduling` instance.
+    /// Inserts or replaces the predicted next access time of a single item.
+    ///
+    /// If the item is cached, its eviction priority is updated in place.
     ///
     /// # Arguments
     ///
-    /// * `num_machines` - The number of identical machines available for processing jobs.
-    #[new]
-    pub fn new(num_machines: usize) -> Self {
-        Scheduling { num_machines }
+    /// * `item` - The unique identifier of the item.
+    /// * `prediction` - The new predicted time of the item's next access.
+    pub fn set_prediction(&mut self, item: u32, prediction: u32) {
+        self.update_prediction(item, Some(prediction));
     }
 
-    /// Assigns a list of jobs to the available machines.
+    /// Deletes the prediction of a single item.
     ///
-    /// This method sorts jobs based on their predicted lengths and then assigns each
-    /// job to the machine that will become free earliest.
+    /// A cached item without a prediction becomes the first eviction candidate.
     ///
     /// # Arguments
     ///
-    /// * `job_lengths` - A `Vec<u32>` containing the true, actual lengths of the jobs.
-    /// * `predictions` - A `Vec<u32>` containing the predicted lengths of the jobs.
-    ///                   The order of predictions must correspond to the order of `job_lengths`.
+    /// * `item` - The unique identifier of the item.
     ///
     /// # Returns
     ///
-    /// * `Vec<usize>` - A vector where the element at index `i` is the machine ID
-    ///                  (0 to `num_machines - 1`) assigned to job `i`.
-    pub fn decide(&self, job_lengths: Vec<u32>, predictions: Vec<u32>) -> Vec<usize> {
-        let jobs: Vec<(usize, u32)> = job_lengths.iter().map(|&x| x).enumerate().collect();
-        let mut sorted_jobs: Vec<(usize, u32)> = predictions.iter().map(|&x| x).enumerate().collect();
-        sorted_jobs.sort_by_key(|k| k.1);
-
-        let mut assignments = vec![0; jobs.len()];
-        let mut machine_loads = vec![0; self.num_machines];
-
-        for (job_index, _) in sorted_jobs {
-            let mut best_machine = 0;
-            let mut min_load = u32::MAX;
-            for j in 0..self.num_machines {
-                if machine_loads[j] < min_load {
-                    min_load = machine_loads[j];
-                    best_machine = j;
-                }
-            }
-            assignments[job_index] = best_machine;
-            machine_loads[best_machine] += jobs[job_index].1;
-        }
-        assignments
+    /// * `bool` - `true` if the item had a prediction.
+    pub fn remove_prediction(&mut self, item: u32) -> bool {
+        self.update_prediction(item, None)
     }
-}
-
-/// Implements a learning-augmented search algorithm.
-///
-/// This algorithm finds the maximum value in a list. It uses a prediction for the
-/// index of the maximum value as a starting point for its search, which can improve
-/// performance in certain online or resource-constrained scenarios.
-#[pyclass]
-pub struct Search {
-    #[allow(dead_code)]
-    max_value: u32,
-}
 
-#[pymethods]
-impl Search {
-    /// Creates a new `Search` instance.
+    /// Inserts or replaces the predictions of many items at once.
+    ///
+    /// `uint32` NumPy arrays are read in place and the update runs with the GIL released.
     ///
     /// # Arguments
     ///
-    /// * `max_value` - The theoretical maximum possible value in the search space.
-    ///                 (Note: This is not currently used in the `decide` method but
-    ///                 is part of the class structure for future extensions).
-    #[new]
-    pub fn new(max_value: u32) -> Self {
-        Search { max_value }
+    /// * `items` - The unique identifiers of the items.
+    /// * `predictions` - The new predicted next access time of each item.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<()>` - A `ValueError` if the inputs have different lengths.
+    pub fn update_predictions<'py>(
+        &mut self,
+        py: Python<'py>,
+        items: U32Array<'py>,
+        predictions: U32Array<'py>,
+    ) -> PyResult<()> {
+        let (items, predictions) = (as_contiguous(&items), as_contiguous(&predictions));
+        check_batch_lengths(&[items.len(), predictions.len()])?;
+        py.allow_threads(|| {
+            for (&item, &prediction) in items.iter().zip(predictions.iter()) {
+                self.update_prediction(item, Some(prediction));
+            }
+        });
+        Ok(())
     }
 
-    /// Finds the index of the maximum value in a list.
-    ///
-    /// It starts its search from the predicted index and wraps around the list,
-    /// which can be advantageous if the search can be terminated early.
+    /// Deletes the predictions of many items at once.
     ///
     /// # Arguments
     ///
-    /// * `values` - The `Vec<u32>` of values to search through.
-    /// * `prediction` - The predicted index of the maximum value.
+    /// * `items` - The unique identifiers of the items.
     ///
     /// # Returns
     ///
-    /// * `usize` - The index of the first occurrence of the maximum value found.
-    pub fn decide(&self, values: Vec<u32>, prediction: u32) -> usize {
-        let mut best_index = 0;
-        let mut max_value = 0;
-        let mut start_index = 0;
-        if prediction < values.len() as u32 {
-            start_index = prediction as usize;
-        }
+    /// * `usize` - The number of items that had a prediction.
+    pub fn remove_predictions<'py>(&mut self, py: Python<'py>, items: U32Array<'py>) -> usize {
+        let items = as_contiguous(&items);
+        py.allow_threads(|| items.iter().filter(|&&item| self.update_prediction(item, None)).count())
+    }
 
-        for i in 0..values.len() {
-            let index = (start_index + i) % values.len();
-            if values[index] > max_value {
-                max_value = values[index];
-                best_index = index;
+    /// Returns the current predicted next access time of an item, if any.
+    pub fn get_prediction(&self, item: u32) -> Option<u32> {
+        self.predictions.get(&item).copied()
+    }
+
+    /// Returns the cached items, ordered from the soonest to the latest predicted next access.
+    pub fn contents(&self) -> Vec<u32> {
+        self.order.iter().map(|&(_, _, item)| item).collect()
+    }
+
+    /// Returns an estimate of the memory held by this instance, in bytes.
+    pub fn memory_usage(&self) -> usize {
+        std::mem::size_of::<Self>()
+            + hash_map_bytes(&self.predictions)
+            + hash_map_bytes(&self.index)
+            + btree_set_bytes(&self.order)
+    }
+
+    /// Removes every item from the cache and resets the hit and miss counters.
+    pub fn clear(&mut self) {
+        self.order.clear();
+        self.index.clear();
+        self.hits = 0;
+        self.misses = 0;
+    }
+
+    /// The maximum number of items the cache can hold.
+    #[getter]
+    pub fn cache_size(&self) -> usize {
+        self.cache_size
+    }
+
+    /// The total number of hits since creation (or the last `clear`).
+    #[getter]
+    pub fn hits(&self) -> u64 {
+        self.hits
+    }
+
+    /// The total number of misses since creation (or the last `clear`).
+    #[getter]
+    pub fn misses(&self) -> u64 {
+        self.misses
+    }
+
+    pub fn __len__(&self) -> usize {
+        self.index.len()
+    }
+
+    pub fn __contains__(&self, item: u32) -> bool {
+        self.index.contains_key(&item)
+    }
+}
+
+impl CachingEngine {
+    /// Looks up `item` and inserts it on a miss, without touching the counters.
+    fn access_item(&mut self, item: u32) -> bool {
+        if self.index.contains_key(&item) {
+            return true;
+        }
+        if self.cache_size == 0 {
+            return false;
+        }
+        if self.index.len() >= self.cache_size {
+            if let Some((_, _, victim)) = self.order.pop_last() {
+                self.index.remove(&victim);
             }
         }
-        best_index
+        let prediction = self.predictions.get(&item).copied().unwrap_or(u32::MAX);
+        let sequence = self.next_sequence;
+        self.next_sequence += 1;
+        self.order.insert((prediction, Reverse(sequence), item));
+        self.index.insert(item, (prediction, sequence));
+        false
+    }
+
+    /// Sets (`Some`) or deletes (`None`) the prediction of `item` and re-keys it in
+    /// the eviction order if it is cached. Returns whether a prediction existed.
+    fn update_prediction(&mut self, item: u32, prediction: Option<u32>) -> bool {
+        let existed = match prediction {
+            Some(time) => self.predictions.insert(item, time).is_some(),
+            None => self.predictions.remove(&item).is_some(),
+        };
+        if let Some(key) = self.index.get_mut(&item) {
+            let (old, sequence) = *key;
+            let new = prediction.unwrap_or(u32::MAX);
+            if old != new {
+                self.order.remove(&(old, Reverse(sequence), item));
+                self.order.insert((new, Reverse(sequence), item));
+                key.0 = new;
+            }
+        }
+        existed
+    }
+
+    /// Replays `trace`, updating the counters, and returns its hit and miss counts.
+    fn replay(&mut self, trace: &[u32]) -> (u64, u64) {
+        let hits = trace.iter().filter(|&&item| self.access_item(item)).count() as u64;
+        let misses = trace.len() as u64 - hits;
+        self.hits += hits;
+        self.misses += misses;
+        (hits, misses)
+    }
+}
+
+/// Implements a learning-augmented Oneway Trading algorithm.
+///
+/// This algorithm addresses the problem of converting an initial amount of one asset
+/// into another by choosing the best time to execute the trade. The goal is to maximize
+/// the amount of the target asset obtained. This version uses a price prediction to
+/// decide when to trade.
+#[pyclass(frozen)]
+pub struct OnewayTrading {
+    buy_price: f64,
+}
+
+#[pymethods]
+impl OnewayTrading {
+    /// Creates a new `OnewayTrading` instance.
+    ///
+    /// # Arguments
+    ///
+    /// * `buy_price` - The initial price of the asset, used as a reference for the
+    ///                 deterministic part of the algorithm.
+    #[new]
+    pub fn new(buy_price: f64) -> Self {
+        OnewayTrading { buy_price }
+    }
+
+    /// Decides whether to execute the trade or to wait.
+    ///
+    /// The decision is based on a threshold that blends the initial price with the
+    /// predicted future price, weighted by the trust parameter.
+    ///
+    /// # Arguments
+    ///
+    /// * `current_price` - The current market price of the asset.
+    /// * `prediction` - The predicted future price of the asset.
+    /// * `trust` - A confidence score in the prediction, typically in [0.0, 1.0].
+    ///
+    /// # Returns
+    ///
+    /// * `bool` - Returns `true` to execute the trade, `false` to wait.
+    pub fn decide(&self, current_price: f64, prediction: f64, trust: f64) -> bool {
+        current_price >= self.threshold(prediction, trust)
+    }
+
+    /// Decides whether to trade or wait for NumPy arrays of independent queries.
+    ///
+    /// The inputs are read in place (see `F64Array`) and the decision loop runs with
+    /// the GIL released.
+    ///
+    /// # Arguments
+    ///
+    /// * `current_prices` - The current market price of each query.
+    /// * `predictions` - The predicted future price of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<numpy.ndarray>` - A boolean array with one decision per query (`true`
+    ///                               to trade), or a `ValueError` if the inputs have
+    ///                               different lengths.
+    pub fn decide_array<'py>(
+        &self,
+        py: Python<'py>,
+        current_prices: F64Array<'py>,
+        predictions: F64Array<'py>,
+        trusts: F64Array<'py>,
+    ) -> PyResult<Bound<'py, PyArray1<bool>>> {
+        let (prices, predictions, trusts) =
+            (as_contiguous(&current_prices), as_contiguous(&predictions), as_contiguous(&trusts));
+        check_batch_lengths(&[prices.len(), predictions.len(), trusts.len()])?;
+        let decisions = py.allow_threads(|| {
+            prices
+                .iter()
+                .zip(predictions.iter())
+                .zip(trusts.iter())
+                .map(|((&price, &prediction), &trust)| price >= self.threshold(prediction, trust))
+                .collect::<Vec<bool>>()
+        });
+        Ok(decisions.into_pyarray(py))
+    }
+
+    /// Decides whether to trade or wait for a batch of independent queries.
+    ///
+    /// # Arguments
+    ///
+    /// * `current_prices` - The current market price of each query.
+    /// * `predictions` - The predicted future price of each query.
+    /// * `trusts` - The confidence score in the prediction of each query.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<Vec<bool>>` - One decision per query (`true` to trade), or a `ValueError`
+    ///                           if the inputs have different lengths.
+    pub fn decide_batch(
+        &self,
+        current_prices: Vec<f64>,
+        predictions: Vec<f64>,
+        trusts: Vec<f64>,
+    ) -> PyResult<Vec<bool>> {
+        check_batch_lengths(&[current_prices.len(), predictions.len(), trusts.len()])?;
+        Ok(current_prices
+            .iter()
+            .zip(&predictions)
+            .zip(&trusts)
+            .map(|((&price, &prediction), &trust)| self.decide(price, prediction, trust))
+            .collect())
+    }
+}
+
+impl OnewayTrading {
+    /// Computes the price at or above which the trade is executed.
+    fn threshold(&self, prediction: f64, trust: f64) -> f64 {
+        (1.0 - trust) * self.buy_price + trust * prediction
+    }
+}
+
+/// Implements a learning-augmented scheduling algorithm (makespan minimization).
+///
+/// This algorithm assigns a set of jobs to a fixed number of machines with the goal
+/// of minimizing the makespan, which is the total time until the last job completes.
+/// It uses predictions of job lengths to sort them, aiming to schedule shorter jobs
+/// first (a variant of the Shortest Processing Time heuristic).
+#[pyclass(frozen)]
+pub struct Scheduling {
+    num_machines: usize,
+}
+
+#[pymethods]
+impl Scheduling {
+    /// Creates a new `Scheduling` instance.
+    ///
+    /// # Arguments
+    ///
+    /// * `num_machines` - The number of identical machines available for processing jobs.
+    #[new]
+    pub fn new(num_machines: usize) -> Self {
+        Scheduling { num_machines }
+    }
+
+    /// Assigns a list of jobs to the available machines.
+    ///
+    /// This method sorts jobs based on their predicted lengths and then assigns each
+    /// job to the machine that will become free earliest. Machine loads are kept in a
+    /// min-heap, so scheduling `n` jobs on `m` machines costs O(n log n + n log m);
+    /// large inputs are sorted in parallel.
+    ///
+    /// The whole assignment runs with the GIL released, so other Python threads keep
+    /// running while a large batch is scheduled.
+    ///
+    /// # Arguments
+    ///
+    /// * `job_lengths` - A `Vec<u32>` containing the true, actual lengths of the jobs.
+    /// * `predictions` - A `Vec<u32>` containing the predicted lengths of the jobs.
+    ///                   The order of predictions must correspond to the order of `job_lengths`.
+    ///
+    /// # Returns
+    ///
+    /// * `Vec<usize>` - A vector where the element at index `i` is the machine ID
+    ///                  (0 to `num_machines - 1`) assigned to job `i`.
+    #[pyo3(name = "decide")]
+    pub fn py_decide(&self, py: Python<'_>, job_lengths: Vec<u32>, predictions: Vec<u32>) -> Vec<usize> {
+        py.allow_threads(|| self.decide(job_lengths, predictions))
+    }
+
+    /// Assigns jobs given as NumPy arrays to the available machines.
+    ///
+    /// Same as `decide`, but `uint32` arrays are read in place instead of being
+    /// copied into lists first.
+    ///
+    /// # Arguments
+    ///
+    /// * `job_lengths` - The true, actual lengths of the jobs.
+    /// * `predictions` - The predicted lengths of the jobs, in the order of `job_lengths`.
+    ///
+    /// # Returns
+    ///
+    /// * `Vec<usize>` - The machine ID assigned to each job, as returned by `decide`.
+    pub fn decide_array<'py>(&self, py: Python<'py>, job_lengths: U32Array<'py>, predictions: U32Array<'py>) -> Vec<usize> {
+        let job_lengths = as_contiguous(&job_lengths);
+        let predictions = as_contiguous(&predictions);
+        py.allow_threads(|| self.assign(&job_lengths, &predictions))
+    }
+}
+
+impl Scheduling {
+    /// Assigns a list of jobs to the available machines (see `py_decide`).
+    pub fn decide(&self, job_lengths: Vec<u32>, predictions: Vec<u32>) -> Vec<usize> {
+        self.assign(&job_lengths, &predictions)
+    }
+
+    /// Assigns jobs to machines without taking ownership of the inputs.
+    fn assign(&self, job_lengths: &[u32], predictions: &[u32]) -> Vec<usize> {
+        // Sorting (prediction, index) pairs gives the same order as a stable sort by
+        // prediction, while allowing the faster unstable sort.
+        let mut sorted_jobs: Vec<(u32, usize)> = predictions.iter().copied().zip(0..).collect();
+        if sorted_jobs.len() >= PARALLEL_SORT_THRESHOLD {
+            sorted_jobs.par_sort_unstable();
+        } else {
+            sorted_jobs.sort_unstable();
+        }
+
+        // Ties between equally loaded machines go to the lowest machine ID.
+        let mut machine_loads: BinaryHeap<Reverse<(u64, usize)>> =
+            (0..self.num_machines).map(|machine| Reverse((0, machine))).collect();
+        let mut assignments = vec![0; job_lengths.len()];
+
+        for (_, job_index) in sorted_jobs {
+            let mut least_loaded = machine_loads.peek_mut().expect("Scheduling requires at least one machine");
+            let Reverse((load, machine)) = *least_loaded;
+            assignments[job_index] = machine;
+            *least_loaded = Reverse((load + job_lengths[job_index] as u64, machine));
+        }
+        assignments
+    }
+}
+
+/// Implements an online learning-augmented scheduler (makespan minimization).
+///
+/// Where `Scheduling` needs the full list of jobs up front, `OnlineScheduler` keeps
+/// its state between calls and assigns jobs one at a time as they arrive. Each job
+/// is placed on the machine with the smallest current load, using its predicted
+/// length; when the job completes, its actual length replaces the prediction in the
+/// machine's load. The load of a machine is therefore the actual length of its
+/// completed jobs plus the predicted length of its pending ones. Machines are kept
+/// in an ordered set keyed by load, so both events cost O(log m).
+#[pyclass]
+pub struct OnlineScheduler {
+    /// Machines ordered by `(load, machine ID)`; the first entry receives the next job.
+    machines: BTreeSet<(u64, usize)>,
+    loads: Vec<u64>,
+    /// Jobs that were submitted but not completed yet: job ID -> (machine, predicted length).
+    pending: HashMap<u64, (usize, u32)>,
+}
+
+#[pymethods]
+impl OnlineScheduler {
+    /// Creates a new `OnlineScheduler` with all machines idle.
+    ///
+    /// # Arguments
+    ///
+    /// * `num_machines` - The number of identical machines available for processing jobs.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<Self>` - A `ValueError` if `num_machines` is zero.
+    #[new]
+    pub fn new(num_machines: usize) -> PyResult<Self> {
+        if num_machines == 0 {
+            return Err(PyValueError::new_err("num_machines must be positive"));
+        }
+        Ok(OnlineScheduler {
+            machines: (0..num_machines).map(|machine| (0, machine)).collect(),
+            loads: vec![0; num_machines],
+            pending: HashMap::new(),
+        })
+    }
+
+    /// Assigns an arriving job to the least loaded machine.
+    ///
+    /// # Arguments
+    ///
+    /// * `job_id` - A unique identifier of the job.
+    /// * `predicted_len` - The predicted length of the job.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<usize>` - The machine ID the job was assigned to, or a `ValueError`
+    ///                       if a job with the same ID is still pending.
+    pub fn submit(&mut self, job_id: u64, predicted_len: u32) -> PyResult<usize> {
+        if self.pending.contains_key(&job_id) {
+            return Err(PyValueError::new_err(format!("job {} is already pending", job_id)));
+        }
+        let (load, machine) = self.machines.pop_first().expect("OnlineScheduler has at least one machine");
+        self.set_load(machine, load, load + predicted_len as u64);
+        self.pending.insert(job_id, (machine, predicted_len));
+        Ok(machine)
+    }
+
+    /// Records the completion of a pending job and corrects its machine's load.
+    ///
+    /// # Arguments
+    ///
+    /// * `job_id` - The identifier the job was submitted with.
+    /// * `actual_len` - The actual length of the job.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<usize>` - The machine ID the job ran on, or a `KeyError` if no job
+    ///                       with this ID is pending.
+    pub fn complete(&mut self, job_id: u64, actual_len: u32) -> PyResult<usize> {
+        let (machine, predicted_len) = self
+            .pending
+            .remove(&job_id)
+            .ok_or_else(|| PyKeyError::new_err(format!("job {} is not pending", job_id)))?;
+        let load = self.loads[machine];
+        self.machines.remove(&(load, machine));
+        self.set_load(machine, load, load - predicted_len as u64 + actual_len as u64);
+        Ok(machine)
+    }
+
+    /// Returns the current load of every machine, indexed by machine ID.
+    pub fn loads(&self) -> Vec<u64> {
+        self.loads.clone()
+    }
+
+    /// Returns the current makespan, i.e. the largest machine load.
+    pub fn makespan(&self) -> u64 {
+        self.machines.last().map_or(0, |&(load, _)| load)
+    }
+
+    /// Returns an estimate of the memory held by this instance, in bytes.
+    pub fn memory_usage(&self) -> usize {
+        std::mem::size_of::<Self>()
+            + self.loads.capacity() * std::mem::size_of::<u64>()
+            + btree_set_bytes(&self.machines)
+            + hash_map_bytes(&self.pending)
+    }
+
+    /// The number of machines.
+    #[getter]
+    pub fn num_machines(&self) -> usize {
+        self.loads.len()
+    }
+
+    /// The number of submitted jobs that have not completed yet.
+    #[getter]
+    pub fn num_pending(&self) -> usize {
+        self.pending.len()
+    }
+}
+
+impl OnlineScheduler {
+    /// Stores the new load of a machine that has already been removed from `machines`.
+    fn set_load(&mut self, machine: usize, old: u64, new: u64) {
+        debug_assert_eq!(self.loads[machine], old);
+        self.loads[machine] = new;
+        self.machines.insert((new, machine));
+    }
+}
+
+/// Implements a learning-augmented search algorithm.
+///
+/// This algorithm finds the maximum value in a list. It uses a prediction for the
+/// index of the maximum value as a starting point for its search, which can improve
+/// performance in certain online or resource-constrained scenarios.
+///
+/// With `early_stop`, `max_value` is treated as an upper bound on the values: the
+/// scan ends as soon as it reaches a value equal to `max_value`, since no later
+/// value can beat it. With an accurate prediction this happens within the first
+/// block after the predicted index.
+#[pyclass(frozen)]
+pub struct Search {
+    max_value: u32,
+}
+
+#[pymethods]
+impl Search {
+    /// Creates a new `Search` instance.
+    ///
+    /// # Arguments
+    ///
+    /// * `max_value` - The theoretical maximum possible value in the search space. It is
+    ///                 used as the stopping bound of searches with `early_stop`.
+    #[new]
+    pub fn new(max_value: u32) -> Self {
+        Search { max_value }
+    }
+
+    /// Finds the index of the maximum value in a list.
+    ///
+    /// It starts its search from the predicted index and wraps around the list,
+    /// which can be advantageous if the search can be terminated early.
+    ///
+    /// The scan runs with the GIL released.
+    ///
+    /// # Arguments
+    ///
+    /// * `values` - The `Vec<u32>` of values to search through.
+    /// * `prediction` - The predicted index of the maximum value.
+    /// * `early_stop` - Whether to stop at the first value equal to `max_value`.
+    ///
+    /// # Returns
+    ///
+    /// * `usize` - The index of the first occurrence of the maximum value found.
+    #[pyo3(name = "decide", signature = (values, prediction, early_stop=false))]
+    pub fn py_decide(&self, py: Python<'_>, values: Vec<u32>, prediction: u32, early_stop: bool) -> usize {
+        py.allow_threads(|| self.find_max(&values, prediction, early_stop))
+    }
+
+    /// Finds the index of the maximum value in a NumPy array.
+    ///
+    /// Same as `decide`, but a `uint32` array is read in place instead of being copied
+    /// into a list first, which matters for arrays with tens of millions of elements.
+    ///
+    /// # Arguments
+    ///
+    /// * `values` - The values to search through.
+    /// * `prediction` - The predicted index of the maximum value.
+    /// * `early_stop` - Whether to stop at the first value equal to `max_value`.
+    ///
+    /// # Returns
+    ///
+    /// * `usize` - The index of the first occurrence of the maximum value found.
+    #[pyo3(signature = (values, prediction, early_stop=false))]
+    pub fn decide_array<'py>(&self, py: Python<'py>, values: U32Array<'py>, prediction: u32, early_stop: bool) -> usize {
+        let values = as_contiguous(&values);
+        py.allow_threads(|| self.find_max(&values, prediction, early_stop))
+    }
+
+    /// The theoretical maximum possible value in the search space.
+    #[getter]
+    pub fn max_value(&self) -> u32 {
+        self.max_value
+    }
+}
+
+impl Search {
+    /// Finds the index of the maximum value in a list (see `py_decide`).
+    pub fn decide(&self, values: Vec<u32>, prediction: u32) -> usize {
+        self.find_max(&values, prediction, false)
+    }
+
+    /// Finds the index of the maximum value, scanning from the predicted index.
+    ///
+    /// The values are visited in wrap-around order starting at `prediction` (or at 0 if
+    /// it is out of bounds), one `SEARCH_BLOCK` at a time. Only the maximum of each
+    /// block is compared, and the winning block is searched for the first occurrence of
+    /// its maximum at the end, which gives the same result as the element-wise scan.
+    /// Full scans of large inputs compute the block maxima in parallel.
+    pub fn find_max(&self, values: &[u32], prediction: u32, early_stop: bool) -> usize {
+        let start = if (prediction as usize) < values.len() { prediction as usize } else { 0 };
+        // Nothing can beat `u32::MAX`, so a full scan may stop there as well.
+        let bound = if early_stop { self.max_value } else { u32::MAX };
+        let blocks: Vec<(usize, &[u32])> = values[start..]
+            .chunks(SEARCH_BLOCK)
+            .enumerate()
+            .map(|(i, block)| (start + i * SEARCH_BLOCK, block))
+            .chain(values[..start].chunks(SEARCH_BLOCK).enumerate().map(|(i, block)| (i * SEARCH_BLOCK, block)))
+            .collect();
+        let parallel = !early_stop && values.len() >= PARALLEL_SEARCH_THRESHOLD;
+        let maxima: Vec<u32> = if parallel {
+            blocks.par_iter().map(|(_, block)| block_max(block)).collect()
+        } else {
+            Vec::new()
+        };
+
+        let mut best = (0, 0, &values[..0]);
+        for (i, &(begin, block)) in blocks.iter().enumerate() {
+            let max = if parallel { maxima[i] } else { block_max(block) };
+            if max > best.0 {
+                best = (max, begin, block);
+            }
+            if max >= bound {
+                break;
+            }
+        }
+
+        let (max, begin, block) = best;
+        // Like the element-wise scan, an all-zero input resolves to index 0.
+        match block.iter().position(|&value| value == max) {
+            Some(offset) if max > 0 => begin + offset,
+            _ => 0,
+        }
+    }
+}
+
+/// Returns the largest value of a block, or 0 if it is empty.
+///
+/// Keeps `SEARCH_LANES` independent running maxima so that the compiler can map the
+/// loop onto SIMD max instructions.
+fn block_max(block: &[u32]) -> u32 {
+    let mut lanes = [0u32; SEARCH_LANES];
+    let mut chunks = block.chunks_exact(SEARCH_LANES);
+    for chunk in &mut chunks {
+        for (lane, &value) in lanes.iter_mut().zip(chunk) {
+            *lane = (*lane).max(value);
+        }
+    }
+    lanes.into_iter().chain(chunks.remainder().iter().copied()).max().unwrap_or(0)
+}
+
+/// How `TrustController` turns the accumulated evidence of a key into a trust.
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum TrustRule {
+    /// Multiplicative weights: the trust is the weight of the prediction expert.
+    Hedge,
+    /// Follow the leader: full trust while the prediction expert has the lower loss.
+    FollowTheLeader,
+}
+
+/// Learns the trust in predictions online and per key, from realized outcomes.
+///
+/// Each key (a user, an instrument, ...) has two experts competing: following the
+/// prediction and ignoring it. Once an outcome is realized, the prediction expert
+/// suffers its relative error in units of `error_scale`, capped at 1:
+/// `min(|prediction - outcome| / (error_scale * |outcome|), 1)`. The robust expert
+/// suffers the constant `baseline_loss`, i.e. the cost of falling back to the
+/// worst-case guarantee. Per key, the controller keeps the prediction expert's
+/// discounted cumulative advantage `A = sum(decay^age * (baseline_loss - loss))`. It
+/// derives the trust from `A` with one of two rules:
+///
+/// * `"hedge"`: the multiplicative-weights probability of the prediction expert,
+///   `sigmoid(logit(initial_trust) + learning_rate * A)`.
+/// * `"ftl"` (follow the leader): 1 while `A > 0`, 0 while `A < 0` and
+///   `initial_trust` on a tie.
+///
+/// With a `decay` below 1, old outcomes are forgotten, so the trust follows
+/// predictors whose quality drifts. Keys that were never observed have `initial_trust`.
+///
+/// The state of a key is a single `f64` in a dense vector, found through a map from
+/// key to slot. That is roughly 25 bytes per key, so millions of keys fit easily.
+#[pyclass]
+pub struct TrustController {
+    rule: TrustRule,
+    learning_rate: f64,
+    error_scale: f64,
+    baseline_loss: f64,
+    decay: f64,
+    initial_trust: f64,
+    /// `logit(initial_trust)`, the log-odds of the prediction expert before any outcome.
+    prior_log_odds: f64,
+    /// Maps each observed key to its slot in `advantages`.
+    slots: HashMap<u64, u32>,
+    /// The discounted cumulative advantage of the prediction expert, per slot.
+    advantages: Vec<f64>,
+}
+
+#[pymethods]
+impl TrustController {
+    /// Creates a new `TrustController` without any observed keys.
+    ///
+    /// # Arguments
+    ///
+    /// * `rule` - `"hedge"` (multiplicative weights) or `"ftl"` (follow the leader).
+    /// * `learning_rate` - How strongly each outcome moves the trust under `"hedge"`.
+    /// * `error_scale` - The relative prediction error at which a prediction counts as
+    ///                   completely wrong.
+    /// * `baseline_loss` - The loss of ignoring the prediction, in [0.0, 1.0]. Predictions
+    ///                     with a lower average loss gain trust.
+    /// * `decay` - The factor in (0.0, 1.0] by which the weight of past outcomes shrinks
+    ///             with every new outcome of the same key.
+    /// * `initial_trust` - The trust of a key before any outcome, in [0.0, 1.0]. Under
+    ///                     `"hedge"` it must lie strictly between 0.0 and 1.0, since
+    ///                     the trust would otherwise be stuck at its initial value.
+    /// * `capacity` - The number of keys to reserve memory for.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<Self>` - A `ValueError` if a parameter is out of range.
+    #[new]
+    #[pyo3(signature = (
+        rule="hedge", learning_rate=1.0, error_scale=1.0, baseline_loss=0.5, decay=1.0, initial_trust=0.5, capacity=0
+    ))]
+    pub fn new(
+        rule: &str,
+        learning_rate: f64,
+        error_scale: f64,
+        baseline_loss: f64,
+        decay: f64,
+        initial_trust: f64,
+        capacity: usize,
+    ) -> PyResult<Self> {
+        let rule = match rule {
+            "hedge" => TrustRule::Hedge,
+            "ftl" => TrustRule::FollowTheLeader,
+            _ => return Err(PyValueError::new_err(format!("rule must be 'hedge' or 'ftl', got {:?}", rule))),
+        };
+        if !(learning_rate > 0.0) {
+            return Err(PyValueError::new_err("learning_rate must be positive"));
+        }
+        if !(error_scale > 0.0) {
+            return Err(PyValueError::new_err("error_scale must be positive"));
+        }
+        if !(0.0..=1.0).contains(&baseline_loss) {
+            return Err(PyValueError::new_err("baseline_loss must be in [0, 1]"));
+        }
+        if !(decay > 0.0 && decay <= 1.0) {
+            return Err(PyValueError::new_err("decay must be in (0, 1]"));
+        }
+        if !(0.0..=1.0).contains(&initial_trust) {
+            return Err(PyValueError::new_err("initial_trust must be in [0, 1]"));
+        }
+        // The log-odds of 0 and 1 are infinite, which no finite advantage could move.
+        if rule == TrustRule::Hedge && (initial_trust == 0.0 || initial_trust == 1.0) {
+            return Err(PyValueError::new_err("initial_trust must be in (0, 1) for the 'hedge' rule"));
+        }
+        Ok(TrustController {
+            rule,
+            learning_rate,
+            error_scale,
+            baseline_loss,
+            decay,
+            initial_trust,
+            prior_log_odds: (initial_trust / (1.0 - initial_trust)).ln(),
+            slots: HashMap::with_capacity(capacity),
+            advantages: Vec::with_capacity(capacity),
+        })
+    }
+
+    /// Records a realized outcome of a key's prediction.
+    ///
+    /// # Arguments
+    ///
+    /// * `key` - The stream the prediction belongs to.
+    /// * `prediction` - The value that was predicted.
+    /// * `outcome` - The value that was realized.
+    pub fn observe(&mut self, key: u64, prediction: f64, outcome: f64) {
+        self.observe_one(key, prediction, outcome);
+    }
+
+    /// Records many realized outcomes, in order.
+    ///
+    /// The inputs are read in place (see `F64Array`) and the updates run with the GIL
+    /// released. A key may appear several times; its outcomes are applied in order.
+    ///
+    /// # Arguments
+    ///
+    /// * `keys` - The stream of each prediction.
+    /// * `predictions` - The predicted values.
+    /// * `outcomes` - The realized values.
+    ///
+    /// # Returns
+    ///
+    /// * `PyResult<()>` - A `ValueError` if the inputs have different lengths.
+    pub fn observe_array<'py>(
+        &mut self,
+        py: Python<'py>,
+        keys: U64Array<'py>,
+        predictions: F64Array<'py>,
+        outcomes: F64Array<'py>,
+    ) -> PyResult<()> {
+        let (keys, predictions, outcomes) = (as_contiguous(&keys), as_contiguous(&predictions), as_contiguous(&outcomes));
+        check_batch_lengths(&[keys.len(), predictions.len(), outcomes.len()])?;
+        py.allow_threads(|| self.observe_slice(&keys, &predictions, &outcomes));
+        Ok(())
+    }
+
+    /// Returns the current trust in a key's predictions, in [0.0, 1.0].
+    pub fn trust(&self, key: u64) -> f64 {
+        self.trust_of(key)
+    }
+
+    /// Returns the current trust of many keys as a NumPy array.
+    ///
+    /// The result can be passed as `trusts` to the `decide_array` methods directly.
+    /// The keys are read in place and the lookups run with the GIL released.
+    pub fn trust_array<'py>(&self, py: Python<'py>, keys: U64Array<'py>) -> Bound<'py, PyArray1<f64>> {
+        let keys = as_contiguous(&keys);
+        py.allow_threads(|| self.trusts(&keys)).into_pyarray(py)
+    }
+
+    /// Forgets the outcomes of every key.
+    pub fn clear(&mut self) {
+        self.slots.clear();
+        self.advantages.clear();
+    }
+
+    /// Returns an estimate of the memory held by this instance, in bytes.
+    pub fn memory_usage(&self) -> usize {
+        std::mem::size_of::<Self>()
+            + hash_map_bytes(&self.slots)
+            + self.advantages.capacity() * std::mem::size_of::<f64>()
+    }
+
+    pub fn __len__(&self) -> usize {
+        self.advantages.len()
+    }
+
+    pub fn __contains__(&self, key: u64) -> bool {
+        self.slots.contains_key(&key)
+    }
+}
+
+impl TrustController {
+    /// Records the outcomes of `keys` in order (the GIL-free core of `observe_array`).
+    pub fn observe_slice(&mut self, keys: &[u64], predictions: &[f64], outcomes: &[f64]) {
+        for ((&key, &prediction), &outcome) in keys.iter().zip(predictions).zip(outcomes) {
+            self.observe_one(key, prediction, outcome);
+        }
+    }
+
+    /// Returns the trust of every key in `keys` (the GIL-free core of `trust_array`).
+    pub fn trusts(&self, keys: &[u64]) -> Vec<f64> {
+        keys.iter().map(|&key| self.trust_of(key)).collect()
+    }
+
+    fn observe_one(&mut self, key: u64, prediction: f64, outcome: f64) {
+        let advantage = self.baseline_loss - self.loss(prediction, outcome);
+        let next = self.advantages.len() as u32;
+        let slot = *self.slots.entry(key).or_insert(next);
+        if slot == next {
+            self.advantages.push(advantage);
+        } else {
+            let total = &mut self.advantages[slot as usize];
+            *total = self.decay * *total + advantage;
+        }
+    }
+
+    /// The prediction expert's loss: its relative error in units of `error_scale`, capped at 1.
+    fn loss(&self, prediction: f64, outcome: f64) -> f64 {
+        let error = (prediction - outcome).abs();
+        if error == 0.0 {
+            return 0.0;
+        }
+        (error / (self.error_scale * outcome.abs())).min(1.0)
+    }
+
+    fn trust_of(&self, key: u64) -> f64 {
+        let Some(&slot) = self.slots.get(&key) else {
+            return self.initial_trust;
+        };
+        let advantage = self.advantages[slot as usize];
+        match self.rule {
+            TrustRule::Hedge => 1.0 / (1.0 + (-(self.prior_log_odds + self.learning_rate * advantage)).exp()),
+            TrustRule::FollowTheLeader if advantage > 0.0 => 1.0,
+            TrustRule::FollowTheLeader if advantage < 0.0 => 0.0,
+            TrustRule::FollowTheLeader => self.initial_trust,
+        }
     }
 }
 
 /// Defines the Python module for the Learning-Augmented Algorithms core library.
 ///
 /// This function exposes the Rust implementations of the LAA classes (`SkiRental`,
-/// `Caching`, `OnewayTrading`, `Scheduling`, `Search`) to Python, allowing them
-/// to be imported and used seamlessly.
+/// `Caching`, `CachingEngine`, `OnewayTrading`, `Scheduling`, `OnlineScheduler`,
+/// `Search`, `TrustController`) to Python, allowing them to be imported and used
+/// seamlessly.
+///
+/// The stateless classes are `frozen`, so a single instance can be shared between
+/// threads, and their methods that do non-trivial work release the GIL.
+///
+/// Whole-instance simulations are available in the `laa_core.simulate` submodule.
 #[pymodule]
 fn laa_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<SkiRental>()?;
     m.add_class::<RandomizedSkiRental>()?;
     m.add_class::<Caching>()?;
+    m.add_class::<CachingEngine>()?;
     m.add_class::<OnewayTrading>()?;
     m.add_class::<Scheduling>()?;
+    m.add_class::<OnlineScheduler>()?;
     m.add_class::<Search>()?;
+    m.add_class::<TrustController>()?;
+    simulate::register(m)?;
     Ok(())
 }
 
@@ -382,6 +1660,102 @@ mod tests {
         assert_eq!(ski_rental.decide(100, 120.0, 1.0), true);
     }
 
+    #[test]
+    fn test_ski_rental_decide_batch() {
+        let ski_rental = SkiRental::new(100.0);
+        let decisions = ski_rental
+            .decide_batch(vec![99, 100, 24, 25], vec![10.0, 10.0, 25.0, 25.0], vec![0.0, 0.0, 1.0, 1.0])
+            .unwrap();
+        assert_eq!(decisions, vec![false, true, false, true]);
+    }
+
+    #[test]
+    fn test_randomized_ski_rental_decide_batch_extremes() {
+        let rental = RandomizedSkiRental::new(100.0, None);
+        // Day 0 never buys; a day far past buy_cost * e always buys.
+        let decisions = rental.decide_batch(vec![0, 1000], vec![50.0, 50.0], vec![0.5, 0.5]).unwrap();
+        assert_eq!(decisions, vec![false, true]);
+    }
+
+    #[test]
+    fn test_ski_rental_buy_day_matches_daily_decisions() {
+        let rental = SkiRental::new(100.0);
+        for &(prediction, trust) in &[(10.0, 0.0), (25.0, 1.0), (120.0, 1.0), (37.5, 0.3), (0.0, 1.0), (-5.0, 1.0)] {
+            let polled = (1..=200).find(|&day| rental.decide(day, prediction, trust));
+            assert_eq!(rental.buy_day(prediction, trust), polled);
+        }
+        assert_eq!(rental.buy_day(50.0, f64::NAN), None);
+    }
+
+    #[test]
+    fn test_ln_gamma() {
+        assert!((ln_gamma(1.0)).abs() < 1e-12);
+        assert!((ln_gamma(5.0) - 24f64.ln()).abs() < 1e-12);
+        assert!((ln_gamma(0.5) - std::f64::consts::PI.sqrt().ln()).abs() < 1e-12);
+        // ln(100!) = ln Γ(101)
+        let ln_factorial: f64 = (1..=100).map(|k| (k as f64).ln()).sum();
+        assert!((ln_gamma(101.0) - ln_factorial).abs() < 1e-9);
+    }
+
+    #[test]
+    fn test_randomized_buy_day_matches_daily_polling() {
+        let rental = RandomizedSkiRental::new(100.0, None);
+        let (prediction, trust) = (80.0, 0.6);
+        let rate = rental.buy_probability(1.0, prediction, trust);
+        // Exact probability of buying on each day, from the per-day process.
+        let mut expected = vec![0.0; 400];
+        let mut still_renting = 1.0;
+        for day in 1..400 {
+            let p = rental.buy_probability(day as f64, prediction, trust);
+            expected[day] = still_renting * p;
+            still_renting *= 1.0 - p;
+            assert!((still_renting.max(f64::MIN_POSITIVE).ln() - log_survival(rate, day as f64).max(f64::MIN_POSITIVE.ln())).abs() < 1e-6);
+        }
+
+        let mut rng = rand::thread_rng();
+        let num_samples = 100_000;
+        let mut counts = vec![0u32; 400];
+        for _ in 0..num_samples {
+            counts[rental.draw_buy_day(&mut rng, prediction, trust).unwrap() as usize] += 1;
+        }
+        let expected_mean: f64 = expected.iter().enumerate().map(|(day, p)| day as f64 * p).sum();
+        let sampled_mean = counts.iter().enumerate().map(|(day, &c)| day as f64 * c as f64).sum::<f64>() / num_samples as f64;
+        assert!((sampled_mean - expected_mean).abs() < 0.01 * expected_mean, "{} vs {}", sampled_mean, expected_mean);
+        // Compare the distributions bucket by bucket (total variation distance).
+        let distance: f64 = counts
+            .iter()
+            .zip(&expected)
+            .map(|(&c, p)| (c as f64 / num_samples as f64 - p).abs())
+            .sum::<f64>()
+            / 2.0;
+        assert!(distance < 0.03, "total variation distance {}", distance);
+    }
+
+    #[test]
+    fn test_randomized_seed_replays_decisions() {
+        let first = RandomizedSkiRental::new(100.0, Some(9));
+        let second = RandomizedSkiRental::new(100.0, Some(9));
+        let decisions = |rental: &RandomizedSkiRental| -> Vec<bool> {
+            (1..=500).map(|day| rental.decide(day % 120, 80.0, 0.5)).collect()
+        };
+        assert_eq!(decisions(&first), decisions(&second));
+        assert_eq!(first.sample_buy_day(80.0, 0.5), second.sample_buy_day(80.0, 0.5));
+
+        let days: Vec<u32> = (1..=500).map(|day| day % 120).collect();
+        let batch = RandomizedSkiRental::new(100.0, Some(9))
+            .decide_batch(days, vec![80.0; 500], vec![0.5; 500])
+            .unwrap();
+        assert_eq!(batch, decisions(&RandomizedSkiRental::new(100.0, Some(9))));
+    }
+
+    #[test]
+    fn test_randomized_buy_day_never_without_probability() {
+        let rental = RandomizedSkiRental::new(100.0, None);
+        assert_eq!(rental.sample_buy_day(50.0, f64::NAN), None);
+        // With buy_cost < 1 / e the first day already buys with certainty.
+        assert_eq!(RandomizedSkiRental::new(0.1, None).sample_buy_day(50.0, 0.0), Some(1));
+    }
+
     #[test]
     fn test_caching_hit() {
         let caching = Caching::new(3, HashMap::new());
@@ -413,6 +1787,78 @@ mod tests {
         assert_eq!(new_cache, vec![1, 2, 4]);
     }
 
+    #[test]
+    fn test_caching_engine_hit_and_miss() {
+        let mut engine = CachingEngine::new(2, None);
+        assert_eq!(engine.access(1), false);
+        assert_eq!(engine.access(1), true);
+        assert_eq!(engine.access(2), false);
+        assert_eq!((engine.hits(), engine.misses()), (1, 2));
+        assert_eq!(engine.__len__(), 2);
+    }
+
+    #[test]
+    fn test_caching_engine_evicts_latest_prediction() {
+        let predictions = HashMap::from([(1, 10), (2, 5), (3, 15), (4, 1)]);
+        let mut engine = CachingEngine::new(3, Some(predictions));
+        for item in [1, 2, 3] {
+            engine.access(item);
+        }
+        assert_eq!(engine.access(4), false);
+        assert_eq!(engine.contents(), vec![4, 2, 1]);
+        assert!(!engine.__contains__(3));
+    }
+
+    #[test]
+    fn test_caching_engine_tie_evicts_oldest() {
+        // No predictions: every item ties at u32::MAX, so the oldest is evicted first.
+        let mut engine = CachingEngine::new(2, None);
+        engine.access(1);
+        engine.access(2);
+        engine.access(3);
+        assert!(!engine.__contains__(1));
+        assert!(engine.__contains__(2) && engine.__contains__(3));
+    }
+
+    #[test]
+    fn test_caching_engine_replay() {
+        let mut engine = CachingEngine::new(2, Some(HashMap::from([(1, 1), (2, 2), (3, 3)])));
+        let (hits, misses) = engine.replay(&[1, 2, 1, 3, 1, 2]);
+        assert_eq!((hits, misses), (2, 4));
+        assert_eq!((engine.hits(), engine.misses()), (2, 4));
+    }
+
+    #[test]
+    fn test_caching_engine_prediction_updates() {
+        let mut engine = CachingEngine::new(2, Some(HashMap::from([(1, 10), (2, 5)])));
+        engine.access(1);
+        engine.access(2);
+        // Item 2 is now predicted to come back last, so it is evicted instead of 1.
+        engine.set_prediction(2, 50);
+        engine.access(3);
+        assert!(engine.__contains__(1) && !engine.__contains__(2));
+        assert_eq!(engine.get_prediction(2), Some(50));
+
+        // Removing item 1's prediction makes it the next victim.
+        assert!(engine.remove_prediction(1));
+        assert!(!engine.remove_prediction(1));
+        engine.set_prediction(3, 100);
+        engine.access(4);
+        assert!(!engine.__contains__(1) && engine.__contains__(3));
+    }
+
+    #[test]
+    fn test_memory_usage_grows_with_state() {
+        let small = Caching::new(2, HashMap::new());
+        let large = Caching::new(2, (0..10_000).map(|item| (item, item)).collect());
+        assert!(large.memory_usage() > small.memory_usage() + 10_000 * 8);
+
+        let mut engine = CachingEngine::new(1000, None);
+        let empty = engine.memory_usage();
+        engine.replay(&(0..1000).collect::<Vec<u32>>());
+        assert!(engine.memory_usage() > empty);
+    }
+
     #[test]
     fn test_oneway_trading_no_trust() {
         let trading = OnewayTrading::new(100.0);
@@ -427,6 +1873,15 @@ mod tests {
         assert_eq!(trading.decide(120.0, 120.0, 1.0), true);
     }
 
+    #[test]
+    fn test_oneway_trading_decide_batch() {
+        let trading = OnewayTrading::new(100.0);
+        let decisions = trading
+            .decide_batch(vec![99.0, 100.0, 119.0, 120.0], vec![120.0; 4], vec![0.0, 0.0, 1.0, 1.0])
+            .unwrap();
+        assert_eq!(decisions, vec![false, true, false, true]);
+    }
+
     #[test]
     fn test_scheduling() {
         let scheduling = Scheduling::new(2);
@@ -436,6 +1891,71 @@ mod tests {
         assert_eq!(assignments, vec![0, 1, 1]);
     }
 
+    /// The original O(n·m) list scheduling, used as a reference for `Scheduling::decide`.
+    fn reference_schedule(num_machines: usize, job_lengths: &[u32], predictions: &[u32]) -> Vec<usize> {
+        let mut sorted_jobs: Vec<(usize, u32)> = predictions.iter().copied().enumerate().collect();
+        sorted_jobs.sort_by_key(|k| k.1);
+        let mut assignments = vec![0; job_lengths.len()];
+        let mut machine_loads = vec![0u64; num_machines];
+        for (job_index, _) in sorted_jobs {
+            let best_machine = (0..num_machines).min_by_key(|&j| (machine_loads[j], j)).unwrap();
+            assignments[job_index] = best_machine;
+            machine_loads[best_machine] += job_lengths[job_index] as u64;
+        }
+        assignments
+    }
+
+    #[test]
+    fn test_scheduling_matches_reference() {
+        let mut rng = rand::thread_rng();
+        for &(num_jobs, num_machines) in &[(1, 1), (50, 3), (1000, 17), (PARALLEL_SORT_THRESHOLD + 10, 64)] {
+            let job_lengths: Vec<u32> = (0..num_jobs).map(|_| rng.gen_range(1..100)).collect();
+            let predictions: Vec<u32> = (0..num_jobs).map(|_| rng.gen_range(1..20)).collect();
+            let scheduling = Scheduling::new(num_machines);
+            assert_eq!(
+                scheduling.decide(job_lengths.clone(), predictions.clone()),
+                reference_schedule(num_machines, &job_lengths, &predictions)
+            );
+        }
+    }
+
+    #[test]
+    fn test_online_scheduler_assigns_least_loaded() {
+        let mut scheduler = OnlineScheduler::new(2).unwrap();
+        assert_eq!(scheduler.submit(1, 10).unwrap(), 0);
+        assert_eq!(scheduler.submit(2, 5).unwrap(), 1);
+        assert_eq!(scheduler.submit(3, 12).unwrap(), 1);
+        assert_eq!(scheduler.loads(), vec![10, 17]);
+        assert_eq!(scheduler.makespan(), 17);
+        assert_eq!(scheduler.num_pending(), 3);
+    }
+
+    #[test]
+    fn test_online_scheduler_complete_corrects_load() {
+        let mut scheduler = OnlineScheduler::new(2).unwrap();
+        scheduler.submit(1, 10).unwrap();
+        scheduler.submit(2, 5).unwrap();
+        // Job 1 turned out much shorter than predicted, so machine 0 gets the next job.
+        assert_eq!(scheduler.complete(1, 2).unwrap(), 0);
+        assert_eq!(scheduler.loads(), vec![2, 5]);
+        assert_eq!(scheduler.submit(3, 4).unwrap(), 0);
+        assert_eq!(scheduler.makespan(), 6);
+        assert!(scheduler.complete(1, 2).is_err());
+    }
+
+    #[test]
+    fn test_online_scheduler_matches_batch_scheduling() {
+        let job_lengths = vec![10, 5, 12, 7, 3, 9];
+        let mut sorted: Vec<(u64, u32)> = job_lengths.iter().copied().zip(0..).map(|(len, id)| (id, len)).collect();
+        sorted.sort_by_key(|&(id, len)| (len, id));
+        let mut scheduler = OnlineScheduler::new(3).unwrap();
+        let mut assignments = vec![0; job_lengths.len()];
+        for (id, len) in sorted {
+            assignments[id as usize] = scheduler.submit(id, len).unwrap();
+        }
+        assert_eq!(assignments, Scheduling::new(3).decide(job_lengths.clone(), job_lengths));
+    }
+
     #[test]
     fn test_search() {
         let search = Search::new(100);
@@ -445,32 +1965,144 @@ mod tests {
         assert_eq!(best_index, 4);
     }
 
+    /// The original element-wise wrap-around scan, used as a reference for `Search::find_max`.
+    fn reference_search(values: &[u32], prediction: u32) -> usize {
+        let start = if (prediction as usize) < values.len() { prediction as usize } else { 0 };
+        let (mut best_index, mut max_value) = (0, 0);
+        for i in 0..values.len() {
+            let index = (start + i) % values.len();
+            if values[index] > max_value {
+                max_value = values[index];
+                best_index = index;
+            }
+        }
+        best_index
+    }
+
     #[test]
-    fn test_randomized_ski_rental_statistical() {
-        let buy_cost = 100.0;
-        let num_simulations = 10000;
-        let mut total_ratio = 0.0;
+    fn test_search_matches_reference() {
         let mut rng = rand::thread_rng();
+        let search = Search::new(u32::MAX);
+        for &(len, max) in &[(0, 1), (1, 1), (7, 3), (SEARCH_BLOCK * 3 + 5, 50), (PARALLEL_SEARCH_THRESHOLD + 10, 1000)] {
+            let values: Vec<u32> = (0..len).map(|_| rng.gen_range(0..max)).collect();
+            for prediction in [0, len as u32 / 2, len.saturating_sub(1) as u32, len as u32 + 1] {
+                assert_eq!(search.find_max(&values, prediction, false), reference_search(&values, prediction));
+            }
+        }
+        assert_eq!(search.find_max(&[0, 0, 0], 2, false), 0);
+    }
+
+    #[test]
+    fn test_search_early_stop() {
+        let search = Search::new(100);
+        let mut values = vec![1u32; SEARCH_BLOCK * 8];
+        values[10] = 100;
+        values[SEARCH_BLOCK * 5] = 100;
+        // Starting in the sixth block, the early stop never wraps around to index 10.
+        assert_eq!(search.find_max(&values, SEARCH_BLOCK as u32 * 5 - 3, true), SEARCH_BLOCK * 5);
+        assert_eq!(search.find_max(&values, 5, true), 10);
+        // Without a value reaching the bound, the result is the full-scan maximum.
+        values[10] = 99;
+        values[SEARCH_BLOCK * 5] = 99;
+        assert_eq!(search.find_max(&values, 11, true), SEARCH_BLOCK * 5);
+    }
+
+    fn trust_controller(rule: &str, decay: f64) -> TrustController {
+        TrustController::new(rule, 1.0, 1.0, 0.5, decay, 0.5, 0).unwrap()
+    }
+
+    #[test]
+    fn test_trust_controller_learns_per_key() {
+        let mut controller = trust_controller("hedge", 1.0);
+        assert_eq!(controller.trust(7), 0.5);
+        for _ in 0..20 {
+            controller.observe(1, 101.0, 100.0);
+            controller.observe(2, 300.0, 100.0);
+        }
+        assert!(controller.trust(1) > 0.99, "trust was {}", controller.trust(1));
+        assert!(controller.trust(2) < 0.01, "trust was {}", controller.trust(2));
+        assert_eq!(controller.trust(7), 0.5);
+        assert_eq!(controller.__len__(), 2);
+        assert!(controller.__contains__(1) && !controller.__contains__(7));
+    }
 
-        for _ in 0..num_simulations {
-            let ski_days = rng.gen_range(1..150);
-            // Add more realistic noise to the prediction
-            let noise = rng.gen_range(0.7..1.3);
-            let prediction = (ski_days as f64 * noise).max(1.0);
-            let trust = 0.8;
-            let rental = RandomizedSkiRental::new(buy_cost);
-
-            let mut alg_cost = ski_days as f64; // Default cost is renting all days
-            for day in 1..=ski_days {
-                if rental.decide(day, prediction, trust) {
-                    alg_cost = (day - 1) as f64 + buy_cost;
-                    break; // Decision is final
-                }
+    #[test]
+    fn test_trust_controller_hedge_weights() {
+        // Two outcomes with losses 0 and 1 cancel out; a perfect one adds an advantage of 0.5.
+        let mut controller = trust_controller("hedge", 1.0);
+        controller.observe_slice(&[3, 3, 3], &[10.0, 30.0, 10.0], &[10.0, 10.0, 10.0]);
+        assert!((controller.trust(3) - 1.0 / (1.0 + (-0.5f64).exp())).abs() < 1e-12);
+    }
+
+    #[test]
+    fn test_trust_controller_follow_the_leader() {
+        let mut controller = trust_controller("ftl", 1.0);
+        controller.observe(1, 100.0, 100.0);
+        assert_eq!(controller.trust(1), 1.0);
+        controller.observe(1, 500.0, 100.0);
+        assert_eq!(controller.trust(1), 0.5);
+        controller.observe(1, 500.0, 100.0);
+        assert_eq!(controller.trust(1), 0.0);
+    }
+
+    #[test]
+    fn test_trust_controller_decay_recovers() {
+        let mut forgetful = trust_controller("hedge", 0.5);
+        let mut stubborn = trust_controller("hedge", 1.0);
+        for controller in [&mut forgetful, &mut stubborn] {
+            for _ in 0..100 {
+                controller.observe(1, 0.0, 100.0);
+            }
+            for _ in 0..10 {
+                controller.observe(1, 100.0, 100.0);
             }
+        }
+        assert!(forgetful.trust(1) > 0.6, "trust was {}", forgetful.trust(1));
+        assert!(stubborn.trust(1) < 1e-9, "trust was {}", stubborn.trust(1));
+    }
 
-            let optimal_cost = (ski_days as f64).min(buy_cost);
-            total_ratio += alg_cost / optimal_cost;
+    #[test]
+    fn test_trust_controller_batch_matches_scalar() {
+        let keys: Vec<u64> = (0..1000u64).map(|i| i * 2_654_435_761 % 97).collect();
+        let predictions: Vec<f64> = (0..1000).map(|i| 50.0 + (i % 13) as f64 * 10.0).collect();
+        let outcomes: Vec<f64> = (0..1000).map(|i| 100.0 + (i % 7) as f64).collect();
+        let mut batched = trust_controller("hedge", 0.9);
+        let mut scalar = trust_controller("hedge", 0.9);
+        batched.observe_slice(&keys, &predictions, &outcomes);
+        for i in 0..keys.len() {
+            scalar.observe(keys[i], predictions[i], outcomes[i]);
         }
+        let all: Vec<u64> = (0..100).collect();
+        assert_eq!(batched.trusts(&all), all.iter().map(|&key| scalar.trust(key)).collect::<Vec<f64>>());
+    }
+
+    #[test]
+    fn test_trust_controller_rejects_bad_parameters() {
+        assert!(TrustController::new("greedy", 1.0, 1.0, 0.5, 1.0, 0.5, 0).is_err());
+        assert!(TrustController::new("hedge", 0.0, 1.0, 0.5, 1.0, 0.5, 0).is_err());
+        assert!(TrustController::new("hedge", 1.0, 1.0, 0.5, 0.0, 0.5, 0).is_err());
+        assert!(TrustController::new("hedge", 1.0, 1.0, 0.5, 1.0, 1.5, 0).is_err());
+        assert!(TrustController::new("hedge", 1.0, 1.0, 0.5, 1.0, 0.0, 0).is_err());
+        assert!(TrustController::new("hedge", 1.0, 1.0, 0.5, 1.0, 1.0, 0).is_err());
+        assert!(TrustController::new("ftl", 1.0, 1.0, 0.5, 1.0, 0.0, 0).is_ok());
+        assert!(TrustController::new("ftl", 1.0, 1.0, 0.5, 1.0, 1.0, 0).is_ok());
+    }
+
+    #[test]
+    fn test_randomized_ski_rental_statistical() {
+        let buy_cost = 100.0;
+        let num_simulations = 10000;
+        let mut rng = rand::thread_rng();
+
+        let ski_days: Vec<u32> = (0..num_simulations).map(|_| rng.gen_range(1..150)).collect();
+        // Add more realistic noise to the prediction
+        let predictions: Vec<f64> = ski_days
+            .iter()
+            .map(|&days| (days as f64 * rng.gen_range(0.7..1.3)).max(1.0))
+            .collect();
+        let trusts = vec![0.8; num_simulations];
+        let outcomes = simulate::randomized_ski_rental_outcomes(buy_cost, &ski_days, &predictions, &trusts, rng.gen());
+        let total_ratio: f64 = outcomes.iter().map(simulate::Outcome::ratio).sum();
 
         let avg_ratio = total_ratio / num_simulations as f64;
         assert!(avg_ratio < 1.7, "Average ratio was {}", avg_ratio);
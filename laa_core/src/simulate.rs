@@ -0,0 +1,502 @@
+//! Native simulation of whole problem instances, exposed to Python as `laa_core.simulate`.
+//!
+//! Each function takes the ground truth and the predictions of many independent
+//! instances as NumPy arrays, plays every instance to the end in Rust, and returns
+//! three `float64` arrays with one entry per instance: the algorithm's cost, the
+//! optimal (offline) cost, and the competitive ratio. Instances are simulated in
+//! parallel with rayon while the GIL is released.
+//!
+//! Instances of varying size (price paths, caching traces, job sets) are passed as one
+//! flat array plus a `lengths` array that splits it into consecutive instances.
+
+use super::{as_contiguous, check_batch_lengths, CachingEngine, F64Array, OnewayTrading, RandomizedSkiRental, Scheduling, SkiRental, U32Array};
+use numpy::{IntoPyArray, PyArray1};
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use rand::{Rng, SeedableRng};
+use rand_pcg::Pcg64Mcg;
+use rayon::prelude::*;
+use std::collections::{BTreeSet, HashMap};
+use std::ops::Range;
+
+/// The cost paid by an algorithm and by the offline optimum on one instance.
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct Outcome {
+    pub alg_cost: f64,
+    pub opt_cost: f64,
+}
+
+impl Outcome {
+    /// Returns the competitive ratio of a cost-minimization instance (`alg / opt`).
+    ///
+    /// An instance that costs nothing to either side has a ratio of 1.
+    pub fn ratio(&self) -> f64 {
+        ratio(self.alg_cost, self.opt_cost)
+    }
+}
+
+fn ratio(numerator: f64, denominator: f64) -> f64 {
+    if denominator > 0.0 {
+        numerator / denominator
+    } else if numerator == 0.0 {
+        1.0
+    } else {
+        f64::INFINITY
+    }
+}
+
+/// The algorithm costs, optimal costs and competitive ratios returned to Python.
+type OutcomeArrays<'py> = (Bound<'py, PyArray1<f64>>, Bound<'py, PyArray1<f64>>, Bound<'py, PyArray1<f64>>);
+
+fn into_arrays<'py>(py: Python<'py>, outcomes: Vec<Outcome>, ratios: Vec<f64>) -> OutcomeArrays<'py> {
+    let (alg_costs, opt_costs): (Vec<f64>, Vec<f64>) = outcomes.iter().map(|o| (o.alg_cost, o.opt_cost)).unzip();
+    (alg_costs.into_pyarray(py), opt_costs.into_pyarray(py), ratios.into_pyarray(py))
+}
+
+fn cost_arrays<'py>(py: Python<'py>, outcomes: Vec<Outcome>) -> OutcomeArrays<'py> {
+    let ratios = outcomes.iter().map(Outcome::ratio).collect();
+    into_arrays(py, outcomes, ratios)
+}
+
+/// Splits a flat array of `total` elements into the ranges of consecutive instances.
+///
+/// Without `lengths`, the whole array is a single instance.
+///
+/// # Returns
+///
+/// * `PyResult<Vec<Range<usize>>>` - One range per instance, or a `ValueError` if the
+///                                    lengths do not add up to `total`.
+fn instance_ranges(lengths: Option<&[u32]>, total: usize) -> PyResult<Vec<Range<usize>>> {
+    let Some(lengths) = lengths else {
+        return Ok(vec![0..total]);
+    };
+    let mut start = 0;
+    let ranges: Vec<Range<usize>> = lengths
+        .iter()
+        .map(|&len| {
+            let range = start..start + len as usize;
+            start = range.end;
+            range
+        })
+        .collect();
+    if start != total {
+        return Err(PyValueError::new_err(format!(
+            "lengths add up to {} but the inputs have {} elements",
+            start, total
+        )));
+    }
+    Ok(ranges)
+}
+
+/// Simulates deterministic Ski Rental seasons.
+///
+/// Renting costs 1 per day; buying costs `buy_cost` and ends the rentals. A season of
+/// `d` days in which the algorithm buys on day `b <= d` costs `b - 1 + buy_cost`.
+pub fn ski_rental_outcomes(buy_cost: f64, ski_days: &[u32], predictions: &[f64], trusts: &[f64]) -> Vec<Outcome> {
+    let algorithm = SkiRental::new(buy_cost);
+    (0..ski_days.len())
+        .into_par_iter()
+        .map(|i| {
+            let days = ski_days[i] as f64;
+            let alg_cost = match algorithm.first_buy_day(predictions[i], trusts[i]) {
+                Some(buy_day) if buy_day <= ski_days[i] => (buy_day - 1) as f64 + buy_cost,
+                _ => days,
+            };
+            Outcome { alg_cost, opt_cost: days.min(buy_cost) }
+        })
+        .collect()
+}
+
+/// Simulates randomized Ski Rental seasons.
+///
+/// The buy day of each season is sampled in closed form (see
+/// `RandomizedSkiRental::sample_buy_day`). Instance `i` draws from its own generator
+/// seeded with `seed + i`, so results do not depend on how instances are spread over
+/// threads.
+pub fn randomized_ski_rental_outcomes(
+    buy_cost: f64,
+    ski_days: &[u32],
+    predictions: &[f64],
+    trusts: &[f64],
+    seed: u64,
+) -> Vec<Outcome> {
+    let algorithm = RandomizedSkiRental::new(buy_cost, Some(seed));
+    (0..ski_days.len())
+        .into_par_iter()
+        .map(|i| {
+            let mut rng = Pcg64Mcg::seed_from_u64(seed.wrapping_add(i as u64));
+            let days = ski_days[i];
+            let alg_cost = match algorithm.draw_buy_day(&mut rng, predictions[i], trusts[i]) {
+                Some(buy_day) if buy_day <= days => (buy_day - 1) as f64 + buy_cost,
+                _ => days as f64,
+            };
+            Outcome { alg_cost, opt_cost: (days as f64).min(buy_cost) }
+        })
+        .collect()
+}
+
+/// Simulates Oneway Trading price paths.
+///
+/// The algorithm trades at the first price `OnewayTrading::decide` accepts, or at the
+/// last price of the path if it accepts none. Trading maximizes the price obtained, so
+/// `alg_cost` and `opt_cost` hold the obtained and the best price of each path.
+pub fn oneway_trading_outcomes(
+    buy_price: f64,
+    prices: &[f64],
+    ranges: &[Range<usize>],
+    predictions: &[f64],
+    trusts: &[f64],
+) -> Vec<Outcome> {
+    let algorithm = OnewayTrading::new(buy_price);
+    ranges
+        .par_iter()
+        .enumerate()
+        .map(|(i, range)| {
+            let path = &prices[range.clone()];
+            let threshold = algorithm.threshold(predictions[i], trusts[i]);
+            let traded = path.iter().copied().find(|&price| price >= threshold).or(path.last().copied());
+            Outcome {
+                alg_cost: traded.unwrap_or(0.0),
+                opt_cost: path.iter().copied().fold(0.0, f64::max),
+            }
+        })
+        .collect()
+}
+
+/// Counts the misses of Belady's offline-optimal eviction policy on a trace.
+///
+/// On a miss into a full cache, the item whose next request lies furthest in the
+/// future is evicted.
+pub fn belady_misses(cache_size: usize, trace: &[u32]) -> u64 {
+    let mut next_use = vec![usize::MAX; trace.len()];
+    let mut last_seen: HashMap<u32, usize> = HashMap::new();
+    for (t, &item) in trace.iter().enumerate().rev() {
+        if let Some(next) = last_seen.insert(item, t) {
+            next_use[t] = next;
+        }
+    }
+
+    let mut cached: HashMap<u32, usize> = HashMap::with_capacity(cache_size);
+    let mut by_next_use: BTreeSet<(usize, u32)> = BTreeSet::new();
+    let mut misses = 0;
+    for (t, &item) in trace.iter().enumerate() {
+        if let Some(previous) = cached.remove(&item) {
+            by_next_use.remove(&(previous, item));
+        } else {
+            misses += 1;
+            if cache_size == 0 {
+                continue;
+            }
+            if cached.len() == cache_size {
+                let (_, victim) = by_next_use.pop_last().expect("a full cache is not empty");
+                cached.remove(&victim);
+            }
+        }
+        cached.insert(item, next_use[t]);
+        by_next_use.insert((next_use[t], item));
+    }
+    misses
+}
+
+/// Simulates learning-augmented caching on request traces.
+///
+/// At access `t`, `predicted_next[t]` is the predicted time of the next request for
+/// `trace[t]`; it becomes the item's prediction once the access has been served, as
+/// in `CachingEngine`. Costs are miss counts, compulsory misses included, and the
+/// optimum is Belady's offline policy.
+pub fn caching_outcomes(cache_size: usize, trace: &[u32], predicted_next: &[u32], ranges: &[Range<usize>]) -> Vec<Outcome> {
+    ranges
+        .par_iter()
+        .map(|range| {
+            let mut engine = CachingEngine::new(cache_size, None);
+            for t in range.clone() {
+                engine.access(trace[t]);
+                engine.set_prediction(trace[t], predicted_next[t]);
+            }
+            Outcome {
+                alg_cost: engine.misses as f64,
+                opt_cost: belady_misses(cache_size, &trace[range.clone()]) as f64,
+            }
+        })
+        .collect()
+}
+
+/// Simulates prediction-sorted list scheduling on job sets.
+///
+/// The algorithm's cost is the makespan of the `Scheduling` assignment under the true
+/// job lengths. Minimizing the makespan is NP-hard, so `opt_cost` is the standard lower
+/// bound `max(longest job, ceil(total length / num_machines))`, which makes the ratio
+/// an upper bound on the true competitive ratio.
+pub fn scheduling_outcomes(num_machines: usize, job_lengths: &[u32], predictions: &[u32], ranges: &[Range<usize>]) -> Vec<Outcome> {
+    let algorithm = Scheduling::new(num_machines);
+    ranges
+        .par_iter()
+        .map(|range| {
+            let jobs = &job_lengths[range.clone()];
+            let assignments = algorithm.assign(jobs, &predictions[range.clone()]);
+            let mut loads = vec![0u64; num_machines];
+            for (&machine, &length) in assignments.iter().zip(jobs) {
+                loads[machine] += length as u64;
+            }
+            let total: u64 = jobs.iter().map(|&length| length as u64).sum();
+            let longest = jobs.iter().copied().max().unwrap_or(0) as u64;
+            Outcome {
+                alg_cost: loads.into_iter().max().unwrap_or(0) as f64,
+                opt_cost: longest.max(total.div_ceil(num_machines as u64)) as f64,
+            }
+        })
+        .collect()
+}
+
+/// Simulates deterministic Ski Rental seasons (see `SkiRental`).
+///
+/// # Arguments
+///
+/// * `buy_cost` - The cost of buying skis; renting costs 1 per day.
+/// * `ski_days` - The true length of each season.
+/// * `predictions` - The predicted length of each season.
+/// * `trusts` - The trust placed in each prediction.
+///
+/// # Returns
+///
+/// * `PyResult<(ndarray, ndarray, ndarray)>` - The algorithm costs, optimal costs and
+///   competitive ratios, or a `ValueError` if the inputs have different lengths.
+#[pyfunction]
+fn ski_rental<'py>(
+    py: Python<'py>,
+    buy_cost: f64,
+    ski_days: U32Array<'py>,
+    predictions: F64Array<'py>,
+    trusts: F64Array<'py>,
+) -> PyResult<OutcomeArrays<'py>> {
+    let (ski_days, predictions, trusts) = (as_contiguous(&ski_days), as_contiguous(&predictions), as_contiguous(&trusts));
+    check_batch_lengths(&[ski_days.len(), predictions.len(), trusts.len()])?;
+    let outcomes = py.allow_threads(|| ski_rental_outcomes(buy_cost, &ski_days, &predictions, &trusts));
+    Ok(cost_arrays(py, outcomes))
+}
+
+/// Simulates randomized Ski Rental seasons (see `RandomizedSkiRental`).
+///
+/// # Arguments
+///
+/// * `buy_cost` - The cost of buying skis; renting costs 1 per day.
+/// * `ski_days` - The true length of each season.
+/// * `predictions` - The predicted length of each season.
+/// * `trusts` - The trust placed in each prediction.
+/// * `seed` - Makes the simulation reproducible. If None, a random seed is drawn.
+///
+/// # Returns
+///
+/// * `PyResult<(ndarray, ndarray, ndarray)>` - The algorithm costs, optimal costs and
+///   competitive ratios, or a `ValueError` if the inputs have different lengths.
+#[pyfunction]
+#[pyo3(signature = (buy_cost, ski_days, predictions, trusts, seed=None))]
+fn randomized_ski_rental<'py>(
+    py: Python<'py>,
+    buy_cost: f64,
+    ski_days: U32Array<'py>,
+    predictions: F64Array<'py>,
+    trusts: F64Array<'py>,
+    seed: Option<u64>,
+) -> PyResult<OutcomeArrays<'py>> {
+    let (ski_days, predictions, trusts) = (as_contiguous(&ski_days), as_contiguous(&predictions), as_contiguous(&trusts));
+    check_batch_lengths(&[ski_days.len(), predictions.len(), trusts.len()])?;
+    let seed = seed.unwrap_or_else(|| rand::thread_rng().gen());
+    let outcomes = py.allow_threads(|| randomized_ski_rental_outcomes(buy_cost, &ski_days, &predictions, &trusts, seed));
+    Ok(cost_arrays(py, outcomes))
+}
+
+/// Simulates Oneway Trading price paths (see `OnewayTrading`).
+///
+/// # Arguments
+///
+/// * `buy_price` - The reference price of the algorithm.
+/// * `prices` - The price paths of all instances, concatenated.
+/// * `predictions` - The predicted price of each instance.
+/// * `trusts` - The trust placed in each prediction.
+/// * `lengths` - The length of each price path. If None, `prices` is a single path.
+///
+/// # Returns
+///
+/// * `PyResult<(ndarray, ndarray, ndarray)>` - The obtained prices, the best prices and
+///   the competitive ratios (best / obtained), or a `ValueError` if the inputs do not
+///   describe the same number of instances.
+#[pyfunction]
+#[pyo3(signature = (buy_price, prices, predictions, trusts, lengths=None))]
+fn oneway_trading<'py>(
+    py: Python<'py>,
+    buy_price: f64,
+    prices: F64Array<'py>,
+    predictions: F64Array<'py>,
+    trusts: F64Array<'py>,
+    lengths: Option<U32Array<'py>>,
+) -> PyResult<OutcomeArrays<'py>> {
+    let (prices, predictions, trusts) = (as_contiguous(&prices), as_contiguous(&predictions), as_contiguous(&trusts));
+    let lengths = lengths.as_ref().map(|lengths| as_contiguous(lengths));
+    let ranges = instance_ranges(lengths.as_deref(), prices.len())?;
+    check_batch_lengths(&[ranges.len(), predictions.len(), trusts.len()])?;
+    let outcomes = py.allow_threads(|| oneway_trading_outcomes(buy_price, &prices, &ranges, &predictions, &trusts));
+    // Trading maximizes the obtained price, so the ratio is best / obtained.
+    let ratios = outcomes.iter().map(|o| ratio(o.opt_cost, o.alg_cost)).collect();
+    Ok(into_arrays(py, outcomes, ratios))
+}
+
+/// Simulates learning-augmented caching on request traces (see `CachingEngine`).
+///
+/// # Arguments
+///
+/// * `cache_size` - The maximum number of items the cache can hold.
+/// * `trace` - The requested item IDs of all instances, concatenated.
+/// * `predicted_next` - For each request, the predicted time (index within its own
+///                      trace) of the next request for the same item.
+/// * `lengths` - The length of each trace. If None, `trace` is a single trace.
+///
+/// # Returns
+///
+/// * `PyResult<(ndarray, ndarray, ndarray)>` - The misses of the algorithm, the misses of
+///   Belady's offline policy and the competitive ratios, or a `ValueError` if the
+///   inputs have different lengths.
+#[pyfunction]
+#[pyo3(signature = (cache_size, trace, predicted_next, lengths=None))]
+fn caching<'py>(
+    py: Python<'py>,
+    cache_size: usize,
+    trace: U32Array<'py>,
+    predicted_next: U32Array<'py>,
+    lengths: Option<U32Array<'py>>,
+) -> PyResult<OutcomeArrays<'py>> {
+    let (trace, predicted_next) = (as_contiguous(&trace), as_contiguous(&predicted_next));
+    check_batch_lengths(&[trace.len(), predicted_next.len()])?;
+    let lengths = lengths.as_ref().map(|lengths| as_contiguous(lengths));
+    let ranges = instance_ranges(lengths.as_deref(), trace.len())?;
+    let outcomes = py.allow_threads(|| caching_outcomes(cache_size, &trace, &predicted_next, &ranges));
+    Ok(cost_arrays(py, outcomes))
+}
+
+/// Simulates prediction-sorted list scheduling on job sets (see `Scheduling`).
+///
+/// # Arguments
+///
+/// * `num_machines` - The number of identical machines.
+/// * `job_lengths` - The true job lengths of all instances, concatenated.
+/// * `predictions` - The predicted length of each job.
+/// * `lengths` - The number of jobs of each instance. If None, all jobs form a single
+///               instance.
+///
+/// # Returns
+///
+/// * `PyResult<(ndarray, ndarray, ndarray)>` - The makespans of the algorithm, the
+///   makespan lower bounds and the resulting ratios, or a `ValueError` if the inputs
+///   have different lengths or `num_machines` is 0.
+#[pyfunction]
+#[pyo3(signature = (num_machines, job_lengths, predictions, lengths=None))]
+fn scheduling<'py>(
+    py: Python<'py>,
+    num_machines: usize,
+    job_lengths: U32Array<'py>,
+    predictions: U32Array<'py>,
+    lengths: Option<U32Array<'py>>,
+) -> PyResult<OutcomeArrays<'py>> {
+    if num_machines == 0 {
+        return Err(PyValueError::new_err("num_machines must be at least 1"));
+    }
+    let (job_lengths, predictions) = (as_contiguous(&job_lengths), as_contiguous(&predictions));
+    check_batch_lengths(&[job_lengths.len(), predictions.len()])?;
+    let lengths = lengths.as_ref().map(|lengths| as_contiguous(lengths));
+    let ranges = instance_ranges(lengths.as_deref(), job_lengths.len())?;
+    let outcomes = py.allow_threads(|| scheduling_outcomes(num_machines, &job_lengths, &predictions, &ranges));
+    Ok(cost_arrays(py, outcomes))
+}
+
+/// Adds the `simulate` submodule to the `laa_core` module.
+///
+/// The submodule is also registered in `sys.modules`, so that
+/// `import laa_core.simulate` works like for a pure-Python package.
+pub(crate) fn register(parent: &Bound<'_, PyModule>) -> PyResult<()> {
+    let py = parent.py();
+    let module = PyModule::new(py, "simulate")?;
+    module.add_function(wrap_pyfunction!(ski_rental, &module)?)?;
+    module.add_function(wrap_pyfunction!(randomized_ski_rental, &module)?)?;
+    module.add_function(wrap_pyfunction!(oneway_trading, &module)?)?;
+    module.add_function(wrap_pyfunction!(caching, &module)?)?;
+    module.add_function(wrap_pyfunction!(scheduling, &module)?)?;
+    parent.add_submodule(&module)?;
+    py.import("sys")?.getattr("modules")?.set_item("laa_core.simulate", &module)?;
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_ski_rental_outcomes() {
+        let outcomes = ski_rental_outcomes(100.0, &[50, 120, 120], &[200.0, 120.0, 30.0], &[0.0, 1.0, 1.0]);
+        // Classical: rents all 50 days. Trusting 120: buys on day 100. Trusting 30: buys on day 30.
+        assert_eq!(outcomes[0], Outcome { alg_cost: 50.0, opt_cost: 50.0 });
+        assert_eq!(outcomes[1], Outcome { alg_cost: 199.0, opt_cost: 100.0 });
+        assert_eq!(outcomes[2], Outcome { alg_cost: 129.0, opt_cost: 100.0 });
+    }
+
+    #[test]
+    fn test_ski_rental_outcomes_match_daily_decisions() {
+        let rental = SkiRental::new(100.0);
+        let ski_days: Vec<u32> = (1..300).step_by(7).collect();
+        let predictions: Vec<f64> = ski_days.iter().map(|&d| d as f64 * 0.8).collect();
+        let trusts: Vec<f64> = (0..ski_days.len()).map(|i| (i % 5) as f64 / 4.0).collect();
+        for (i, outcome) in ski_rental_outcomes(100.0, &ski_days, &predictions, &trusts).iter().enumerate() {
+            let buy_day = (1..=ski_days[i]).find(|&day| rental.decide(day, predictions[i], trusts[i]));
+            let expected = buy_day.map_or(ski_days[i] as f64, |day| (day - 1) as f64 + 100.0);
+            assert_eq!(outcome.alg_cost, expected);
+        }
+    }
+
+    #[test]
+    fn test_randomized_ski_rental_outcomes_are_seeded() {
+        let ski_days = vec![150; 100];
+        let (predictions, trusts) = (vec![150.0; 100], vec![0.5; 100]);
+        let first = randomized_ski_rental_outcomes(100.0, &ski_days, &predictions, &trusts, 7);
+        assert_eq!(first, randomized_ski_rental_outcomes(100.0, &ski_days, &predictions, &trusts, 7));
+        assert!(first.iter().all(|o| o.ratio() < 2.5));
+    }
+
+    #[test]
+    fn test_oneway_trading_outcomes() {
+        let prices = [90.0, 95.0, 130.0, 110.0, 80.0, 85.0];
+        let ranges = instance_ranges(Some(&[4, 2]), prices.len()).unwrap();
+        let outcomes = oneway_trading_outcomes(100.0, &prices, &ranges, &[120.0, 120.0], &[0.5, 0.5]);
+        // The threshold is 110: the first path trades at 130, the second never reaches it.
+        assert_eq!(outcomes[0], Outcome { alg_cost: 130.0, opt_cost: 130.0 });
+        assert_eq!(outcomes[1], Outcome { alg_cost: 85.0, opt_cost: 85.0 });
+        assert!(instance_ranges(Some(&[4, 1]), prices.len()).is_err());
+    }
+
+    #[test]
+    fn test_belady_misses() {
+        // Classic example: with 3 slots, Belady misses 7 times on this trace.
+        let trace = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2];
+        assert_eq!(belady_misses(3, &trace), 7);
+        assert_eq!(belady_misses(0, &trace), trace.len() as u64);
+    }
+
+    #[test]
+    fn test_caching_with_perfect_predictions_is_optimal() {
+        let trace: Vec<u32> = (0..2000u32).map(|i| i.wrapping_mul(2_654_435_761) % 37).collect();
+        let mut predicted_next = vec![u32::MAX; trace.len()];
+        let mut last_seen = HashMap::new();
+        for (t, &item) in trace.iter().enumerate().rev() {
+            if let Some(next) = last_seen.insert(item, t as u32) {
+                predicted_next[t] = next;
+            }
+        }
+        let outcomes = caching_outcomes(8, &trace, &predicted_next, &[0..trace.len()]);
+        assert_eq!(outcomes[0].alg_cost, outcomes[0].opt_cost);
+    }
+
+    #[test]
+    fn test_scheduling_outcomes() {
+        let outcomes = scheduling_outcomes(2, &[3, 3, 2, 2, 2], &[3, 3, 2, 2, 2], &[0..5]);
+        // Shortest predicted first: loads 2+2+3 and 2+3, against the lower bound ceil(12 / 2).
+        assert_eq!(outcomes[0], Outcome { alg_cost: 7.0, opt_cost: 6.0 });
+    }
+}
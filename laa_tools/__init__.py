@@ -0,0 +1,36 @@
+"""
+Tools around the `laa_core` algorithms: uncertainty-quantified predictions, a
+vectorized decision pipeline and brittleness analysis.
+
+The package imports nothing heavy up front. Each name below is loaded from its
+submodule on first access, and `mapie` and scikit-learn are only imported once a
+`UQPredictionAdapter` is fitted.
+"""
+import importlib
+
+_EXPORTS = {
+    "BrittlenessDetector": "laa_tools.brittleness_detector",
+    "DecisionPipeline": "laa_tools.decision_pipeline",
+    "exponential_trust": "laa_tools.decision_pipeline",
+    "linear_trust": "laa_tools.decision_pipeline",
+    "P2Quantile": "laa_tools.online_stats",
+    "RollingQuantile": "laa_tools.online_stats",
+    "RunningMoments": "laa_tools.online_stats",
+    "PredictionCache": "laa_tools.prediction_cache",
+    "UQPredictionAdapter": "laa_tools.uq_prediction_adapter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
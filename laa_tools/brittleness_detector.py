@@ -1,6 +1,94 @@
 
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
 import numpy as np
 
+from laa_tools.online_stats import P2Quantile, RunningMoments
+
+
+def _seed_worker(seed_sequence):
+    """Seeds the global `random` and NumPy generators that problem generators draw from."""
+    state = seed_sequence.generate_state(2)
+    random.seed(int(state[0]))
+    np.random.seed(int(state[1]))
+
+
+def _trial_ratios(algorithm, problem_generator, epsilons, num_trials):
+    """
+    Runs brittleness trials, yielding the competitive ratio at every noise level.
+
+    The optimum of each problem is computed once and shared by all noise levels. If the
+    algorithm provides `run_batch(problem, predictions)`, all noisy predictions of a
+    problem are evaluated in a single call: an array of predictions for scalar-valued
+    predictions, a list with one array per noise level otherwise. Problems with a
+    non-positive optimum are skipped.
+
+    Args:
+        algorithm: The algorithm under analysis (see `BrittlenessDetector`).
+        problem_generator: The problem generator (see `BrittlenessDetector`).
+        epsilons (np.ndarray): The noise levels.
+        num_trials (int): The number of problems to generate.
+
+    Yields:
+        np.ndarray: The competitive ratio of one problem at each noise level.
+    """
+    run_batch = getattr(algorithm, 'run_batch', None)
+    for _ in range(num_trials):
+        problem = problem_generator.generate()
+        opt_cost = problem.compute_optimal()
+        if opt_cost <= 0:
+            continue
+        perfect_prediction = problem.get_perfect_prediction()
+        if np.ndim(perfect_prediction) == 0:
+            noisy_predictions = perfect_prediction * (1 + epsilons)
+        else:
+            # Array-valued predictions (job lengths, access schedules) get one noisy
+            # copy per noise level, like scalar ones.
+            noisy_predictions = [perfect_prediction * (1 + epsilon) for epsilon in epsilons]
+        if run_batch is not None:
+            alg_costs = np.asarray(run_batch(problem, noisy_predictions), dtype=float)
+        else:
+            alg_costs = np.array([algorithm.run(problem, prediction) for prediction in noisy_predictions])
+        yield alg_costs / opt_cost
+
+
+def _evaluate_trials(algorithm, problem_generator, epsilons, num_trials, seed_sequence=None):
+    """
+    Runs a chunk of brittleness trials (see `_trial_ratios`).
+
+    Args:
+        algorithm: The algorithm under analysis (see `BrittlenessDetector`).
+        problem_generator: The problem generator (see `BrittlenessDetector`).
+        epsilons (np.ndarray): The noise levels.
+        num_trials (int): The number of problems to generate.
+        seed_sequence (np.random.SeedSequence, optional): Seeds the global random
+            generators before the first trial, making the chunk reproducible.
+
+    Returns:
+        tuple: The per-epsilon sum of competitive ratios (np.ndarray) and the number of
+            trials that contributed to it (int).
+    """
+    if seed_sequence is not None:
+        _seed_worker(seed_sequence)
+    ratio_sums = np.zeros(len(epsilons))
+    count = 0
+    for ratios in _trial_ratios(algorithm, problem_generator, epsilons, num_trials):
+        ratio_sums += ratios
+        count += 1
+    return ratio_sums, count
+
+
+def _gradient_indices(epsilons):
+    """Returns the positions of the two smallest noise levels, or None if there are fewer than two."""
+    if len(epsilons) < 2:
+        return None
+    order = np.argsort(epsilons, kind='stable')
+    return order[0], order[1]
+
+
 class BrittlenessDetector:
     """
     Analyzes the brittleness of a learning-augmented algorithm.
@@ -22,7 +110,11 @@ class BrittlenessDetector:
         Args:
             algorithm: An object representing the learning-augmented algorithm. It must
                 have a `run(problem, prediction)` method that returns the algorithm's
-                cost.
+                cost. It may also have a `run_batch(problem, predictions)` method that
+                takes the predictions of all noise levels (a NumPy array for scalar
+                predictions, a list with one array per noise level for array-valued
+                ones) and returns an array of costs, which is then used to evaluate all
+                noise levels of a problem at once.
             problem_generator: An object that generates problem instances. It must have a
                 `generate()` method that returns a problem object. The problem object
                 must have `get_perfect_prediction()` and `compute_optimal()` methods.
@@ -30,7 +122,7 @@ class BrittlenessDetector:
         self.algorithm = algorithm
         self.problem_generator = problem_generator
 
-    def analyze(self, num_trials=100, epsilons=None, threshold=0.5):
+    def analyze(self, num_trials=100, epsilons=None, threshold=0.5, n_jobs=1, seed=None, chunk_size=256):
         """
         Performs the brittleness analysis by simulating performance under noisy predictions.
 
@@ -38,6 +130,10 @@ class BrittlenessDetector:
         average competitive ratio, and then determines the performance degradation
         gradient near zero noise.
 
+        Trials are split into chunks of `chunk_size`, and chunk `i` is seeded from the
+        `i`-th child of `np.random.SeedSequence(seed)`. With a fixed `seed` the result
+        is therefore the same for any `n_jobs`.
+
         Args:
             num_trials (int): The number of random problem instances to generate and
                 average over for each epsilon value.
@@ -46,6 +142,13 @@ class BrittlenessDetector:
                 default logarithmic scale is used.
             threshold (float): The gradient value above which the algorithm is considered
                 brittle.
+            n_jobs (int): The number of worker processes. 1 runs in the calling process
+                and -1 uses all CPUs. With more than one job, the algorithm and problem
+                generator must be picklable.
+            seed (int, optional): Seeds the global `random` and `np.random` generators
+                of each chunk. If None, single-process runs leave the global generators
+                untouched and worker processes are seeded from fresh entropy.
+            chunk_size (int): The number of trials per chunk.
 
         Returns:
             dict: A dictionary containing the analysis results with the following keys:
@@ -58,21 +161,29 @@ class BrittlenessDetector:
         """
         if epsilons is None:
             epsilons = np.logspace(-6, -1, 6)
+        epsilons = list(epsilons)
+        epsilon_array = np.asarray(epsilons, dtype=float)
 
-        profile = {epsilon: [] for epsilon in epsilons}
-
-        for _ in range(num_trials):
-            problem = self.problem_generator.generate()
-            perfect_prediction = problem.get_perfect_prediction()
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        chunks = [min(chunk_size, num_trials - start) for start in range(0, num_trials, chunk_size)]
+        if seed is not None or n_jobs > 1:
+            seed_sequences = np.random.SeedSequence(seed).spawn(len(chunks))
+        else:
+            seed_sequences = [None] * len(chunks)
 
-            for epsilon in epsilons:
-                noisy_prediction = perfect_prediction * (1 + epsilon)
-                alg_cost = self.algorithm.run(problem, noisy_prediction)
-                opt_cost = problem.compute_optimal()
-                if opt_cost > 0:
-                    profile[epsilon].append(alg_cost / opt_cost)
+        args = (self.algorithm, self.problem_generator, epsilon_array)
+        if n_jobs > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as pool:
+                futures = [pool.submit(_evaluate_trials, *args, size, seq) for size, seq in zip(chunks, seed_sequences)]
+                results = [future.result() for future in futures]
+        else:
+            results = [_evaluate_trials(*args, size, seq) for size, seq in zip(chunks, seed_sequences)]
 
-        avg_profile = {eps: np.mean(costs) if costs else 0 for eps, costs in profile.items()}
+        ratio_sums = sum((sums for sums, _ in results), np.zeros(len(epsilons)))
+        count = sum(count for _, count in results)
+        means = ratio_sums / count if count else np.zeros(len(epsilons))
+        avg_profile = dict(zip(epsilons, means))
 
         sorted_epsilons = sorted(avg_profile.keys())
         if len(sorted_epsilons) < 2:
@@ -89,6 +200,100 @@ class BrittlenessDetector:
             'profile': avg_profile
         }
 
+    def analyze_stream(self, num_trials=100_000, epsilons=None, threshold=0.5, tolerance=None,
+                       confidence=0.95, report_every=100, quantiles=(0.5, 0.9, 0.99), min_trials=30,
+                       seed=None):
+        """
+        Performs the brittleness analysis in constant memory, reporting as it goes.
+
+        Instead of storing every competitive ratio, this keeps a running mean and
+        variance (Welford) and a P² quantile sketch per epsilon, and yields an updated
+        profile every `report_every` trials. Each trial also contributes one sample of
+        the gradient (the paired difference of its ratios at the two smallest noise
+        levels), so a confidence interval for the severity is available at every
+        report. With a `tolerance`, the analysis stops as soon as the half-width of
+        that interval falls below it.
+
+        Args:
+            num_trials (int): The maximum number of random problem instances.
+            epsilons (list of float, optional): The noise levels to test (see `analyze`).
+            threshold (float): The gradient value above which the algorithm is considered
+                brittle.
+            tolerance (float, optional): Stops the analysis once the confidence interval
+                of the severity is narrower than `2 * tolerance`. If None, all
+                `num_trials` trials are run.
+            confidence (float): The confidence level of the severity interval.
+            report_every (int): The number of trials between two yielded reports.
+            quantiles (tuple of float): The quantiles of the competitive ratio to track.
+            min_trials (int): The number of trials required before stopping early.
+            seed (int, optional): Seeds the global `random` and `np.random` generators
+                before the first trial, the same way `analyze` seeds its first chunk.
+
+        Yields:
+            dict: The analysis so far, with the keys of `analyze` ('is_brittle',
+                'severity', 'profile') plus:
+                'num_trials' (int): The number of trials that contributed.
+                'severity_ci' (tuple): The confidence interval of the severity.
+                'std' (dict): The standard deviation of the competitive ratio per epsilon.
+                'quantiles' (dict): Maps each epsilon to a dict of quantile estimates.
+                'converged' (bool): True if the analysis stopped because the severity
+                    interval fell below `tolerance`. Only the last report can have it set.
+        """
+        if epsilons is None:
+            epsilons = np.logspace(-6, -1, 6)
+        epsilons = list(epsilons)
+        epsilon_array = np.asarray(epsilons, dtype=float)
+        if seed is not None:
+            # Same seeding as the first chunk of `analyze`.
+            _seed_worker(np.random.SeedSequence(seed).spawn(1)[0])
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        gradient_pair = _gradient_indices(epsilon_array)
+        moments = RunningMoments(len(epsilons))
+        gradient_moments = RunningMoments(1)
+        sketches = [P2Quantile(q, len(epsilons)) for q in quantiles]
+
+        def report(converged):
+            severity, half_width = 0.0, 0.0
+            if gradient_pair is not None:
+                severity = float(gradient_moments.mean[0])
+                half_width = float(z * gradient_moments.sem[0])
+            estimates = [sketch.value for sketch in sketches]
+            return {
+                'is_brittle': severity > threshold,
+                'severity': severity,
+                'severity_ci': (severity - half_width, severity + half_width),
+                'profile': dict(zip(epsilons, moments.mean.copy())),
+                'std': dict(zip(epsilons, moments.std)),
+                'quantiles': {
+                    epsilon: {q: float(values[i]) for q, values in zip(quantiles, estimates)}
+                    for i, epsilon in enumerate(epsilons)
+                },
+                'num_trials': moments.count,
+                'converged': converged,
+            }
+
+        for ratios in _trial_ratios(self.algorithm, self.problem_generator, epsilon_array, num_trials):
+            moments.update(ratios)
+            for sketch in sketches:
+                sketch.update(ratios)
+            if gradient_pair is not None:
+                low, high = gradient_pair
+                gradient_moments.update([(ratios[high] - ratios[low]) / epsilon_array[high]])
+
+            if moments.count % report_every == 0:
+                converged = (
+                    tolerance is not None
+                    and moments.count >= min_trials
+                    and z * gradient_moments.sem[0] <= tolerance
+                )
+                yield report(converged)
+                if converged:
+                    return
+
+        if moments.count == 0 or moments.count % report_every != 0:
+            yield report(False)
+
 if __name__ == '__main__':
     class DummyProblem:
         def get_perfect_prediction(self):
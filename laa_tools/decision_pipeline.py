@@ -0,0 +1,100 @@
+import numpy as np
+
+
+def exponential_trust(scale):
+    """
+    Returns a calibration mapping an interval width `w` to the trust `exp(-w / scale)`.
+
+    A width of zero is trusted fully and trust halves every `scale * ln 2` of width.
+
+    Args:
+        scale (float): The width at which trust has dropped to 1/e.
+    """
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+
+    def calibrate(uncertainty, point, out):
+        np.multiply(uncertainty, -1.0 / scale, out=out)
+        return np.exp(out, out=out)
+
+    return calibrate
+
+
+def linear_trust(max_uncertainty):
+    """
+    Returns a calibration mapping an interval width `w` to the trust
+    `1 - w / max_uncertainty`, clipped to [0, 1].
+
+    Args:
+        max_uncertainty (float): The width from which on predictions are not trusted at all.
+    """
+    if max_uncertainty <= 0:
+        raise ValueError("max_uncertainty must be positive")
+
+    def calibrate(uncertainty, point, out):
+        np.multiply(uncertainty, -1.0 / max_uncertainty, out=out)
+        np.add(out, 1.0, out=out)
+        return np.clip(out, 0.0, 1.0, out=out)
+
+    return calibrate
+
+
+class DecisionPipeline:
+    """
+    Turns features into learning-augmented decisions in one vectorized pass.
+
+    Each call predicts with a fitted `UQPredictionAdapter`, maps the widths of the
+    prediction intervals to trust values with a calibration function, and hands the
+    point predictions and trusts to the `decide_array` method of a `laa_core`
+    algorithm (`SkiRental`, `RandomizedSkiRental` or `OnewayTrading`). No step loops
+    over rows in Python.
+
+    The intermediate arrays are preallocated and reused across calls: the arrays in
+    a result are views of the pipeline's buffers and are overwritten by the next
+    call, so copy any you need to keep.
+    """
+
+    BUFFERS = ('point', 'lower', 'upper', 'uncertainty', 'trust')
+
+    def __init__(self, adapter, algorithm, calibration):
+        """
+        Initializes the DecisionPipeline.
+
+        Args:
+            adapter (UQPredictionAdapter): A fitted adapter producing the predictions.
+            algorithm: A `laa_core` algorithm instance with a `decide_array` method.
+            calibration (callable): Maps interval widths to trusts in [0, 1], called
+                as `calibration(uncertainty, point, out)`; it must write the trusts into
+                `out` and return it. See `exponential_trust` and `linear_trust`.
+        """
+        self.adapter = adapter
+        self.algorithm = algorithm
+        self.calibration = calibration
+        self._capacity = 0
+        self._buffers = {}
+
+    def _views(self, n):
+        """Returns length-`n` views of the buffers, growing them geometrically if needed."""
+        if n > self._capacity:
+            self._capacity = max(n, 2 * self._capacity)
+            self._buffers = {name: np.empty(self._capacity) for name in self.BUFFERS}
+        return {name: buffer[:n] for name, buffer in self._buffers.items()}
+
+    def run(self, X, observations):
+        """
+        Makes one decision per row of `X`.
+
+        Args:
+            X (np.ndarray): The input features of shape `(n_samples, n_features)`.
+            observations (np.ndarray): The observed quantity each decision is made on:
+                the current day for ski rental, the current price for oneway trading.
+
+        Returns:
+            dict: The boolean 'decisions' and, as diagnostics, the 'point', 'lower',
+                'upper', 'uncertainty' and 'trust' arrays they were made from.
+        """
+        views = self._views(len(X))
+        prediction = self.adapter.predict(X, out={name: views[name] for name in ('point', 'lower', 'upper', 'uncertainty')})
+        trust = self.calibration(prediction['uncertainty'], prediction['point'], views['trust'])
+        decisions = self.algorithm.decide_array(observations, prediction['point'], trust)
+        return {'decisions': decisions, **prediction, 'trust': trust}
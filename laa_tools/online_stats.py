@@ -0,0 +1,313 @@
+import math
+import random
+from collections import deque
+
+import numpy as np
+
+
+class RunningMoments:
+    """
+    Tracks the running mean and variance of several streams in constant memory.
+
+    Every update adds one observation to each stream (for example one competitive
+    ratio per noise level), using Welford's algorithm, which stays numerically stable
+    over millions of observations.
+    """
+
+    def __init__(self, num_streams):
+        """
+        Initializes the RunningMoments.
+
+        Args:
+            num_streams (int): The number of streams tracked side by side.
+        """
+        self.count = 0
+        self.mean = np.zeros(num_streams)
+        self._m2 = np.zeros(num_streams)
+
+    def update(self, values):
+        """
+        Adds one observation to each stream.
+
+        Args:
+            values (array-like): One value per stream.
+        """
+        values = np.asarray(values, dtype=float)
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (values - self.mean)
+
+    @property
+    def variance(self):
+        """The sample variance of each stream (0 until two observations were added)."""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        """The sample standard deviation of each stream."""
+        return np.sqrt(self.variance)
+
+    @property
+    def sem(self):
+        """The standard error of the mean of each stream."""
+        if self.count < 2:
+            return np.full_like(self.mean, np.inf)
+        return np.sqrt(self.variance / self.count)
+
+
+class P2Quantile:
+    """
+    Estimates a quantile of several streams without storing the observations.
+
+    Implements the P² algorithm (Jain and Chlamtac, 1985), which keeps five markers
+    per stream whose heights are adjusted with a piecewise-parabolic fit as
+    observations arrive. The markers of all streams are updated together with NumPy.
+    """
+
+    def __init__(self, p, num_streams):
+        """
+        Initializes the P2Quantile.
+
+        Args:
+            p (float): The quantile to estimate, in [0, 1].
+            num_streams (int): The number of streams tracked side by side.
+        """
+        self.p = p
+        self.count = 0
+        self._heights = np.zeros((5, num_streams))
+        self._positions = np.tile(np.arange(5.0)[:, None], (1, num_streams))
+        self._desired = np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])
+        self._increments = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])
+
+    def update(self, values):
+        """
+        Adds one observation to each stream.
+
+        Args:
+            values (array-like): One value per stream.
+        """
+        x = np.asarray(values, dtype=float)
+        q, n = self._heights, self._positions
+        if self.count < 5:
+            q[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                q.sort(axis=0)
+            return
+        self.count += 1
+
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        cell = np.sum(x >= q[1:4], axis=0)
+        n += np.arange(5)[:, None] > cell
+        self._desired += self._increments
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in range(1, 4):
+                d = self._desired[i] - n[i]
+                adjust = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+                if not adjust.any():
+                    continue
+                d = np.sign(d)
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                neighbour_q = np.where(d > 0, q[i + 1], q[i - 1])
+                neighbour_n = np.where(d > 0, n[i + 1], n[i - 1])
+                linear = q[i] + d * (neighbour_q - q[i]) / (neighbour_n - n[i])
+                in_bounds = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+                q[i] = np.where(adjust, np.where(in_bounds, parabolic, linear), q[i])
+                n[i] = np.where(adjust, n[i] + d, n[i])
+
+    @property
+    def value(self):
+        """The current quantile estimate of each stream (NaN before any observation)."""
+        if self.count == 0:
+            return np.full(self._heights.shape[1], np.nan)
+        if self.count < 5:
+            return np.quantile(self._heights[:self.count], self.p, axis=0)
+        return self._heights[2].copy()
+
+
+class _SkiplistNode:
+    __slots__ = ('value', 'next', 'width')
+
+    def __init__(self, value, levels):
+        self.value = value
+        self.next = [None] * levels
+        # The number of positions the link at each level skips.
+        self.width = [1] * levels
+
+
+class _IndexableSkiplist:
+    """
+    A sorted multiset of floats with O(log n) expected insertion, removal and
+    lookup of the k-th smallest value.
+
+    Every node links to its successor on each of its levels and records how many
+    positions that link skips, so a lookup by rank walks down the levels like a
+    search by value.
+    """
+
+    def __init__(self, max_levels, values=(), seed=0):
+        """
+        Initializes the skiplist with `values`, linking them in O(n) once sorted.
+
+        Args:
+            max_levels (int): The number of levels; about log2 of the largest size.
+            values (iterable): The initial values, in any order.
+            seed (int): Seeds the draws of the node levels.
+        """
+        self.max_levels = max_levels
+        self._random = random.Random(seed)
+        self._tail = _SkiplistNode(math.inf, 0)
+        self._head = _SkiplistNode(None, max_levels)
+        last = [self._head] * max_levels
+        last_ranks = [0] * max_levels
+        rank = 0
+        for rank, value in enumerate(sorted(values), 1):
+            node = _SkiplistNode(value, self._levels())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = rank - last_ranks[level]
+                last[level], last_ranks[level] = node, rank
+        for level in range(max_levels):
+            last[level].next[level] = self._tail
+            last[level].width[level] = rank + 1 - last_ranks[level]
+        self.size = rank
+
+    def _levels(self):
+        # Every level is kept by half the nodes of the level below.
+        levels = 1
+        while levels < self.max_levels and self._random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, k):
+        if not -self.size <= k < self.size:
+            raise IndexError("skiplist index out of range")
+        position = (k % self.size) + 1
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.width[level] <= position:
+                position -= node.width[level]
+                node = node.next[level]
+        return node.value
+
+    def add(self, value):
+        # The last node before the insertion point on every level, and its rank.
+        chain = [None] * self.max_levels
+        ranks = [0] * self.max_levels
+        node, rank = self._head, 0
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].value <= value:
+                rank += node.width[level]
+                node = node.next[level]
+            chain[level], ranks[level] = node, rank
+
+        levels = self._levels()
+        new = _SkiplistNode(value, levels)
+        for level in range(levels):
+            previous = chain[level]
+            skipped = rank - ranks[level]
+            new.next[level] = previous.next[level]
+            new.width[level] = previous.width[level] - skipped
+            previous.next[level] = new
+            previous.width[level] = skipped + 1
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        chain = [None] * self.max_levels
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if target.value != value:
+            raise KeyError(value)
+        for level in range(self.max_levels):
+            previous = chain[level]
+            if level < len(target.next):
+                previous.width[level] += target.width[level] - 1
+                previous.next[level] = target.next[level]
+            else:
+                previous.width[level] -= 1
+        self.size -= 1
+
+
+class RollingQuantile:
+    """
+    Answers order-statistic queries over the most recent observations of a stream.
+
+    The last `window` observations are kept both in arrival order (to evict the
+    oldest) and in an indexable skiplist, so adding an observation, evicting one and
+    looking up the k-th smallest are all O(log n) in expectation.
+    """
+
+    def __init__(self, window=None):
+        """
+        Initializes the RollingQuantile.
+
+        Args:
+            window (int, optional): The number of most recent observations kept. If
+                None, all observations are kept.
+        """
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self._arrivals = deque()
+        self._sorted = self._skiplist()
+
+    def _skiplist(self, values=()):
+        # Enough levels for O(log n) operations on a full window (2^32 values if unbounded).
+        levels = max(1, math.ceil(math.log2(self.window))) if self.window is not None else 32
+        return _IndexableSkiplist(levels, values)
+
+    def update(self, values):
+        """
+        Adds observations in order, evicting the oldest ones beyond the window.
+
+        Args:
+            values (array-like): The new observations.
+        """
+        values = np.ravel(np.asarray(values, dtype=float))
+        if self.window is not None and len(values) >= self.window:
+            # The batch replaces the whole window.
+            values = values[-self.window:]
+            self._arrivals = deque(values.tolist())
+            self._sorted = self._skiplist(self._arrivals)
+            return
+        for value in values.tolist():
+            self._arrivals.append(value)
+            self._sorted.add(value)
+            if self.window is not None and len(self._arrivals) > self.window:
+                self._sorted.remove(self._arrivals.popleft())
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def __getitem__(self, k):
+        """The k-th smallest observation in the window (0-based)."""
+        return self._sorted[k]
+
+    def quantile(self, p):
+        """
+        The `p`-quantile of the window: its ceil(p * n)-th smallest observation.
+
+        Args:
+            p (float): The quantile, in [0, 1].
+        """
+        if not self._sorted:
+            return np.nan
+        k = int(np.ceil(p * len(self._sorted)))
+        return self._sorted[min(max(k, 1), len(self._sorted)) - 1]
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    A bounded cache of per-row prediction results with LRU and TTL eviction.
+
+    Rows are keyed by their raw float64 bytes, so a row hits only if its features are
+    bit-for-bit identical to a cached one. Once `maxsize` entries are stored, adding
+    one evicts the least recently used; with a `ttl`, entries older than `ttl` seconds
+    count as misses and are dropped when looked up.
+    """
+
+    def __init__(self, maxsize, ttl=None, clock=time.monotonic):
+        """
+        Initializes the PredictionCache.
+
+        Args:
+            maxsize (int): The maximum number of cached rows.
+            ttl (float, optional): How long an entry stays valid, in seconds.
+            clock (callable): Returns the current time in seconds; replaceable in tests.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def keys(X):
+        """Returns the cache key of every row of the 2-D array `X`."""
+        X = np.ascontiguousarray(X, dtype=float)
+        return [row.tobytes() for row in X]
+
+    def lookup(self, keys, width):
+        """
+        Looks up many rows at once.
+
+        Args:
+            keys (list): The keys of the rows, as returned by `keys`.
+            width (int): The number of values cached per row.
+
+        Returns:
+            tuple: An array of shape `(len(keys), width)` holding the cached values (the
+                rows of misses are left uninitialized) and the indices of the misses.
+        """
+        values = np.empty((len(keys), width))
+        missing = []
+        now = self.clock()
+        for i, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                missing.append(i)
+            else:
+                self._entries.move_to_end(key)
+                values[i] = entry[1]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        return values, np.array(missing, dtype=np.intp)
+
+    def store(self, keys, values):
+        """Caches the rows of `values` under `keys`, evicting the least recently used entries."""
+        now = self.clock()
+        for key, row in zip(keys, values):
+            self._entries[key] = (now, row.copy())
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all entries; the hit and miss counters are kept."""
+        self._entries.clear()
+
+    def info(self):
+        """Returns the hit and miss counters and the current and maximum size."""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
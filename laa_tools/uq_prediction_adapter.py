@@ -1,9 +1,8 @@
 
-from mapie.regression import SplitConformalRegressor
-from mapie.utils import train_conformalize_test_split
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.datasets import make_regression
+
+from laa_tools.online_stats import RollingQuantile
+from laa_tools.prediction_cache import PredictionCache
 
 class UQPredictionAdapter:
     """
@@ -15,26 +14,63 @@ class UQPredictionAdapter:
     probability. This is crucial for Learning-Augmented Algorithms, as the uncertainty
     can be used to modulate the `trust` parameter or inform algorithmic decisions.
 
-    The implementation relies on the `mapie` library.
+    The implementation relies on the `mapie` library, which (like scikit-learn) is
+    only imported by `fit`, so importing this module stays cheap.
+
+    With a `window`, the adapter calibrates online: the absolute residuals of the
+    most recent `window` labelled observations are kept as nonconformity scores, and
+    `update(X, y)` adds new ones in expected O(log n) time each, so the interval
+    width follows drifting predictions without retraining the base regressor.
+
+    With a `cache_size`, the results of `predict` are memoized per feature row, so
+    repeated rows skip the conformal prediction; only the misses of a batch are
+    predicted. The cache is cleared by `fit` and `update`.
     """
 
-    def __init__(self, base_predictor=LinearRegression(), confidence_level=0.95):
+    def __init__(
+        self,
+        base_predictor=None,
+        confidence_level=0.95,
+        window=None,
+        train_size=0.6,
+        conformalize_size=0.2,
+        test_size=0.2,
+        random_state=42,
+        cache_size=None,
+        cache_ttl=None,
+    ):
         """
         Initializes the UQPredictionAdapter.
 
         Args:
             base_predictor: An unfitted scikit-learn compatible regressor instance. This
                 model will be trained on a subset of the data provided to `fit`.
+                Defaults to a new `LinearRegression`.
             confidence_level (float): The desired confidence level for the prediction
                 intervals, typically between 0.0 and 1.0. For example, 0.95 means
                 the generated intervals are expected to contain the true value 95%
                 of the time.
+            window (int, optional): If set, enables online calibration over the
+                nonconformity scores of the most recent `window` observations.
+            train_size (float): The fraction of the data `fit` uses to train the base predictor.
+            conformalize_size (float): The fraction of the data `fit` uses for calibration.
+            test_size (float): The fraction of the data `fit` holds out as a test set.
+            random_state (int, optional): The seed of the split; None for a random split.
+            cache_size (int, optional): If set, memoizes the predictions of up to this many
+                distinct feature rows, evicting the least recently used.
+            cache_ttl (float, optional): How long a memoized prediction stays valid, in seconds.
         """
-        self.conformalizer = SplitConformalRegressor(
-            estimator=base_predictor,
-            confidence_level=confidence_level,
-            prefit=False
-        )
+        self.base_predictor = base_predictor
+        self.confidence_level = confidence_level
+        self.window = window
+        self.train_size = train_size
+        self.conformalize_size = conformalize_size
+        self.test_size = test_size
+        self.random_state = random_state
+        self.scores = None
+        self._width = None
+        self.cache = PredictionCache(cache_size, cache_ttl) if cache_size is not None else None
+        self.conformalizer = None
 
     def fit(self, X, y):
         """
@@ -49,21 +85,65 @@ class UQPredictionAdapter:
             X (np.ndarray): The input features of shape `(n_samples, n_features)`.
             y (np.ndarray): The target values of shape `(n_samples,)`.
         """
+        from mapie.regression import SplitConformalRegressor
+        from mapie.utils import train_conformalize_test_split
+
+        if self.base_predictor is None:
+            from sklearn.linear_model import LinearRegression
+            self.base_predictor = LinearRegression()
+        self.conformalizer = SplitConformalRegressor(
+            estimator=self.base_predictor,
+            confidence_level=self.confidence_level,
+            prefit=False
+        )
         (
             X_train, X_conformalize, self.X_test_dummy,
             y_train, y_conformalize, self.y_test_dummy
         ) = train_conformalize_test_split(
-            X, y, train_size=0.6, conformalize_size=0.2, test_size=0.2, random_state=42
+            X, y, train_size=self.train_size, conformalize_size=self.conformalize_size,
+            test_size=self.test_size, random_state=self.random_state
         )
         self.conformalizer.fit(X_train, y_train).conformalize(X_conformalize, y_conformalize)
+        if self.cache is not None:
+            self.cache.clear()
+        if self.window is not None:
+            self.scores = RollingQuantile(self.window)
+            self.update(X_conformalize, y_conformalize)
 
-    def predict(self, X):
+    def update(self, X, y):
+        """
+        Recalibrates the interval width with newly labelled observations.
+
+        Only available in online mode (with a `window`). The base predictor is not
+        retrained: the observations' absolute residuals are added to the rolling window
+        of nonconformity scores, replacing the oldest ones.
+
+        Args:
+            X (np.ndarray): The input features of shape `(n_samples, n_features)`.
+            y (np.ndarray): The observed target values of shape `(n_samples,)`.
+        """
+        if self.scores is None:
+            raise RuntimeError("update requires an adapter created with a window and fitted")
+        residuals = np.abs(np.asarray(y, dtype=float) - self.conformalizer.predict(X))
+        self.scores.update(residuals)
+        # The conformal quantile of n scores is the ceil((n + 1) * confidence)-th
+        # smallest one; with too few scores for that, the interval is unbounded.
+        n = len(self.scores)
+        k = int(np.ceil((n + 1) * self.confidence_level))
+        self._width = self.scores[k - 1] if k <= n else np.inf
+        if self.cache is not None:
+            self.cache.clear()
+
+    def predict(self, X, out=None):
         """
         Makes predictions with calibrated uncertainty intervals.
 
         Args:
             X (np.ndarray): The input features for which to make predictions, with
                 shape `(n_samples, n_features)`.
+            out (dict, optional): Preallocated float64 arrays of length `n_samples`
+                under any of the result keys. The results are written into them and
+                they are returned in the result instead of newly allocated arrays.
 
         Returns:
             dict: A dictionary containing the prediction results:
@@ -73,22 +153,68 @@ class UQPredictionAdapter:
                 'uncertainty' (np.ndarray): The widths of the prediction intervals
                     (`upper` - `lower`).
         """
-        y_pred, intervals = self.conformalizer.predict_interval(X)
+        if self.conformalizer is None:
+            raise RuntimeError("predict requires a fitted adapter")
+        out = out or {}
+        if self.cache is not None:
+            point, lower, upper = self._cached_intervals(X)
+            point = _store(out, 'point', point)
+            lower = _store(out, 'lower', lower)
+            upper = _store(out, 'upper', upper)
+        else:
+            point, lower, upper = self._intervals(X, out)
         return {
-            'point': y_pred,
-            'lower': intervals[:, 0, 0],
-            'upper': intervals[:, 1, 0],
-            'uncertainty': intervals[:, 1, 0] - intervals[:, 0, 0]
+            'point': point,
+            'lower': lower,
+            'upper': upper,
+            'uncertainty': np.subtract(upper, lower, out=out.get('uncertainty'))
         }
 
+    def _intervals(self, X, out):
+        """Returns the point predictions and the lower and upper interval bounds."""
+        if self.scores is not None:
+            y_pred = self.conformalizer.predict(X)
+            lower = np.subtract(y_pred, self._width, out=out.get('lower'))
+            upper = np.add(y_pred, self._width, out=out.get('upper'))
+        else:
+            y_pred, intervals = self.conformalizer.predict_interval(X)
+            lower = _store(out, 'lower', intervals[:, 0, 0])
+            upper = _store(out, 'upper', intervals[:, 1, 0])
+        return _store(out, 'point', y_pred), lower, upper
+
+    def _cached_intervals(self, X):
+        """Like `_intervals`, but predicts only the rows missing from the cache."""
+        keys = self.cache.keys(X)
+        values, missing = self.cache.lookup(keys, 3)
+        if len(missing):
+            # A row repeated within the batch is predicted once.
+            first = {}
+            for i in missing:
+                first.setdefault(keys[i], i)
+            rows = np.fromiter(first.values(), dtype=np.intp, count=len(first))
+            computed = np.column_stack(self._intervals(np.asarray(X)[rows], {}))
+            self.cache.store(first, computed)
+            position = {key: j for j, key in enumerate(first)}
+            values[missing] = computed[[position[keys[i]] for i in missing]]
+        return values[:, 0], values[:, 1], values[:, 2]
+
+def _store(out, key, values):
+    """Copies `values` into `out[key]` if the caller provided that array."""
+    if key not in out:
+        return values
+    np.copyto(out[key], values)
+    return out[key]
+
 if __name__ == '__main__':
+    from sklearn.datasets import make_regression
+
     X, y = make_regression(n_samples=105, n_features=1, noise=10.0, random_state=42)
     adapter = UQPredictionAdapter(confidence_level=0.9)
     adapter.fit(X, y)
     predictions = adapter.predict(adapter.X_test_dummy)
 
     print("Uncertainty Quantification Example:")
-    print(f"Confidence Level: {adapter.conformalizer.confidence_level}")
+    print(f"Confidence Level: {adapter.confidence_level}")
     print(f"Number of test samples: {len(adapter.y_test_dummy)}")
 
     in_interval = np.sum(
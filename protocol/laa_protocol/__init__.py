@@ -0,0 +1,7 @@
+"""
+The protocol of the LAA Platform API, shared by the API server and the SDK.
+
+`laa_protocol.schemas` holds the request models and `laa_protocol.arrow` the Arrow
+IPC encoding of request and response bodies. Keeping them here lets the server and
+the client agree on both without either depending on the other.
+"""
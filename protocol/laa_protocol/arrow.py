@@ -0,0 +1,42 @@
+"""
+The Arrow IPC encoding of LAA Platform API bodies: a single-row record batch with
+one column per field. `pyarrow` is an optional dependency (`laa_protocol[arrow]`).
+"""
+import functools
+from typing import Any, Dict
+
+
+# pyarrow takes over 100 ms to import, so it is only imported once Arrow is used.
+@functools.lru_cache(maxsize=None)
+def load_pyarrow():
+    """Returns the pyarrow module, or None if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def encode_arrow(payload: Dict[str, Any]) -> bytes:
+    """
+    Encodes a dict as a single-row Arrow record batch, one column per field.
+
+    Scalars become plain columns, integer lists and arrays `list<int>` columns and
+    dicts `map<int, int>` columns. The SDK encodes requests with it and the API
+    its responses.
+    """
+    pa = load_pyarrow()
+    columns = {}
+    for name, value in payload.items():
+        if isinstance(value, dict):
+            columns[name] = pa.array([list(value.items())], type=pa.map_(pa.int64(), pa.int64()))
+        elif isinstance(value, (list, tuple)) or hasattr(value, "__array__"):
+            values = pa.array(value, type=pa.int64()) if isinstance(value, (list, tuple)) else pa.array(value)
+            columns[name] = pa.ListArray.from_arrays(pa.array([0, len(values)], type=pa.int32()), values)
+        else:
+            columns[name] = pa.array([value])
+    batch = pa.RecordBatch.from_pydict(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
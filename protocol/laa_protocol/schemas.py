@@ -0,0 +1,207 @@
+"""
+Request models of the LAA Platform API, with their validation rules.
+
+The API validates its requests with these models and the `local://` backend of
+the SDK validates with the same ones, so both accept and reject the same inputs.
+"""
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, field_validator
+
+# Request Models with Validation
+
+class SkiRentalRequest(BaseModel):
+    """Request model for the Ski Rental algorithm."""
+    buy_cost: float
+    current_day: int
+    prediction_days: float
+    trust: float
+
+    @field_validator('trust')
+    def trust_must_be_between_0_and_1(cls, v):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError('trust must be between 0.0 and 1.0')
+        return v
+
+    @field_validator('buy_cost', 'current_day', 'prediction_days')
+    def values_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class RandomizedSkiRentalRequest(BaseModel):
+    """Request model for the Randomized Ski Rental algorithm."""
+    buy_cost: float
+    current_day: int
+    prediction_days: float
+    trust: float
+
+    @field_validator('trust')
+    def trust_must_be_between_0_and_1(cls, v):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError('trust must be between 0.0 and 1.0')
+        return v
+
+    @field_validator('buy_cost', 'current_day', 'prediction_days')
+    def values_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class SkiRentalBuyDayRequest(BaseModel):
+    """Request model for computing the buy day of a (Randomized) Ski Rental season."""
+    buy_cost: float
+    prediction_days: float
+    trust: float
+
+    @field_validator('trust')
+    def trust_must_be_between_0_and_1(cls, v):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError('trust must be between 0.0 and 1.0')
+        return v
+
+    @field_validator('buy_cost', 'prediction_days')
+    def values_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class CachingRequest(BaseModel):
+    """
+    Request model for the Caching algorithm.
+
+    `predictions_key` optionally names the predictions: requests with the same
+    `cache_size` and key share a pooled instance, which is then found without
+    reading `predictions` at all. The key must change whenever the predictions do.
+    """
+    cache_size: int
+    predictions: Dict[int, int]
+    item: int
+    cache: List[int]
+    predictions_key: Optional[str] = None
+
+    @field_validator('cache_size')
+    def cache_size_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class OnewayTradingRequest(BaseModel):
+    """Request model for the Oneway Trading algorithm."""
+    buy_price: float
+    current_price: float
+    prediction_price: float
+    trust: float
+
+    @field_validator('trust')
+    def trust_must_be_between_0_and_1(cls, v):
+        if not 0.0 <= v <= 1.0:
+            raise ValueError('trust must be between 0.0 and 1.0')
+        return v
+
+    @field_validator('buy_price', 'current_price', 'prediction_price')
+    def prices_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('prices must be non-negative')
+        return v
+
+class SchedulingRequest(BaseModel):
+    """Request model for the Scheduling algorithm."""
+    num_machines: int
+    job_lengths: List[int]
+    prediction_job_lengths: List[int]
+
+    @field_validator('num_machines')
+    def num_machines_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError('must be positive')
+        return v
+
+class SearchRequest(BaseModel):
+    """Request model for the Search algorithm."""
+    max_value: int
+    values: List[int]
+    prediction_value: int
+    early_stop: bool = False
+
+class CachingInstanceRequest(BaseModel):
+    """Request model for creating a server-side Caching instance."""
+    cache_size: int
+    predictions: Dict[int, int] = {}
+
+    @field_validator('cache_size')
+    def cache_size_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class CachingPredictionsUpdate(BaseModel):
+    """Request model for streaming prediction updates into a Caching instance."""
+    upsert: Dict[int, int] = {}
+    delete: List[int] = []
+
+class CachingAccessRequest(BaseModel):
+    """Request model for a single access to a Caching instance."""
+    item: int
+
+class CachingTraceRequest(BaseModel):
+    """Request model for replaying a trace of accesses on a Caching instance."""
+    items: List[int]
+
+class OnlineSchedulerRequest(BaseModel):
+    """Request model for creating an online scheduler."""
+    num_machines: int
+
+    @field_validator('num_machines')
+    def num_machines_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError('must be positive')
+        return v
+
+class JobSubmitRequest(BaseModel):
+    """Request model for a job arriving at an online scheduler."""
+    job_id: int
+    predicted_length: int
+
+    @field_validator('job_id', 'predicted_length')
+    def values_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+class JobCompleteRequest(BaseModel):
+    """Request model for a job completing on an online scheduler."""
+    job_id: int
+    actual_length: int
+
+    @field_validator('job_id', 'actual_length')
+    def values_must_be_non_negative(cls, v):
+        if v < 0:
+            raise ValueError('must be non-negative')
+        return v
+
+# Batch Request Models
+
+class SkiRentalBatchRequest(BaseModel):
+    """Request model for a batch of Ski Rental decisions."""
+    requests: List[SkiRentalRequest]
+
+class RandomizedSkiRentalBatchRequest(BaseModel):
+    """Request model for a batch of Randomized Ski Rental decisions."""
+    requests: List[RandomizedSkiRentalRequest]
+
+class CachingBatchRequest(BaseModel):
+    """Request model for a batch of Caching decisions."""
+    requests: List[CachingRequest]
+
+class OnewayTradingBatchRequest(BaseModel):
+    """Request model for a batch of Oneway Trading decisions."""
+    requests: List[OnewayTradingRequest]
+
+class SchedulingBatchRequest(BaseModel):
+    """Request model for a batch of Scheduling decisions."""
+    requests: List[SchedulingRequest]
+
+class SearchBatchRequest(BaseModel):
+    """Request model for a batch of Search decisions."""
+    requests: List[SearchRequest]
@@ -0,0 +1,13 @@
+from setuptools import setup, find_packages
+
+setup(
+    name="laa_protocol",
+    version="0.1.0",
+    packages=find_packages(),
+    install_requires=[
+        "pydantic",
+    ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
+)
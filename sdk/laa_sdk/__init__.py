@@ -1,23 +1,51 @@
 
+from abc import ABC, abstractmethod
 import requests
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pydantic import BaseModel, ValidationError
 
+from laa_sdk import wire
+from laa_sdk.batching import MicroBatcher
+
 # Response Models
 class DecisionResponse(BaseModel):
     decision: str
     algorithm: str
     trust_parameter: float
 
+class DecisionBatchResponse(BaseModel):
+    decisions: List[DecisionResponse]
+
 class CachingResponse(BaseModel):
     decision: str
     new_cache: List[int]
     algorithm: str
 
+class CachingInstanceResponse(BaseModel):
+    instance_id: str
+    cache_size: int
+    contents: List[int]
+    hits: int
+    misses: int
+
+class CachingAccessResponse(BaseModel):
+    decision: str
+    algorithm: str
+
+class CachingTraceResponse(BaseModel):
+    hits: int
+    misses: int
+    algorithm: str
+
 class SchedulingResponse(BaseModel):
     assignments: List[int]
     algorithm: str
 
+class BuyDayResponse(BaseModel):
+    buy_day: Optional[int]
+    algorithm: str
+    trust_parameter: float
+
 class SearchResponse(BaseModel):
     best_index: int
     algorithm: str
@@ -37,35 +65,17 @@ class ClientValidationError(LAAError):
     """Raised for client-side validation errors."""
     pass
 
-class LAAClient:
-    """
-    Client SDK for interacting with the LAA Platform API.
+class _Endpoints(ABC):
     """
+    The LAA Platform API endpoints, shared by the sync and async clients.
 
-    def __init__(self, api_url: str, api_key: str):
-        """
-        Initializes the LAAClient.
+    Every method builds its request and returns whatever the client's `_make_request`
+    returns: the parsed response for `LAAClient`, an awaitable of it for `AsyncLAAClient`.
+    """
 
-        Args:
-            api_url: The base URL of the LAA Platform API.
-            api_key: Your API key for authentication.
-        """
-        self.api_url = api_url
-        self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({"X-API-Key": api_key})
-
-    def _make_request(self, method: str, endpoint: str, json_data: dict, response_model):
-        try:
-            response = self.session.request(method, f"{self.api_url}{endpoint}", json=json_data)
-            response.raise_for_status()
-            return response_model(**response.json())
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 422:
-                raise ClientValidationError(f"Validation Error: {e.response.text}") from e
-            raise APIError(e.response.status_code, e.response.text) from e
-        except ValidationError as e:
-            raise LAAError(f"Failed to parse API response: {e}") from e
+    @abstractmethod
+    def _make_request(self, method: str, endpoint: str, json_data: Optional[dict], response_model):
+        """Sends a request to `endpoint` and returns its response parsed into `response_model`."""
 
     def ski_rental_decide(
         self,
@@ -103,15 +113,40 @@ class LAAClient:
         }
         return self._make_request("POST", "/algorithms/randomized-ski-rental/decide", data, DecisionResponse)
 
+    def ski_rental_buy_day(
+        self,
+        buy_cost: float,
+        prediction_days: float,
+        trust: float = 0.5,
+        randomized: bool = False
+    ) -> BuyDayResponse:
+        """
+        Gets the day on which the (randomized) ski rental algorithm buys using the LAA API.
+
+        For the randomized algorithm, the buy day is sampled from its distribution.
+        """
+        data = {
+            "buy_cost": buy_cost,
+            "prediction_days": prediction_days,
+            "trust": trust
+        }
+        algorithm = "randomized-ski-rental" if randomized else "ski-rental"
+        return self._make_request("POST", f"/algorithms/{algorithm}/buy-day", data, BuyDayResponse)
+
     def caching_decide(
         self,
         cache_size: int,
         predictions: Dict[int, int],
         item: int,
-        cache: List[int]
+        cache: List[int],
+        predictions_key: Optional[str] = None
     ) -> CachingResponse:
         """
         Makes a caching decision using the LAA API.
+
+        Pass a `predictions_key` naming `predictions` when the same predictions are
+        sent repeatedly, so that the server finds its pooled instance without
+        reading them; change the key whenever the predictions change.
         """
         data = {
             "cache_size": cache_size,
@@ -119,8 +154,66 @@ class LAAClient:
             "item": item,
             "cache": cache
         }
+        if predictions_key is not None:
+            data["predictions_key"] = predictions_key
         return self._make_request("POST", "/algorithms/caching/decide", data, CachingResponse)
 
+    def create_caching_instance(
+        self,
+        cache_size: int,
+        predictions: Optional[Dict[int, int]] = None
+    ) -> CachingInstanceResponse:
+        """
+        Creates a server-side caching instance that keeps its cache and predictions
+        between calls, so they don't have to be sent with every access.
+        """
+        data = {
+            "cache_size": cache_size,
+            "predictions": predictions or {}
+        }
+        return self._make_request("POST", "/algorithms/caching/instances", data, CachingInstanceResponse)
+
+    def get_caching_instance(self, instance_id: str) -> CachingInstanceResponse:
+        """
+        Returns the current state of a server-side caching instance.
+        """
+        return self._make_request("GET", f"/algorithms/caching/instances/{instance_id}", None, CachingInstanceResponse)
+
+    def delete_caching_instance(self, instance_id: str) -> None:
+        """
+        Deletes a server-side caching instance.
+        """
+        return self._make_request("DELETE", f"/algorithms/caching/instances/{instance_id}", None, None)
+
+    def update_caching_predictions(
+        self,
+        instance_id: str,
+        upsert: Optional[Dict[int, int]] = None,
+        delete: Optional[List[int]] = None
+    ) -> CachingInstanceResponse:
+        """
+        Upserts and deletes predictions of a server-side caching instance in place.
+        """
+        data = {
+            "upsert": upsert or {},
+            "delete": delete or []
+        }
+        return self._make_request("PATCH", f"/algorithms/caching/instances/{instance_id}/predictions", data, CachingInstanceResponse)
+
+    def caching_access(self, instance_id: str, item: int) -> CachingAccessResponse:
+        """
+        Accesses an item in a server-side caching instance.
+        """
+        data = {"item": item}
+        return self._make_request("POST", f"/algorithms/caching/instances/{instance_id}/access", data, CachingAccessResponse)
+
+    def caching_access_trace(self, instance_id: str, items: List[int]) -> CachingTraceResponse:
+        """
+        Replays a trace of accesses on a server-side caching instance.
+        """
+        data = {"items": items}
+        return self._make_request("POST", f"/algorithms/caching/instances/{instance_id}/trace", data, CachingTraceResponse)
+
     def oneway_trading_decide(
         self,
         buy_price: float,
@@ -159,14 +252,129 @@ class LAAClient:
         self,
         max_value: int,
         values: List[int],
-        prediction_value: int
+        prediction_value: int,
+        early_stop: bool = False
     ) -> SearchResponse:
         """
         Makes a search decision using the LAA API.
+
+        With `early_stop`, the search ends at the first value equal to `max_value`.
         """
         data = {
             "max_value": max_value,
             "values": values,
-            "prediction_value": prediction_value
+            "prediction_value": prediction_value,
+            "early_stop": early_stop
         }
         return self._make_request("POST", "/algorithms/search/decide", data, SearchResponse)
+
+
+class LAAClient(_Endpoints):
+    """
+    Client SDK for interacting with the LAA Platform API.
+
+    With `batch_size` set, concurrent `ski_rental_decide`, `randomized_ski_rental_decide`
+    and `oneway_trading_decide` calls from different threads are coalesced into one
+    request to the matching batch endpoint. Each call still blocks until its own
+    response arrives, so call sites don't change.
+
+    With `wire_format="msgpack"` or `"arrow"`, the endpoints that move large integer
+    arrays (caching, scheduling and search decisions) exchange binary bodies instead
+    of JSON.
+
+    With a `local://` URL, requests never leave the process: they are served by
+    `laa_sdk.local.LocalBackend`, which calls `laa_core` directly (it must be installed).
+    """
+
+    # Decision endpoints whose calls can be coalesced into their `/batch` counterpart.
+    BATCHED_ENDPOINTS = (
+        "/algorithms/ski-rental/decide",
+        "/algorithms/randomized-ski-rental/decide",
+        "/algorithms/oneway-trading/decide",
+    )
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        batch_size: Optional[int] = None,
+        batch_delay: float = 0.0005,
+        wire_format: str = "json"
+    ):
+        """
+        Initializes the LAAClient.
+
+        Args:
+            api_url: The base URL of the LAA Platform API.
+            api_key: Your API key for authentication.
+            batch_size: If set, the maximum number of decisions coalesced into one batch request.
+            batch_delay: How long a decision waits for others to join its batch, in seconds.
+            wire_format: "json", "msgpack" or "arrow".
+        """
+        wire.check_format(wire_format)
+        self.wire_format = wire_format
+        self.api_url = api_url
+        self.api_key = api_key
+        self.session = requests.Session()
+        self.session.headers.update({"X-API-Key": api_key})
+        self._local = None
+        self._batchers: Dict[str, MicroBatcher] = {}
+        if api_url.startswith("local://"):
+            from laa_sdk.local import LocalBackend
+            self._local = LocalBackend()
+        elif batch_size is not None:
+            for endpoint in self.BATCHED_ENDPOINTS:
+                self._batchers[endpoint] = MicroBatcher(
+                    lambda items, endpoint=endpoint: self._decide_batch(endpoint, items), batch_size, batch_delay
+                )
+
+    def close(self):
+        """Sends the decisions still waiting to be batched and closes the session."""
+        for batcher in self._batchers.values():
+            batcher.close()
+        self.session.close()
+
+    def _decide_batch(self, endpoint: str, items: List[dict]) -> list:
+        try:
+            response = self._send_request("POST", f"{endpoint}/batch", {"requests": items}, DecisionBatchResponse)
+        except ClientValidationError as e:
+            if len(items) == 1:
+                return [e]
+            # One invalid decision rejects the whole batch, so only that caller should fail.
+            return [self._decide_batch(endpoint, [item])[0] for item in items]
+        return response.decisions
+
+    def _make_request(self, method: str, endpoint: str, json_data: Optional[dict], response_model):
+        if self._local is not None:
+            return self._local.request(method, endpoint, json_data, response_model)
+        batcher = self._batchers.get(endpoint) if method == "POST" else None
+        if batcher is not None:
+            return batcher.submit(json_data).result()
+        return self._send_request(method, endpoint, json_data, response_model)
+
+    def _send_request(self, method: str, endpoint: str, json_data: Optional[dict], response_model):
+        try:
+            if self.wire_format != "json" and endpoint in wire.BINARY_ENDPOINTS:
+                body, headers = wire.encode_request(self.wire_format, json_data)
+                response = self.session.request(method, f"{self.api_url}{endpoint}", data=body, headers=headers)
+                response.raise_for_status()
+                return response_model(**wire.decode_response(response.headers.get("Content-Type"), response.content))
+            response = self.session.request(method, f"{self.api_url}{endpoint}", json=json_data)
+            response.raise_for_status()
+            if response_model is None:
+                return None
+            return response_model(**response.json())
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code == 422:
+                raise ClientValidationError(f"Validation Error: {e.response.text}") from e
+            raise APIError(e.response.status_code, e.response.text) from e
+        except ValidationError as e:
+            raise LAAError(f"Failed to parse API response: {e}") from e
+
+
+def __getattr__(name):
+    # The async client needs httpx, an optional dependency (`pip install laa_sdk[async]`).
+    if name == "AsyncLAAClient":
+        from laa_sdk.aio import AsyncLAAClient
+        return AsyncLAAClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
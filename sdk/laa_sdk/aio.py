@@ -0,0 +1,156 @@
+import asyncio
+import random
+from typing import Awaitable, Iterable, List, Optional, TypeVar
+
+import httpx
+from pydantic import ValidationError
+
+from laa_sdk import APIError, ClientValidationError, LAAError, _Endpoints, wire
+
+T = TypeVar("T")
+
+# Requests that fail this way never reached the API, so retrying them cannot apply
+# a decision or a caching access twice.
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# The API (or the proxy in front of it) rejected the request without processing it.
+RETRY_STATUS_CODES = frozenset({429, 503})
+
+
+class AsyncLAAClient(_Endpoints):
+    """
+    Asynchronous client SDK for interacting with the LAA Platform API.
+
+    It exposes the same methods as `LAAClient`, as coroutines. All requests share one
+    pool of keep-alive connections, so issuing many decisions concurrently (see
+    `gather_decisions`) reuses connections instead of opening one per request. With
+    `http2=True` (requires the `h2` package) concurrent requests are multiplexed over
+    a single connection.
+
+    Usage:
+        async with AsyncLAAClient(api_url, api_key) as client:
+            decisions = await client.gather_decisions(
+                client.oneway_trading_decide(100.0, price, 120.0) for price in prices
+            )
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        http2: bool = False,
+        wire_format: str = "json",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initializes the AsyncLAAClient.
+
+        Args:
+            api_url: The base URL of the LAA Platform API.
+            api_key: Your API key for authentication.
+            max_connections: The maximum number of concurrent connections.
+            max_keepalive_connections: The maximum number of idle connections kept open.
+            keepalive_expiry: How long an idle connection is kept open, in seconds.
+            timeout: The timeout of each request, in seconds.
+            max_retries: How often a request is retried after a connection failure or a
+                         429/503 response.
+            backoff: The base delay between retries, in seconds. It doubles with every
+                     retry and is jittered.
+            http2: Whether to use HTTP/2.
+            wire_format: "json", "msgpack" or "arrow", used by the endpoints that move
+                         large integer arrays (see `laa_sdk.wire`).
+            transport: A custom httpx transport, for example `httpx.MockTransport` in tests.
+        """
+        wire.check_format(wire_format)
+        self.wire_format = wire_format
+        self.api_url = api_url
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client = httpx.AsyncClient(
+            base_url=api_url,
+            headers={"X-API-Key": api_key},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            http2=http2,
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes all pooled connections."""
+        await self.client.aclose()
+
+    async def _send(self, method: str, endpoint: str, json_data: Optional[dict]) -> httpx.Response:
+        if self.wire_format != "json" and endpoint in wire.BINARY_ENDPOINTS:
+            body, headers = wire.encode_request(self.wire_format, json_data)
+            request = {"content": body, "headers": headers}
+        else:
+            request = {"json": json_data}
+        for attempt in range(self.max_retries + 1):
+            retries_left = attempt < self.max_retries
+            try:
+                response = await self.client.request(method, endpoint, **request)
+            except RETRY_EXCEPTIONS:
+                if not retries_left:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or not retries_left:
+                    return response
+            await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    async def _make_request(self, method: str, endpoint: str, json_data: Optional[dict], response_model):
+        response = await self._send(method, endpoint, json_data)
+        if response.status_code == 422:
+            raise ClientValidationError(f"Validation Error: {response.text}")
+        if response.is_error:
+            raise APIError(response.status_code, response.text)
+        if response_model is None:
+            return None
+        try:
+            return response_model(**wire.decode_response(response.headers.get("Content-Type"), response.content))
+        except ValidationError as e:
+            raise LAAError(f"Failed to parse API response: {e}") from e
+
+    async def gather_decisions(
+        self,
+        requests: Iterable[Awaitable[T]],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[T]:
+        """
+        Awaits many requests with at most `concurrency` of them in flight at once.
+
+        Args:
+            requests: The requests to make, e.g. `client.ski_rental_decide(...)` calls.
+            concurrency: The maximum number of requests in flight. Defaults to `max_connections`.
+            return_exceptions: Whether a failed request's exception is returned in its
+                               place instead of being raised.
+
+        Returns:
+            The responses, in the order of `requests`.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_connections)
+
+        async def bounded(request):
+            async with semaphore:
+                return await request
+
+        return await asyncio.gather(
+            *(bounded(request) for request in requests), return_exceptions=return_exceptions
+        )
@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """
+    Coalesces items submitted from many threads into batches.
+
+    Every submitted item is buffered and the caller gets a future for its result. A
+    background thread hands the buffered items to `flush` as soon as `max_batch_size`
+    of them are waiting, or `max_delay` seconds after it picked up the first one,
+    whichever comes first. `flush` returns one result per item, in order; a result
+    that is an exception is raised from that item's future only. If `flush` itself
+    raises, or returns the wrong number of results, every future of the batch fails.
+    """
+
+    def __init__(self, flush: Callable[[List[Any]], List[Any]], max_batch_size: int = 64, max_delay: float = 0.0005):
+        """
+        Initializes the MicroBatcher.
+
+        Args:
+            flush: Processes a batch of items and returns their results.
+            max_batch_size: The largest batch handed to `flush`.
+            max_delay: How long an incomplete batch waits for more items, in seconds.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Any, Future]] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, item: Any) -> Future:
+        """
+        Adds an item to the next batch.
+
+        Returns:
+            A future resolving to the item's result.
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed MicroBatcher")
+            self._pending.append((item, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="laa-micro-batcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def close(self):
+        """Flushes the items still waiting and stops the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.max_delay
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]):
+        try:
+            results = list(self.flush([item for item, _ in batch]))
+            if len(results) != len(batch):
+                # Results cannot be matched to items, so none of them is trusted.
+                raise RuntimeError(f"flush returned {len(results)} results for a batch of {len(batch)} items")
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
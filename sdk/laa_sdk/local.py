@@ -0,0 +1,196 @@
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from laa_protocol import schemas
+from laa_sdk import APIError, ClientValidationError, LAAError
+
+try:
+    import laa_core
+except ImportError:
+    laa_core = None
+
+
+class LocalBackend:
+    """
+    Serves LAA Platform API requests in-process by calling `laa_core` directly.
+
+    `LAAClient` uses it for `local://` URLs. Requests are routed by method and
+    endpoint like the API does, validated with the API's own request models
+    (`laa_protocol.schemas`) and answered with the same response models, built without
+    validation since the values come straight from `laa_core`. Algorithm instances
+    are pooled per configuration, keeping the `max_instances` most recently used, and
+    caching instances live in this process until they are deleted.
+    """
+
+    def __init__(self, max_instances: int = 1024):
+        if laa_core is None:
+            raise LAAError("The local:// backend requires the laa_core package")
+        self.max_instances = max_instances
+        self._instances: "OrderedDict[tuple, object]" = OrderedDict()
+        self._instances_lock = threading.Lock()
+        self._caching_instances: Dict[str, Tuple[object, threading.Lock]] = {}
+        self._routes: List[Tuple[str, re.Pattern, Optional[type], Callable]] = [
+            ("POST", re.compile(r"/algorithms/ski-rental/decide"), schemas.SkiRentalRequest,
+             self._ski_rental_decide),
+            ("POST", re.compile(r"/algorithms/randomized-ski-rental/decide"), schemas.RandomizedSkiRentalRequest,
+             self._randomized_ski_rental_decide),
+            ("POST", re.compile(r"/algorithms/(ski-rental|randomized-ski-rental)/buy-day"), schemas.SkiRentalBuyDayRequest,
+             self._buy_day),
+            ("POST", re.compile(r"/algorithms/caching/decide"), schemas.CachingRequest, self._caching_decide),
+            ("POST", re.compile(r"/algorithms/caching/instances"), schemas.CachingInstanceRequest,
+             self._caching_create_instance),
+            ("GET", re.compile(r"/algorithms/caching/instances/(\w+)"), None, self._caching_get_instance),
+            ("DELETE", re.compile(r"/algorithms/caching/instances/(\w+)"), None, self._caching_delete_instance),
+            ("PATCH", re.compile(r"/algorithms/caching/instances/(\w+)/predictions"), schemas.CachingPredictionsUpdate,
+             self._caching_update_predictions),
+            ("POST", re.compile(r"/algorithms/caching/instances/(\w+)/access"), schemas.CachingAccessRequest,
+             self._caching_access),
+            ("POST", re.compile(r"/algorithms/caching/instances/(\w+)/trace"), schemas.CachingTraceRequest,
+             self._caching_access_trace),
+            ("POST", re.compile(r"/algorithms/oneway-trading/decide"), schemas.OnewayTradingRequest,
+             self._oneway_trading_decide),
+            ("POST", re.compile(r"/algorithms/scheduling/decide"), schemas.SchedulingRequest, self._scheduling_decide),
+            ("POST", re.compile(r"/algorithms/search/decide"), schemas.SearchRequest, self._search_decide),
+        ]
+
+    def request(self, method: str, endpoint: str, json_data: Optional[dict], response_model):
+        for route_method, pattern, request_model, handler in self._routes:
+            match = pattern.fullmatch(endpoint)
+            if route_method == method and match:
+                req = _validate(request_model, json_data) if request_model is not None else None
+                try:
+                    result = handler(req, *match.groups())
+                except LAAError:
+                    raise
+                except Exception as e:
+                    raise APIError(500, str(e)) from e
+                if response_model is None:
+                    return None
+                return response_model.model_construct(**result)
+        raise APIError(404, f"{method} {endpoint} is not available in the local backend")
+
+    def _shared_instance(self, core_class, *params):
+        return self._pooled((core_class.__name__,) + params, lambda: core_class(*params))
+
+    def _pooled(self, key: tuple, factory: Callable[[], object]):
+        """Returns the pooled instance under `key`, creating it and evicting the least recently used on a miss."""
+        with self._instances_lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._instances.move_to_end(key)
+                return instance
+        instance = factory()
+        with self._instances_lock:
+            self._instances[key] = instance
+            while len(self._instances) > self.max_instances:
+                self._instances.popitem(last=False)
+        return instance
+
+    def _get_caching_instance(self, instance_id: str):
+        instance = self._caching_instances.get(instance_id)
+        if instance is None:
+            raise APIError(404, f"caching instance {instance_id} not found")
+        return instance
+
+    @staticmethod
+    def _describe(instance_id: str, engine) -> dict:
+        return {
+            "instance_id": instance_id,
+            "cache_size": engine.cache_size,
+            "contents": engine.contents(),
+            "hits": engine.hits,
+            "misses": engine.misses,
+        }
+
+    def _ski_rental_decide(self, req: schemas.SkiRentalRequest) -> dict:
+        sr = self._shared_instance(laa_core.SkiRental, req.buy_cost)
+        decision = sr.decide(req.current_day, req.prediction_days, req.trust)
+        return {"decision": "buy" if decision else "rent", "algorithm": "ski_rental", "trust_parameter": req.trust}
+
+    def _randomized_ski_rental_decide(self, req: schemas.RandomizedSkiRentalRequest) -> dict:
+        sr = self._shared_instance(laa_core.RandomizedSkiRental, req.buy_cost)
+        decision = sr.decide(req.current_day, req.prediction_days, req.trust)
+        return {"decision": "buy" if decision else "rent", "algorithm": "randomized_ski_rental", "trust_parameter": req.trust}
+
+    def _buy_day(self, req: schemas.SkiRentalBuyDayRequest, algorithm: str) -> dict:
+        if algorithm == "ski-rental":
+            sr = self._shared_instance(laa_core.SkiRental, req.buy_cost)
+            buy_day = sr.buy_day(req.prediction_days, req.trust)
+        else:
+            sr = self._shared_instance(laa_core.RandomizedSkiRental, req.buy_cost)
+            buy_day = sr.sample_buy_day(req.prediction_days, req.trust)
+        return {"buy_day": buy_day, "algorithm": algorithm.replace("-", "_"), "trust_parameter": req.trust}
+
+    def _caching_decide(self, req: schemas.CachingRequest) -> dict:
+        if req.predictions_key is not None:
+            key = ("Caching", req.cache_size, "predictions_key", req.predictions_key)
+        else:
+            key = ("Caching", req.cache_size, frozenset(req.predictions.items()))
+        caching = self._pooled(key, lambda: laa_core.Caching(req.cache_size, req.predictions))
+        decision, new_cache = caching.decide(req.item, req.cache)
+        return {"decision": "hit" if decision else "miss", "new_cache": new_cache, "algorithm": "caching"}
+
+    def _caching_create_instance(self, req: schemas.CachingInstanceRequest) -> dict:
+        instance_id = uuid.uuid4().hex
+        engine = laa_core.CachingEngine(req.cache_size, req.predictions)
+        self._caching_instances[instance_id] = (engine, threading.Lock())
+        return self._describe(instance_id, engine)
+
+    def _caching_get_instance(self, req: None, instance_id: str) -> dict:
+        engine, lock = self._get_caching_instance(instance_id)
+        with lock:
+            return self._describe(instance_id, engine)
+
+    def _caching_delete_instance(self, req: None, instance_id: str) -> dict:
+        self._get_caching_instance(instance_id)
+        self._caching_instances.pop(instance_id, None)
+        return {}
+
+    def _caching_update_predictions(self, req: schemas.CachingPredictionsUpdate, instance_id: str) -> dict:
+        engine, lock = self._get_caching_instance(instance_id)
+        with lock:
+            if req.upsert:
+                engine.update_predictions(list(req.upsert.keys()), list(req.upsert.values()))
+            if req.delete:
+                engine.remove_predictions(req.delete)
+            return self._describe(instance_id, engine)
+
+    def _caching_access(self, req: schemas.CachingAccessRequest, instance_id: str) -> dict:
+        engine, lock = self._get_caching_instance(instance_id)
+        with lock:
+            hit = engine.access(req.item)
+        return {"decision": "hit" if hit else "miss", "algorithm": "caching"}
+
+    def _caching_access_trace(self, req: schemas.CachingTraceRequest, instance_id: str) -> dict:
+        engine, lock = self._get_caching_instance(instance_id)
+        with lock:
+            hits, misses = engine.access_many(req.items)
+        return {"hits": hits, "misses": misses, "algorithm": "caching"}
+
+    def _oneway_trading_decide(self, req: schemas.OnewayTradingRequest) -> dict:
+        ot = self._shared_instance(laa_core.OnewayTrading, req.buy_price)
+        decision = ot.decide(req.current_price, req.prediction_price, req.trust)
+        return {"decision": "buy" if decision else "wait", "algorithm": "oneway_trading", "trust_parameter": req.trust}
+
+    def _scheduling_decide(self, req: schemas.SchedulingRequest) -> dict:
+        scheduling = self._shared_instance(laa_core.Scheduling, req.num_machines)
+        assignments = scheduling.decide(req.job_lengths, req.prediction_job_lengths)
+        return {"assignments": assignments, "algorithm": "scheduling"}
+
+    def _search_decide(self, req: schemas.SearchRequest) -> dict:
+        search = self._shared_instance(laa_core.Search, req.max_value)
+        best_index = search.decide(req.values, req.prediction_value, req.early_stop)
+        return {"best_index": best_index, "algorithm": "search"}
+
+
+def _validate(model: Type[BaseModel], data: Optional[dict]) -> BaseModel:
+    """Validates a request body like the API does, raising `ClientValidationError` where it answers 422."""
+    try:
+        return model.model_validate(data or {})
+    except ValidationError as e:
+        raise ClientValidationError(f"Validation Error: {e}") from e
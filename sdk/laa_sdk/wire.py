@@ -0,0 +1,69 @@
+"""
+Binary wire formats for the endpoints that move large integer arrays.
+
+The LAA Platform API accepts and returns MessagePack and Arrow IPC bodies on these
+endpoints, besides JSON. `msgpack` and `pyarrow` are optional dependencies
+(`pip install laa_sdk[msgpack]` / `laa_sdk[arrow]`).
+"""
+import json
+from typing import Any, Dict, Tuple
+
+from laa_protocol.arrow import encode_arrow, load_pyarrow
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Endpoints accepting MessagePack and Arrow bodies; all others always use JSON.
+BINARY_ENDPOINTS = frozenset({
+    "/algorithms/caching/decide",
+    "/algorithms/scheduling/decide",
+    "/algorithms/search/decide",
+})
+
+
+def check_format(wire_format: str):
+    """Raises if `wire_format` is unknown or its optional dependency is missing."""
+    if wire_format not in MEDIA_TYPES:
+        raise ValueError(f"wire_format must be one of {sorted(MEDIA_TYPES)}, got {wire_format!r}")
+    if wire_format == "msgpack" and msgpack is None:
+        raise ImportError("The msgpack wire format requires the msgpack package")
+    if wire_format == "arrow" and load_pyarrow() is None:
+        raise ImportError("The arrow wire format requires the pyarrow package")
+
+
+def decode_arrow(body: bytes) -> Dict[str, Any]:
+    """Decodes a single-row Arrow record batch into a dict of Python values."""
+    pa = load_pyarrow()
+    table = pa.ipc.open_stream(body).read_all()
+    return {name: column[0].as_py() for name, column in zip(table.column_names, table.columns)}
+
+
+def encode_request(wire_format: str, json_data: dict) -> Tuple[bytes, Dict[str, str]]:
+    """Encodes a request body, returning it together with its negotiation headers."""
+    media_type = MEDIA_TYPES[wire_format]
+    if wire_format == "msgpack":
+        body = msgpack.packb(json_data)
+    elif wire_format == "arrow":
+        body = encode_arrow(json_data)
+    else:
+        body = json.dumps(json_data).encode()
+    return body, {"Content-Type": media_type, "Accept": media_type}
+
+
+def decode_response(content_type: str, content: bytes) -> Dict[str, Any]:
+    """Decodes a response body according to its `Content-Type`."""
+    media_type = (content_type or "").split(";", 1)[0].strip()
+    if media_type == MEDIA_TYPES["msgpack"]:
+        return msgpack.unpackb(content, strict_map_key=False)
+    if media_type == MEDIA_TYPES["arrow"]:
+        return decode_arrow(content)
+    return json.loads(content)
@@ -7,5 +7,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "requests",
+        "laa_protocol",
     ],
+    extras_require={
+        "async": ["httpx"],
+        "msgpack": ["msgpack"],
+        "arrow": ["pyarrow"],
+    },
 )
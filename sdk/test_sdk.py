@@ -1,8 +1,17 @@
 
+import asyncio
+import json
+import threading
+
+import httpx
 import pytest
 import requests
 from unittest.mock import MagicMock
-from laa_sdk import LAAClient, DecisionResponse, CachingResponse, SchedulingResponse, SearchResponse, APIError, ClientValidationError
+from laa_sdk import (
+    LAAClient, DecisionResponse, BuyDayResponse, CachingResponse, CachingInstanceResponse, CachingAccessResponse,
+    SchedulingResponse, SearchResponse, APIError, ClientValidationError
+)
+from laa_sdk.batching import MicroBatcher
 
 @pytest.fixture
 def client(mocker):
@@ -40,6 +49,22 @@ def test_randomized_ski_rental_decide_success(client):
     assert isinstance(result, DecisionResponse)
     assert result.decision == "rent"
 
+def test_ski_rental_buy_day_success(client):
+    laa_client, mock_session = client
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"buy_day": None, "algorithm": "randomized_ski_rental", "trust_parameter": 0.5}
+    mock_session.request.return_value = mock_response
+
+    result = laa_client.ski_rental_buy_day(100, 20, 0.5, randomized=True)
+
+    assert isinstance(result, BuyDayResponse)
+    assert result.buy_day is None
+    mock_session.request.assert_called_once_with(
+        "POST",
+        "http://test.com/algorithms/randomized-ski-rental/buy-day",
+        json={"buy_cost": 100, "prediction_days": 20, "trust": 0.5}
+    )
+
 def test_caching_decide_success(client):
     laa_client, mock_session = client
     mock_response = MagicMock()
@@ -51,6 +76,43 @@ def test_caching_decide_success(client):
     assert isinstance(result, CachingResponse)
     assert result.new_cache == [2, 3]
 
+def test_create_caching_instance_success(client):
+    laa_client, mock_session = client
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"instance_id": "abc", "cache_size": 2, "contents": [], "hits": 0, "misses": 0}
+    mock_session.request.return_value = mock_response
+
+    result = laa_client.create_caching_instance(2, {1: 10})
+
+    assert isinstance(result, CachingInstanceResponse)
+    assert result.instance_id == "abc"
+    mock_session.request.assert_called_once_with(
+        "POST",
+        "http://test.com/algorithms/caching/instances",
+        json={"cache_size": 2, "predictions": {1: 10}}
+    )
+
+def test_caching_access_and_updates(client):
+    laa_client, mock_session = client
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"decision": "hit", "algorithm": "caching"}
+    mock_session.request.return_value = mock_response
+
+    result = laa_client.caching_access("abc", 1)
+
+    assert isinstance(result, CachingAccessResponse)
+    assert result.decision == "hit"
+
+    mock_response.json.return_value = {"instance_id": "abc", "cache_size": 2, "contents": [1], "hits": 1, "misses": 1}
+    laa_client.update_caching_predictions("abc", upsert={1: 3}, delete=[2])
+    mock_session.request.assert_called_with(
+        "PATCH",
+        "http://test.com/algorithms/caching/instances/abc/predictions",
+        json={"upsert": {1: 3}, "delete": [2]}
+    )
+
+    assert laa_client.delete_caching_instance("abc") is None
+
 def test_api_error_raised(client):
     laa_client, mock_session = client
     mock_response = MagicMock()
@@ -93,3 +155,223 @@ def test_search_decide_success(client):
 
     assert isinstance(result, SearchResponse)
     assert result.best_index == 1
+
+def make_async_client(handler, **kwargs):
+    from laa_sdk.aio import AsyncLAAClient
+    return AsyncLAAClient("http://test.com", "test_key", transport=httpx.MockTransport(handler), backoff=0, **kwargs)
+
+def test_async_client_decide():
+    def handler(request):
+        assert request.headers["X-API-Key"] == "test_key"
+        assert request.url == "http://test.com/algorithms/ski-rental/decide"
+        assert json.loads(request.content) == {"buy_cost": 100, "current_day": 10, "prediction_days": 120, "trust": 0.8}
+        return httpx.Response(200, json={"decision": "buy", "algorithm": "ski_rental", "trust_parameter": 0.8})
+
+    async def run():
+        async with make_async_client(handler) as laa_client:
+            return await laa_client.ski_rental_decide(100, 10, 120, 0.8)
+
+    result = asyncio.run(run())
+    assert isinstance(result, DecisionResponse)
+    assert result.decision == "buy"
+
+def test_async_client_retries_unavailable():
+    statuses = iter([503, 429, 200])
+    def handler(request):
+        status = next(statuses)
+        return httpx.Response(status, json={"best_index": 1, "algorithm": "search"})
+
+    result = asyncio.run(make_async_client(handler).search_decide(100, [10, 99], 1))
+    assert result.best_index == 1
+
+def test_async_client_errors():
+    async def run(status, **kwargs):
+        laa_client = make_async_client(lambda request: httpx.Response(status, text="Nope"), **kwargs)
+        await laa_client.ski_rental_decide(100, 10, 120, 0.8)
+
+    with pytest.raises(APIError) as excinfo:
+        asyncio.run(run(503, max_retries=1))
+    assert excinfo.value.status_code == 503
+    with pytest.raises(APIError):
+        asyncio.run(run(500))
+    with pytest.raises(ClientValidationError):
+        asyncio.run(run(422))
+
+def test_gather_decisions_bounds_concurrency():
+    in_flight, peak = 0, 0
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        price = json.loads(request.content)["current_price"]
+        return httpx.Response(200, json={"decision": "buy" if price >= 100 else "wait", "algorithm": "oneway_trading", "trust_parameter": 0.0})
+
+    async def run():
+        async with make_async_client(handler) as laa_client:
+            return await laa_client.gather_decisions(
+                (laa_client.oneway_trading_decide(100, price, 100, 0.0) for price in range(90, 110)),
+                concurrency=4,
+            )
+
+    results = asyncio.run(run())
+    assert [result.decision for result in results] == ["wait"] * 10 + ["buy"] * 10
+    assert peak <= 4
+
+def test_micro_batcher_flushes_full_batches():
+    batches = []
+    batcher = MicroBatcher(lambda items: batches.append(items) or [item * 2 for item in items], max_batch_size=3, max_delay=10)
+    futures = [batcher.submit(item) for item in range(6)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8, 10]
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    batcher.close()
+
+def test_micro_batcher_flushes_after_delay_and_on_close():
+    batcher = MicroBatcher(lambda items: [ValueError(item) if item < 0 else item for item in items], max_batch_size=100, max_delay=0.001)
+    assert batcher.submit(1).result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        batcher.submit(-1).result(timeout=5)
+
+    batcher.max_delay = 60
+    future = batcher.submit(2)
+    batcher.close()
+    assert future.result(timeout=0) == 2
+    with pytest.raises(RuntimeError):
+        batcher.submit(3)
+
+def test_micro_batcher_fails_batch_on_missing_results():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=3, max_delay=10)
+    futures = [batcher.submit(item) for item in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="2 results for a batch of 3"):
+            future.result(timeout=5)
+    batcher.close()
+
+def test_client_coalesces_concurrent_decisions(mocker):
+    mock_session = MagicMock()
+    mocker.patch('requests.Session', return_value=mock_session)
+    def request(method, url, json):
+        response = MagicMock()
+        response.json.return_value = {"decisions": [
+            {"decision": "buy" if r["current_day"] >= r["prediction_days"] else "rent", "algorithm": "ski_rental", "trust_parameter": r["trust"]}
+            for r in json["requests"]
+        ]}
+        return response
+    mock_session.request.side_effect = request
+    laa_client = LAAClient(api_url="http://test.com", api_key="test_key", batch_size=4, batch_delay=5)
+
+    results = {}
+    def decide(day):
+        results[day] = laa_client.ski_rental_decide(100, day, 2, 0.5)
+    threads = [threading.Thread(target=decide, args=(day,)) for day in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert {day: result.decision for day, result in results.items()} == {0: "rent", 1: "rent", 2: "buy", 3: "buy"}
+    mock_session.request.assert_called_once()
+    assert mock_session.request.call_args.args == ("POST", "http://test.com/algorithms/ski-rental/decide/batch")
+    laa_client.close()
+
+def test_client_batch_validation_error_only_fails_invalid_decision(mocker):
+    mock_session = MagicMock()
+    mocker.patch('requests.Session', return_value=mock_session)
+    def request(method, url, json):
+        response = MagicMock()
+        if any(r["trust"] > 1 for r in json["requests"]):
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=MagicMock(status_code=422, text="Unprocessable Entity"))
+        response.json.return_value = {"decisions": [{"decision": "wait", "algorithm": "oneway_trading", "trust_parameter": r["trust"]} for r in json["requests"]]}
+        return response
+    mock_session.request.side_effect = request
+    laa_client = LAAClient(api_url="http://test.com", api_key="test_key", batch_size=2, batch_delay=5)
+    batcher = laa_client._batchers["/algorithms/oneway-trading/decide"]
+
+    valid = batcher.submit({"buy_price": 100, "current_price": 90, "prediction_price": 120, "trust": 0.5})
+    invalid = batcher.submit({"buy_price": 100, "current_price": 90, "prediction_price": 120, "trust": 1.5})
+
+    assert valid.result(timeout=5).decision == "wait"
+    with pytest.raises(ClientValidationError):
+        invalid.result(timeout=5)
+    laa_client.close()
+
+def test_local_backend_serves_requests_in_process(mocker):
+    pytest.importorskip("laa_core")
+    mock_session = MagicMock()
+    mocker.patch('requests.Session', return_value=mock_session)
+    laa_client = LAAClient(api_url="local://", api_key="test_key")
+
+    assert laa_client.ski_rental_decide(100, 120, 150, 1.0).decision == "buy"
+    assert laa_client.ski_rental_decide(100, 10, 150, 1.0).decision == "rent"
+    assert laa_client.oneway_trading_decide(100, 130, 120, 0.5).decision == "buy"
+    assert laa_client.ski_rental_buy_day(100, 50, 1.0) == BuyDayResponse(buy_day=50, algorithm="ski_rental", trust_parameter=1.0)
+    assert laa_client.scheduling_decide(2, [10, 10], [1, 1]).assignments == [0, 1]
+    assert laa_client.search_decide(100, [10, 99, 50], 1).best_index == 1
+
+    instance = laa_client.create_caching_instance(1, {1: 10})
+    assert laa_client.caching_access(instance.instance_id, 1).decision == "miss"
+    assert laa_client.caching_access(instance.instance_id, 1).decision == "hit"
+    assert laa_client.get_caching_instance(instance.instance_id).hits == 1
+    assert laa_client.delete_caching_instance(instance.instance_id) is None
+    with pytest.raises(APIError) as excinfo:
+        laa_client.get_caching_instance(instance.instance_id)
+    assert excinfo.value.status_code == 404
+
+    with pytest.raises(ClientValidationError):
+        laa_client.ski_rental_decide(100, 10, 120, 1.1)
+    mock_session.request.assert_not_called()
+
+def test_msgpack_wire_format(mocker):
+    msgpack = pytest.importorskip("msgpack")
+    mock_session = MagicMock()
+    mocker.patch('requests.Session', return_value=mock_session)
+    mock_response = MagicMock()
+    mock_response.headers = {"Content-Type": "application/msgpack"}
+    mock_response.content = msgpack.packb({"assignments": [0, 1], "algorithm": "scheduling"})
+    mock_session.request.return_value = mock_response
+    laa_client = LAAClient(api_url="http://test.com", api_key="test_key", wire_format="msgpack")
+
+    result = laa_client.scheduling_decide(2, [10, 10], [1, 1])
+
+    assert result.assignments == [0, 1]
+    args, kwargs = mock_session.request.call_args
+    assert args == ("POST", "http://test.com/algorithms/scheduling/decide")
+    assert kwargs["headers"] == {"Content-Type": "application/msgpack", "Accept": "application/msgpack"}
+    assert msgpack.unpackb(kwargs["data"]) == {"num_machines": 2, "job_lengths": [10, 10], "prediction_job_lengths": [1, 1]}
+
+def test_arrow_wire_format_async():
+    pytest.importorskip("pyarrow")
+    from laa_sdk.wire import decode_arrow, encode_arrow
+    def handler(request):
+        assert request.headers["Content-Type"] == "application/vnd.apache.arrow.stream"
+        payload = decode_arrow(request.content)
+        assert payload == {"max_value": 100, "values": [10, 99, 50], "prediction_value": 1, "early_stop": False}
+        return httpx.Response(
+            200, content=encode_arrow({"best_index": 1, "algorithm": "search"}),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
+
+    result = asyncio.run(make_async_client(handler, wire_format="arrow").search_decide(100, [10, 99, 50], 1))
+    assert result.best_index == 1
+
+def test_unknown_wire_format():
+    with pytest.raises(ValueError):
+        LAAClient(api_url="http://test.com", api_key="test_key", wire_format="xml")
+
+def test_local_backend_bounds_its_instance_pool():
+    pytest.importorskip("laa_core")
+    from laa_sdk.local import LocalBackend
+
+    backend = LocalBackend(max_instances=4)
+    laa_client = LAAClient(api_url="local://", api_key="test_key")
+    laa_client._local = backend
+    for item in range(20):
+        laa_client.caching_decide(1, {item: 1}, item, [])
+    assert len(backend._instances) == 4
+
+    # The API's own request models reject what the API would answer with 422.
+    with pytest.raises(ClientValidationError):
+        laa_client.scheduling_decide(0, [1], [1])
+    with pytest.raises(ClientValidationError):
+        laa_client.create_caching_instance(-1, {})
@@ -0,0 +1,125 @@
+import random
+
+import numpy as np
+import pytest
+
+from laa_tools.brittleness_detector import BrittlenessDetector
+
+
+class SkiRentalProblem:
+    def __init__(self, ski_days, buy_cost=100.0):
+        self.ski_days = ski_days
+        self.buy_cost = buy_cost
+
+    def get_perfect_prediction(self):
+        return float(self.ski_days)
+
+    def compute_optimal(self):
+        return min(self.ski_days, self.buy_cost)
+
+
+class SkiRentalGenerator:
+    def generate(self):
+        return SkiRentalProblem(random.randint(1, 200))
+
+
+class FollowThePrediction:
+    """Buys on day one if the prediction exceeds the buy cost, otherwise always rents."""
+
+    def run(self, problem, prediction):
+        return problem.buy_cost if prediction >= problem.buy_cost else problem.ski_days
+
+    def run_batch(self, problem, predictions):
+        return np.where(predictions >= problem.buy_cost, problem.buy_cost, problem.ski_days)
+
+
+class JobLengthsProblem:
+    """A problem whose prediction is an array: the lengths of its jobs."""
+
+    def __init__(self, job_lengths):
+        self.job_lengths = job_lengths
+
+    def get_perfect_prediction(self):
+        return self.job_lengths
+
+    def compute_optimal(self):
+        return float(self.job_lengths.sum())
+
+
+class JobLengthsGenerator:
+    def generate(self):
+        return JobLengthsProblem(np.random.randint(1, 100, size=5).astype(float))
+
+
+class ReservePredictedTime:
+    """Pays for the predicted time of every job, plus the time it overran its prediction."""
+
+    def run(self, problem, prediction):
+        return float(np.maximum(prediction, problem.job_lengths).sum())
+
+
+class RunOnly:
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+
+    def run(self, problem, prediction):
+        return self.algorithm.run(problem, prediction)
+
+
+class TestBrittlenessDetector:
+    def test_run_batch_matches_run(self):
+        epsilons = [0.0, 0.01, 0.1, 0.5]
+        batched = BrittlenessDetector(FollowThePrediction(), SkiRentalGenerator())
+        scalar = BrittlenessDetector(RunOnly(FollowThePrediction()), SkiRentalGenerator())
+        expected = scalar.analyze(num_trials=300, epsilons=epsilons, seed=7)
+        result = batched.analyze(num_trials=300, epsilons=epsilons, seed=7)
+        assert result['profile'] == pytest.approx(expected['profile'])
+
+    def test_seeded_result_independent_of_n_jobs(self):
+        detector = BrittlenessDetector(FollowThePrediction(), SkiRentalGenerator())
+        serial = detector.analyze(num_trials=1000, seed=3, chunk_size=100)
+        parallel = detector.analyze(num_trials=1000, seed=3, chunk_size=100, n_jobs=2)
+        assert parallel['profile'] == pytest.approx(serial['profile'])
+        assert parallel['severity'] == pytest.approx(serial['severity'])
+
+    def test_detects_brittle_algorithm(self):
+        """Overestimating a season just below the buy cost makes the algorithm buy too early"""
+        generator = type('Generator', (), {'generate': lambda self: SkiRentalProblem(99)})()
+        detector = BrittlenessDetector(FollowThePrediction(), generator)
+        result = detector.analyze(num_trials=10, epsilons=[0.0, 0.05], threshold=0.1)
+        assert result['profile'][0.0] == pytest.approx(1.0)
+        assert result['profile'][0.05] == pytest.approx(100 / 99)
+        assert result['is_brittle']
+
+    def test_stream_matches_batch_profile(self):
+        epsilons = [0.0, 0.05, 0.2]
+        detector = BrittlenessDetector(FollowThePrediction(), SkiRentalGenerator())
+        expected = detector.analyze(num_trials=500, epsilons=epsilons, seed=11, chunk_size=500)
+        reports = list(detector.analyze_stream(num_trials=500, epsilons=epsilons, report_every=100, seed=11))
+        assert [report['num_trials'] for report in reports] == [100, 200, 300, 400, 500]
+        final = reports[-1]
+        assert final['profile'] == pytest.approx(expected['profile'])
+        assert final['severity'] == pytest.approx(expected['severity'])
+        low, high = final['severity_ci']
+        assert low <= final['severity'] <= high
+        assert not final['converged']
+
+    def test_stream_stops_once_severity_is_clear(self):
+        detector = BrittlenessDetector(FollowThePrediction(), SkiRentalGenerator())
+        reports = list(detector.analyze_stream(
+            num_trials=100_000, epsilons=[0.0, 0.05], tolerance=0.05, report_every=50, seed=2,
+        ))
+        final = reports[-1]
+        assert final['converged']
+        assert final['num_trials'] < 100_000
+        low, high = final['severity_ci']
+        assert high - low <= 2 * 0.05
+        assert final['quantiles'][0.0][0.5] == pytest.approx(1.0)
+
+    def test_array_valued_predictions(self):
+        epsilons = [0.0, 0.25, 0.5, 1.0]
+        detector = BrittlenessDetector(ReservePredictedTime(), JobLengthsGenerator())
+        result = detector.analyze(num_trials=50, epsilons=epsilons, seed=1)
+        assert list(result['profile'].values()) == pytest.approx([1.0, 1.25, 1.5, 2.0])
+        assert result['severity'] == pytest.approx(1.0)
+        assert result['is_brittle']
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import laa_core
+from laa_tools.decision_pipeline import DecisionPipeline, exponential_trust, linear_trust
+from laa_tools.uq_prediction_adapter import UQPredictionAdapter
+
+
+@pytest.fixture(scope="module")
+def adapter():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, size=(1000, 1))
+    y = 20.0 * X[:, 0] + rng.normal(scale=5.0, size=1000)
+    adapter = UQPredictionAdapter(confidence_level=0.9, window=500)
+    adapter.fit(X, y)
+    return adapter
+
+
+class TestCalibration:
+    def test_exponential_trust(self):
+        widths = np.array([0.0, 2.0, np.inf])
+        out = np.empty(3)
+        trust = exponential_trust(2.0)(widths, None, out)
+        assert trust is out
+        assert trust == pytest.approx([1.0, np.exp(-1.0), 0.0])
+
+    def test_linear_trust(self):
+        trust = linear_trust(4.0)(np.array([0.0, 1.0, 8.0]), None, np.empty(3))
+        assert trust == pytest.approx([1.0, 0.75, 0.0])
+
+
+class TestDecisionPipeline:
+    def test_matches_elementwise_decisions(self, adapter):
+        X = np.linspace(0, 10, 50)[:, None]
+        days = np.arange(50, dtype=float) * 4
+        algorithm = laa_core.SkiRental(100.0)
+        pipeline = DecisionPipeline(adapter, algorithm, exponential_trust(20.0))
+
+        result = pipeline.run(X, days)
+
+        prediction = adapter.predict(X)
+        trust = np.exp(-prediction['uncertainty'] / 20.0)
+        assert result['point'] == pytest.approx(prediction['point'])
+        assert result['trust'] == pytest.approx(trust)
+        expected = [algorithm.decide(int(d), p, t) for d, p, t in zip(days, prediction['point'], trust)]
+        assert result['decisions'].tolist() == expected
+
+    def test_buffers_are_reused(self, adapter):
+        pipeline = DecisionPipeline(adapter, laa_core.OnewayTrading(100.0), linear_trust(100.0))
+        X = np.linspace(0, 10, 64)[:, None]
+        first = pipeline.run(X, np.full(64, 120.0))
+        trust = first['trust'].copy()
+        second = pipeline.run(X[:32], np.full(32, 120.0))
+
+        for name in DecisionPipeline.BUFFERS:
+            assert np.shares_memory(first[name], second[name])
+        assert second['trust'] == pytest.approx(trust[:32])
+        assert len(pipeline.run(np.vstack([X, X]), np.full(128, 120.0))['decisions']) == 128
@@ -1,6 +1,7 @@
 
 import pytest
 import laa_core
+import laa_core.simulate
 import numpy as np
 
 class TestSkiRentalGuarantees:
@@ -85,6 +86,80 @@ class TestSkiRentalGuarantees:
             assert crs[i+1] >= crs[i], f"Not smooth: CR jumped from {crs[i]} to {crs[i+1]}"
             assert crs[i+1] - crs[i] < 0.5, f"Too abrupt: CR jumped {crs[i+1] - crs[i]}"
 
+class TestVectorizedDecisions:
+    def test_ski_rental_array_matches_scalar(self):
+        sr = laa_core.SkiRental(buy_cost=100.0)
+        days = np.arange(1, 151, dtype=np.float64)
+        predictions = np.full(days.shape, 120.0)
+        trusts = np.linspace(0.0, 1.0, days.size)
+
+        decisions = sr.decide_array(days, predictions, trusts)
+
+        assert decisions.dtype == np.bool_
+        expected = [sr.decide(int(d), p, t) for d, p, t in zip(days, predictions, trusts)]
+        assert decisions.tolist() == expected
+
+    def test_oneway_trading_array_matches_scalar(self):
+        ot = laa_core.OnewayTrading(100.0)
+        prices = np.linspace(90.0, 130.0, 41)
+        predictions = np.full(prices.shape, 120.0)
+        trusts = np.full(prices.shape, 0.5)
+
+        decisions = ot.decide_array(prices, predictions, trusts)
+
+        expected = [ot.decide(c, p, t) for c, p, t in zip(prices, predictions, trusts)]
+        assert decisions.tolist() == expected
+
+    def test_randomized_ski_rental_array_extremes(self):
+        rsr = laa_core.RandomizedSkiRental(100.0)
+        decisions = rsr.decide_array(np.array([0.0, 1000.0]), np.array([50.0, 50.0]), np.array([0.5, 0.5]))
+        assert decisions.tolist() == [False, True]
+
+    def test_randomized_ski_rental_seed_replays_decisions(self):
+        days = np.arange(1, 2001, dtype=float) % 150
+        predictions = np.full(days.shape, 80.0)
+        trusts = np.full(days.shape, 0.5)
+
+        first = laa_core.RandomizedSkiRental(100.0, seed=5)
+        second = laa_core.RandomizedSkiRental(100.0, seed=5)
+
+        assert first.decide_array(days, predictions, trusts).tolist() == second.decide_array(days, predictions, trusts).tolist()
+        assert first.sample_buy_day(80.0, 0.5) == second.sample_buy_day(80.0, 0.5)
+
+    def test_ski_rental_buy_day_matches_polling(self):
+        sr = laa_core.SkiRental(buy_cost=100.0)
+        predictions = np.linspace(0.0, 200.0, 41)
+        trusts = np.linspace(0.0, 1.0, 41)
+
+        buy_days = sr.buy_day_array(predictions, trusts)
+
+        assert buy_days.dtype == np.uint32
+        for buy_day, prediction, trust in zip(buy_days.tolist(), predictions, trusts):
+            polled = next(day for day in range(1, 200) if sr.decide(day, prediction, trust))
+            assert buy_day == polled == sr.buy_day(prediction, trust)
+
+    def test_randomized_buy_day_distribution(self):
+        """Sampled buy days follow the distribution of daily polling"""
+        rsr = laa_core.RandomizedSkiRental(100.0)
+        prediction, trust = 80.0, 0.6
+        rate = ((1 - trust) * 100.0 + trust * prediction) / (100.0 ** 2 * np.e)
+        survival, expected_mean, day = 1.0, 0.0, 1
+        while survival > 0:
+            p = min(1.0, day * rate)
+            expected_mean += day * survival * p
+            survival *= 1 - p
+            day += 1
+
+        buy_days = rsr.sample_buy_day_array(np.full(20_000, prediction), np.full(20_000, trust))
+
+        assert buy_days.min() >= 1
+        assert buy_days.mean() == pytest.approx(expected_mean, rel=0.03)
+
+    def test_array_length_mismatch(self):
+        sr = laa_core.SkiRental(100.0)
+        with pytest.raises(ValueError):
+            sr.decide_array(np.ones(3), np.ones(2), np.ones(3))
+
 class TestCachingGuarantees:
     def test_consistency(self):
         predictions = {1: 10, 2: 5, 3: 12}
@@ -126,6 +201,44 @@ class TestCachingGuarantees:
         assert decision == True
         assert new_cache == [1]
 
+    def test_decide_array_matches_decide(self):
+        caching = laa_core.Caching(2, {1: 10, 2: 5, 3: 12})
+        for item in [1, 3]:
+            assert caching.decide_array(item, np.array([1, 2], dtype=np.uint32)) == caching.decide(item, [1, 2])
+
+class TestCachingEngineGuarantees:
+    def test_hit_and_miss(self):
+        engine = laa_core.CachingEngine(2)
+        assert engine.access(1) == False
+        assert engine.access(1) == True
+        assert (engine.hits, engine.misses) == (1, 1)
+        assert len(engine) == 1 and 1 in engine
+
+    def test_evicts_latest_prediction(self):
+        engine = laa_core.CachingEngine(2, {1: 10, 2: 5, 3: 12})
+        engine.access(1)
+        engine.access(2)
+        assert engine.access(3) == False
+        assert sorted(engine.contents()) == [2, 3]
+
+    def test_matches_stateless_caching(self):
+        predictions = {item: (item * 7) % 11 for item in range(20)}
+        trace = [(i * 13) % 20 for i in range(200)]
+        caching = laa_core.Caching(5, predictions)
+        engine = laa_core.CachingEngine(5, predictions)
+
+        cache = []
+        for item in trace:
+            _, cache = caching.decide(item, cache)
+            engine.access(item)
+            assert sorted(engine.contents()) == sorted(cache)
+
+    def test_access_many(self):
+        engine = laa_core.CachingEngine(2, {1: 1, 2: 2, 3: 3})
+        hits, misses = engine.access_many(np.array([1, 2, 1, 3, 1, 2], dtype=np.uint32))
+        assert (hits, misses) == (2, 4)
+        assert (engine.hits, engine.misses) == (2, 4)
+
 class TestOnewayTradingGuarantees:
     def test_consistency(self):
         ot = laa_core.OnewayTrading(100.0)
@@ -182,6 +295,40 @@ class TestSchedulingGuarantees:
         assignments = scheduling.decide(job_lengths, predictions)
         assert assignments == []
 
+    def test_decide_array_matches_decide(self):
+        rng = np.random.default_rng(0)
+        job_lengths = rng.integers(1, 100, size=1_000, dtype=np.uint32)
+        predictions = rng.integers(1, 100, size=1_000, dtype=np.uint32)
+        scheduling = laa_core.Scheduling(4)
+        assert scheduling.decide_array(job_lengths, predictions) == scheduling.decide(job_lengths.tolist(), predictions.tolist())
+
+class TestOnlineSchedulerGuarantees:
+    def test_assigns_least_loaded_machine(self):
+        scheduler = laa_core.OnlineScheduler(2)
+        assert scheduler.submit(1, 10) == 0
+        assert scheduler.submit(2, 5) == 1
+        assert scheduler.submit(3, 12) == 1
+        assert scheduler.loads() == [10, 17]
+        assert scheduler.makespan() == 17
+
+    def test_completion_corrects_load(self):
+        scheduler = laa_core.OnlineScheduler(2)
+        scheduler.submit(1, 10)
+        scheduler.submit(2, 5)
+        assert scheduler.complete(1, 2) == 0
+        assert scheduler.loads() == [2, 5]
+        assert scheduler.num_pending == 1
+
+    def test_invalid_events(self):
+        with pytest.raises(ValueError):
+            laa_core.OnlineScheduler(0)
+        scheduler = laa_core.OnlineScheduler(1)
+        scheduler.submit(1, 10)
+        with pytest.raises(ValueError):
+            scheduler.submit(1, 10)
+        with pytest.raises(KeyError):
+            scheduler.complete(2, 10)
+
 class TestSearchGuarantees:
     def test_consistency(self):
         search = laa_core.Search(100)
@@ -210,3 +357,119 @@ class TestSearchGuarantees:
         prediction = 3
         best_index = search.decide(values, prediction)
         assert best_index == 3
+
+    def test_decide_array_matches_decide(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 1000, size=10_000, dtype=np.uint32)
+        search = laa_core.Search(1000)
+        for prediction in [0, 5_000, 9_999, 20_000]:
+            assert search.decide_array(values, prediction) == search.decide(values.tolist(), prediction)
+
+    def test_early_stop_at_max_value(self):
+        """Stops at the first value reaching max_value, searching from the prediction"""
+        search = laa_core.Search(100)
+        values = [100, 10, 20, 100, 30]
+        assert search.decide(values, 2, early_stop=True) == 3
+        assert search.decide_array(np.array(values, dtype=np.uint32), 2, early_stop=True) == 3
+        assert search.decide(values, 2) == 3
+
+class TestTrustControllerGuarantees:
+    def test_learns_trust_per_key(self):
+        controller = laa_core.TrustController()
+        keys = np.tile(np.array([1, 2], dtype=np.uint64), 50)
+        predictions = np.tile([101.0, 300.0], 50)
+        controller.observe_array(keys, predictions, np.full(100, 100.0))
+        trust = controller.trust_array(np.array([1, 2, 3], dtype=np.uint64))
+        assert trust[0] > 0.99 and trust[1] < 0.01 and trust[2] == 0.5
+        assert len(controller) == 2 and 1 in controller and 3 not in controller
+
+        # The learned trusts feed the vectorized decisions directly: key 1 holds out for
+        # its predicted price, key 2 falls back to trading at the reference price.
+        decisions = laa_core.OnewayTrading(100.0).decide_array(np.full(2, 150.0), np.full(2, 300.0), trust[:2])
+        assert decisions.tolist() == [False, True]
+
+    def test_follow_the_leader(self):
+        controller = laa_core.TrustController("ftl")
+        controller.observe(7, 100.0, 100.0)
+        assert controller.trust(7) == 1.0
+        controller.observe_array([7, 7], [500.0, 500.0], [100.0, 100.0])
+        assert controller.trust(7) == 0.0
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError):
+            laa_core.TrustController("greedy")
+        with pytest.raises(ValueError):
+            laa_core.TrustController().observe_array(np.ones(3, dtype=np.uint64), np.ones(2), np.ones(3))
+
+    def test_hedge_requires_uncertain_initial_trust(self):
+        for initial_trust in (0.0, 1.0):
+            with pytest.raises(ValueError):
+                laa_core.TrustController("hedge", initial_trust=initial_trust)
+            controller = laa_core.TrustController("ftl", initial_trust=initial_trust)
+            controller.observe(7, 100.0, 100.0)
+            assert controller.trust(7) == 1.0
+
+class TestSimulate:
+    def test_ski_rental_matches_daily_decisions(self):
+        sr = laa_core.SkiRental(buy_cost=100.0)
+        ski_days = np.arange(1, 250, 3, dtype=np.uint32)
+        predictions = ski_days * 0.9
+        trusts = np.linspace(0.0, 1.0, ski_days.size)
+
+        alg, opt, ratio = laa_core.simulate.ski_rental(100.0, ski_days, predictions, trusts)
+
+        for i, days in enumerate(ski_days.tolist()):
+            buy_day = next((d for d in range(1, days + 1) if sr.decide(d, predictions[i], trusts[i])), None)
+            assert alg[i] == (days if buy_day is None else buy_day - 1 + 100)
+        assert opt.tolist() == np.minimum(ski_days, 100).tolist()
+        assert ratio == pytest.approx(alg / opt)
+
+    def test_ski_rental_robustness(self):
+        """With zero trust, no season may exceed the classical ratio of 2"""
+        rng = np.random.default_rng(0)
+        ski_days = rng.integers(1, 400, size=10_000).astype(np.uint32)
+        predictions = rng.uniform(1, 1000, size=ski_days.size)
+        _, _, ratio = laa_core.simulate.ski_rental(100.0, ski_days, predictions, np.zeros(ski_days.size))
+        assert ratio.max() < 2.0
+
+    def test_randomized_ski_rental_is_seeded(self):
+        ski_days = np.full(1000, 150, dtype=np.uint32)
+        predictions, trusts = np.full(1000, 150.0), np.full(1000, 0.8)
+        first = laa_core.simulate.randomized_ski_rental(100.0, ski_days, predictions, trusts, seed=3)
+        second = laa_core.simulate.randomized_ski_rental(100.0, ski_days, predictions, trusts, seed=3)
+        assert first[0].tolist() == second[0].tolist()
+        assert first[2].mean() < 1.7
+
+    def test_oneway_trading_paths(self):
+        prices = np.array([90.0, 95.0, 130.0, 110.0, 80.0, 85.0])
+        alg, opt, ratio = laa_core.simulate.oneway_trading(
+            100.0, prices, [120.0, 120.0], [0.5, 0.5], lengths=np.array([4, 2], dtype=np.uint32),
+        )
+        assert alg.tolist() == [130.0, 85.0]
+        assert opt.tolist() == [130.0, 85.0]
+        assert ratio.tolist() == [1.0, 1.0]
+
+    def test_caching_perfect_predictions_match_belady(self):
+        trace = (np.arange(5000, dtype=np.uint64) * 2654435761 % 37).astype(np.uint32)
+        predicted_next = np.full(trace.size, np.iinfo(np.uint32).max, dtype=np.uint32)
+        last_seen = {}
+        for t in range(trace.size - 1, -1, -1):
+            if trace[t] in last_seen:
+                predicted_next[t] = last_seen[trace[t]]
+            last_seen[trace[t]] = t
+        alg, opt, ratio = laa_core.simulate.caching(8, trace, predicted_next)
+        assert alg[0] == opt[0]
+        assert ratio.tolist() == [1.0]
+
+    def test_scheduling_lower_bound(self):
+        rng = np.random.default_rng(1)
+        job_lengths = rng.integers(1, 100, size=2000).astype(np.uint32)
+        lengths = np.full(20, 100, dtype=np.uint32)
+        alg, opt, ratio = laa_core.simulate.scheduling(4, job_lengths, job_lengths, lengths=lengths)
+        assert alg.shape == (20,)
+        # List scheduling is (2 - 1/m)-competitive against the lower bound.
+        assert (ratio <= 2 - 1 / 4).all()
+
+    def test_lengths_must_cover_inputs(self):
+        with pytest.raises(ValueError):
+            laa_core.simulate.scheduling(2, [1, 2, 3], [1, 2, 3], lengths=np.array([1, 1], dtype=np.uint32))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from laa_tools.online_stats import P2Quantile, RollingQuantile, RunningMoments
+
+
+class TestRunningMoments:
+    def test_matches_numpy(self):
+        data = np.random.default_rng(0).normal(loc=5.0, size=(1000, 3))
+        moments = RunningMoments(3)
+        for row in data:
+            moments.update(row)
+        assert moments.count == 1000
+        assert moments.mean == pytest.approx(data.mean(axis=0))
+        assert moments.std == pytest.approx(data.std(axis=0, ddof=1))
+        assert moments.sem == pytest.approx(data.std(axis=0, ddof=1) / np.sqrt(1000))
+
+    def test_single_observation(self):
+        moments = RunningMoments(2)
+        moments.update([1.0, 2.0])
+        assert list(moments.variance) == [0.0, 0.0]
+        assert np.isinf(moments.sem).all()
+
+
+class TestP2Quantile:
+    @pytest.mark.parametrize("p", [0.1, 0.5, 0.9, 0.99])
+    def test_close_to_exact_quantile(self, p):
+        rng = np.random.default_rng(1)
+        data = np.column_stack([rng.normal(size=20_000), rng.exponential(size=20_000)])
+        sketch = P2Quantile(p, 2)
+        for row in data:
+            sketch.update(row)
+        assert sketch.value == pytest.approx(np.quantile(data, p, axis=0), rel=0.02, abs=0.02)
+
+    def test_few_observations_are_exact(self):
+        sketch = P2Quantile(0.5, 1)
+        assert np.isnan(sketch.value).all()
+        for value in [3.0, 1.0, 2.0]:
+            sketch.update([value])
+        assert sketch.value == pytest.approx([2.0])
+
+
+class TestRollingQuantile:
+    def test_matches_sorted_window(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=500)
+        rolling = RollingQuantile(window=50)
+        for end in range(7, 501, 7):
+            rolling.update(values[end - 7:end])
+            window = np.sort(values[max(0, end - 50):end])
+            assert len(rolling) == len(window)
+            assert rolling[0] == window[0]
+            assert rolling.quantile(0.9) == window[int(np.ceil(0.9 * len(window))) - 1]
+
+    def test_large_batch_replaces_window(self):
+        rolling = RollingQuantile(window=3)
+        rolling.update([5.0, 1.0])
+        rolling.update([9.0, 8.0, 7.0, 6.0])
+        assert [rolling[k] for k in range(len(rolling))] == [6.0, 7.0, 8.0]
+
+    def test_duplicates_and_evictions(self):
+        rng = np.random.default_rng(1)
+        values = rng.integers(0, 10, size=2_000).astype(float)
+        rolling = RollingQuantile(window=100)
+        for end in range(3, 2_001, 3):
+            rolling.update(values[end - 3:end])
+            window = np.sort(values[max(0, end - 100):end])
+            assert [rolling[k] for k in range(len(rolling))] == window.tolist()
+
+    def test_unbounded_window(self):
+        rolling = RollingQuantile()
+        assert np.isnan(rolling.quantile(0.5))
+        rolling.update(range(100))
+        assert len(rolling) == 100
+        assert rolling.quantile(0.5) == 49.0
@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from laa_tools.prediction_cache import PredictionCache
+from laa_tools.uq_prediction_adapter import UQPredictionAdapter
+
+
+class CountingRegressor(LinearRegression):
+    fits = 0
+
+    def fit(self, X, y, sample_weight=None):
+        CountingRegressor.fits += 1
+        return super().fit(X, y, sample_weight)
+
+
+def linear_data(rng, n, noise):
+    X = rng.uniform(-5, 5, size=(n, 1))
+    return X, 3.0 * X[:, 0] + rng.normal(scale=noise, size=n)
+
+
+class TestUQPredictionAdapter:
+    def test_batch_intervals(self):
+        X, y = linear_data(np.random.default_rng(0), 500, 1.0)
+        adapter = UQPredictionAdapter(confidence_level=0.9)
+        adapter.fit(X, y)
+        result = adapter.predict(X[:10])
+        assert np.all(result['lower'] <= result['point'])
+        assert np.all(result['point'] <= result['upper'])
+        assert result['uncertainty'] == pytest.approx(result['upper'] - result['lower'])
+        with pytest.raises(RuntimeError):
+            adapter.update(X, y)
+
+    def test_online_width_matches_batch_calibration(self):
+        X, y = linear_data(np.random.default_rng(1), 1000, 1.0)
+        batch = UQPredictionAdapter(confidence_level=0.9)
+        online = UQPredictionAdapter(confidence_level=0.9, window=1000)
+        batch.fit(X, y)
+        online.fit(X, y)
+        assert online.predict(X[:5])['uncertainty'] == pytest.approx(batch.predict(X[:5])['uncertainty'])
+
+    def test_update_tracks_drift_without_refitting(self):
+        rng = np.random.default_rng(2)
+        X, y = linear_data(rng, 1000, 1.0)
+        CountingRegressor.fits = 0
+        adapter = UQPredictionAdapter(CountingRegressor(), confidence_level=0.9, window=200)
+        adapter.fit(X, y)
+        narrow = adapter.predict(X[:1])['uncertainty'][0]
+
+        # The noise grows tenfold; after a window of new observations the intervals cover it again.
+        for _ in range(4):
+            adapter.update(*linear_data(rng, 50, 10.0))
+        X_test, y_test = linear_data(rng, 2000, 10.0)
+        result = adapter.predict(X_test)
+
+        assert CountingRegressor.fits == 1
+        assert result['uncertainty'][0] > 5 * narrow
+        coverage = np.mean((result['lower'] <= y_test) & (y_test <= result['upper']))
+        assert coverage == pytest.approx(0.9, abs=0.05)
+
+    def test_too_few_scores_give_unbounded_intervals(self):
+        X, y = linear_data(np.random.default_rng(3), 100, 1.0)
+        adapter = UQPredictionAdapter(confidence_level=0.95, window=10)
+        adapter.fit(X, y)
+        assert np.all(np.isinf(adapter.predict(X[:3])['upper']))
+
+
+class TestPredictionCache:
+    def test_cached_predictions_match_uncached(self):
+        X, y = linear_data(np.random.default_rng(4), 500, 1.0)
+        plain = UQPredictionAdapter(confidence_level=0.9)
+        cached = UQPredictionAdapter(confidence_level=0.9, cache_size=100)
+        plain.fit(X, y)
+        cached.fit(X, y)
+
+        batch = X[[0, 1, 0, 2, 1]]
+        first = cached.predict(batch)
+        assert cached.cache.info() == {'hits': 0, 'misses': 5, 'size': 3, 'maxsize': 100}
+        second = cached.predict(X[[2, 3, 0]])
+        assert cached.cache.hits == 2 and cached.cache.misses == 6
+
+        for result, rows in ((first, [0, 1, 0, 2, 1]), (second, [2, 3, 0])):
+            expected = plain.predict(X[rows])
+            for key in expected:
+                assert result[key] == pytest.approx(expected[key])
+
+    def test_lru_and_ttl_eviction(self):
+        now = [0.0]
+        cache = PredictionCache(2, ttl=10.0, clock=lambda: now[0])
+        keys = cache.keys(np.arange(3.0)[:, None])
+        cache.store(keys[:2], np.ones((2, 1)))
+        cache.lookup(keys[:1], 1)
+        cache.store(keys[2:], np.ones((1, 1)))
+        assert list(cache.lookup(keys, 1)[1]) == [1]
+
+        now[0] = 11.0
+        assert list(cache.lookup(keys, 1)[1]) == [0, 1, 2]
+        assert len(cache) == 0
+
+    def test_invalidated_by_recalibration(self):
+        rng = np.random.default_rng(5)
+        X, y = linear_data(rng, 1000, 1.0)
+        adapter = UQPredictionAdapter(confidence_level=0.9, window=200, cache_size=10)
+        adapter.fit(X, y)
+        narrow = adapter.predict(X[:1])['uncertainty'][0]
+        X_new, y_new = linear_data(rng, 200, 10.0)
+        adapter.update(X_new, y_new)
+        assert len(adapter.cache) == 0
+        assert adapter.predict(X[:1])['uncertainty'][0] > 5 * narrow
+
+
+def test_fitting_loads_heavy_dependencies_lazily():
+    code = (
+        "import sys, laa_tools; from laa_tools import UQPredictionAdapter; "
+        "print(any(m.split('.')[0] in ('mapie', 'sklearn') for m in sys.modules))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+    X, y = linear_data(np.random.default_rng(6), 200, 1.0)
+    first, second = UQPredictionAdapter(), UQPredictionAdapter()
+    first.fit(X, y)
+    second.fit(X, 2 * y)
+    assert first.base_predictor is not second.base_predictor
+    with pytest.raises(RuntimeError):
+        UQPredictionAdapter().predict(X)